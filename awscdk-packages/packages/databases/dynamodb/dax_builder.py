@@ -0,0 +1,149 @@
+from typing import Optional
+
+from aws_cdk import aws_dax as dax, aws_dynamodb as dynamodb, aws_ec2 as ec2, aws_iam as iam, Stack, Duration
+
+from packages.builder import Builder
+from packages.utils.vpc_utils import VpcUtils
+
+MAX_REPLICATION_FACTOR = 11
+DAX_READ_ACTIONS = ["dax:GetItem", "dax:BatchGetItem", "dax:Query", "dax:Scan", "dax:DescribeTable"]
+DAX_WRITE_ACTIONS = ["dax:PutItem", "dax:UpdateItem", "dax:DeleteItem", "dax:BatchWriteItem", "dax:ConditionCheckItem"]
+DAX_PORT = 8111
+DAX_TLS_PORT = 9111
+
+
+class DaxBuilder(Builder):
+
+    def __init__(self, construct_id: str, stack: Stack):
+        super().__init__(construct_id, stack)
+        self.__cluster_name = None
+        self.__node_type = "dax.r5.large"
+        self.__replication_factor = 3
+        self.__vpc = None
+        self.__security_group = None
+        self.__item_ttl = Duration.minutes(5)
+        self.__query_ttl = Duration.minutes(5)
+        self.__encryption = True
+        self.__tables: list[dynamodb.ITableV2] = []
+        self.__grantees: list[tuple[iam.IGrantable, bool, Optional[ec2.IConnectable]]] = []
+
+    def cluster_name(self, cluster_name: str):
+        self.__cluster_name = cluster_name
+        return self
+
+    def node_type(self, node_type: str):
+        self.__node_type = node_type
+        return self
+
+    def replication_factor(self, replication_factor: int):
+        """
+        Number of nodes of the cluster, a primary and its read replicas, 3 or more spread the nodes across zones
+
+        :type replication_factor: number between 1 and 11
+        """
+        self.__replication_factor = replication_factor
+        return self
+
+    def vpc(self, vpc: ec2.Vpc):
+        """
+        The cluster is placed in the private subnets of the VPC
+        """
+        self.__vpc = vpc
+        return self
+
+    def security_group(self, security_group: ec2.ISecurityGroup):
+        """
+        Security group of the cluster, a dedicated one is created when not given
+        """
+        self.__security_group = security_group
+        return self
+
+    def item_ttl(self, item_ttl: Duration):
+        self.__item_ttl = item_ttl
+        return self
+
+    def query_ttl(self, query_ttl: Duration):
+        self.__query_ttl = query_ttl
+        return self
+
+    def encryption(self, encryption: bool):
+        """
+        Encryption at rest and TLS on the cluster endpoint, enabled by default
+        """
+        self.__encryption = encryption
+        return self
+
+    def table(self, table: dynamodb.ITableV2):
+        """
+        Table cached by the cluster, e.g. built by DynamodbBuilder
+        """
+        self.__tables.append(table)
+        return self
+
+    def grant(self, grantee: iam.IGrantable, read_only: bool = False, connectable: Optional[ec2.IConnectable] = None):
+        """
+        Principal of the application reading and writing through the cluster
+
+        :param connectable: where the application runs, e.g. its Lambda function or ECS service, it is allowed to
+                            reach the cluster port
+        """
+        self.__grantees.append((grantee, read_only, connectable))
+        return self
+
+    def __validate(self):
+        if self.__vpc is None:
+            raise ValueError("DAX cluster requires a VPC")
+        if not self.__tables:
+            raise ValueError("DAX cluster requires at least one table")
+        if not 1 <= self.__replication_factor <= MAX_REPLICATION_FACTOR:
+            raise ValueError(f"DAX replication factor must be between 1 and {MAX_REPLICATION_FACTOR}")
+
+    def __create_role(self) -> iam.Role:
+        role = iam.Role(self.stack, f"{self.construct_id}Role",
+                        assumed_by=iam.ServicePrincipal("dax.amazonaws.com"))
+        for table in self.__tables:
+            table.grant_read_write_data(role)
+        return role
+
+    def __create_connections(self) -> ec2.Connections:
+        security_group = self.__security_group or ec2.SecurityGroup(
+            self.stack, f"{self.construct_id}SecurityGroup", vpc=self.__vpc,
+            description=f"{self.construct_id} DAX security group")
+        return ec2.Connections(security_groups=[security_group],
+                               default_port=ec2.Port.tcp(DAX_TLS_PORT if self.__encryption else DAX_PORT))
+
+    def build(self) -> dax.CfnCluster:
+        self.__validate()
+        role = self.__create_role()
+        connections = self.__create_connections()
+        subnet_group = dax.CfnSubnetGroup(self.stack, f"{self.construct_id}SubnetGroup",
+                                          subnet_ids=VpcUtils.get_private_subnets(self.__vpc),
+                                          description=f"{self.construct_id} DAX subnet group")
+        parameter_group = dax.CfnParameterGroup(self.stack, f"{self.construct_id}ParameterGroup",
+                                                description=f"{self.construct_id} DAX parameter group",
+                                                parameter_name_values={
+                                                    "record-ttl-millis": str(int(self.__item_ttl.to_milliseconds())),
+                                                    "query-ttl-millis": str(int(self.__query_ttl.to_milliseconds()))
+                                                })
+        cluster = dax.CfnCluster(self.stack, self.construct_id,
+                                 cluster_name=self.__cluster_name,
+                                 node_type=self.__node_type,
+                                 replication_factor=self.__replication_factor,
+                                 iam_role_arn=role.role_arn,
+                                 subnet_group_name=subnet_group.ref,
+                                 parameter_group_name=parameter_group.ref,
+                                 security_group_ids=[security_group.security_group_id
+                                                     for security_group in connections.security_groups],
+                                 sse_specification=dax.CfnCluster.SSESpecificationProperty(
+                                     sse_enabled=self.__encryption),
+                                 cluster_endpoint_encryption_type="TLS" if self.__encryption else "NONE")
+        # DAX checks it can assume the role and reach the tables when the cluster is created
+        cluster.node.add_dependency(role)
+
+        for grantee, read_only, connectable in self.__grantees:
+            iam.Grant.add_to_principal(grantee=grantee,
+                                       actions=DAX_READ_ACTIONS if read_only else DAX_READ_ACTIONS + DAX_WRITE_ACTIONS,
+                                       resource_arns=[cluster.attr_arn])
+            if connectable is not None:
+                connections.allow_default_port_from(connectable, f"{self.construct_id} DAX clients")
+        return cluster
@@ -1,6 +1,30 @@
-from aws_cdk import aws_dynamodb as dynamodb, Stack
+from dataclasses import dataclass
+from typing import Optional
+
+from aws_cdk import aws_dynamodb as dynamodb, aws_s3 as s3, Stack
 
 from packages.builder import Builder
+from packages.databases.dynamodb.table_alarms import TableAlarmOptions, TableAlarms
+
+
+@dataclass
+class AutoscaledCapacity:
+    max_capacity: int
+    min_capacity: int = 1
+    target_utilization_percent: int = 70
+    seed_capacity: Optional[int] = None  # initial capacity, before autoscaling adjusts it
+
+    def capacity(self) -> dynamodb.Capacity:
+        return dynamodb.Capacity.autoscaled(max_capacity=self.max_capacity,
+                                            min_capacity=self.min_capacity,
+                                            target_utilization_percent=self.target_utilization_percent,
+                                            seed_capacity=self.seed_capacity)
+
+    def initial_capacity(self) -> int:
+        return self.seed_capacity or self.min_capacity
+
+    def scale(self, scalable_attribute: dynamodb.IScalableTableAttribute):
+        scalable_attribute.scale_on_utilization(target_utilization_percent=self.target_utilization_percent)
 
 
 class DynamodbBuilder(Builder):
@@ -15,6 +39,19 @@ class DynamodbBuilder(Builder):
         self.__deletion_protection = True
         self.__global_secondary_indexes = []
         self.__local_secondary_indexes = []
+        self.__billing = None
+        self.__warm_throughput = None
+        self.__replicas = []
+        self.__stream = None
+        self.__max_request_units = (None, None)
+        self.__contributor_insights = None
+        self.__index_contributor_insights = {}
+        self.__time_to_live_attribute = None
+        self.__alarm_options = None
+        self.__alarms = []
+        self.__provisioned_capacity = (None, None)
+        self.__index_capacities = {}
+        self.__import_source = None
 
     def table_name(self, table_name):
         self.__table_name = table_name
@@ -40,17 +77,109 @@ class DynamodbBuilder(Builder):
         self.__deletion_protection = deletion_protection
         return self
 
+    def stream(self, stream: dynamodb.StreamViewType):
+        """
+        Item changes captured in the stream, e.g. NEW_AND_OLD_IMAGES, consumed with LambdaBuilder.dynamodb_event_source
+        """
+        self.__stream = stream
+        return self
+
+    def on_demand(self, max_read_request_units: Optional[int] = None, max_write_request_units: Optional[int] = None):
+        """
+        On-demand billing, the default. Maximum request units cap the cost of unexpected spikes
+        """
+        self.__billing = dynamodb.Billing.on_demand(max_read_request_units=max_read_request_units,
+                                                    max_write_request_units=max_write_request_units)
+        self.__max_request_units = (max_read_request_units, max_write_request_units)
+        return self
+
+    def provisioned(self, read_capacity: AutoscaledCapacity, write_capacity: AutoscaledCapacity):
+        """
+        Provisioned billing with target tracking autoscaling, cheaper than on-demand at steady load. Global secondary
+        indexes inherit the table capacity unless their own capacity is given
+        """
+        self.__billing = dynamodb.Billing.provisioned(read_capacity=read_capacity.capacity(),
+                                                      write_capacity=write_capacity.capacity())
+        self.__provisioned_capacity = (read_capacity, write_capacity)
+        return self
+
+    def warm_throughput(self, read_units_per_second: Optional[int] = None,
+                        write_units_per_second: Optional[int] = None):
+        """
+        Pre-provisions partitions for the given throughput, so the table absorbs a launch without throttling
+        """
+        self.__warm_throughput = dynamodb.WarmThroughput(read_units_per_second=read_units_per_second,
+                                                         write_units_per_second=write_units_per_second)
+        return self
+
+    def contributor_insights(self, contributor_insights: bool):
+        """
+        Most accessed and most throttled keys of the table and its indexes, to find hot partitions
+        """
+        self.__contributor_insights = contributor_insights
+        return self
+
+    def time_to_live_attribute(self, time_to_live_attribute: str):
+        """
+        Attribute holding the expiry epoch in seconds, expired items are deleted without consuming write capacity
+        """
+        self.__time_to_live_attribute = time_to_live_attribute
+        return self
+
+    def alarms(self, alarm_options: Optional[TableAlarmOptions] = None):
+        """
+        CloudWatch alarms on throttled requests of the table and its indexes, and on the consumed capacity ratio
+        """
+        self.__alarm_options = alarm_options or TableAlarmOptions()
+        return self
+
+    def import_source(self, bucket: s3.IBucket, input_format: dynamodb.InputFormat,
+                      compression_type: dynamodb.InputCompressionType = dynamodb.InputCompressionType.NONE,
+                      key_prefix: Optional[str] = None, bucket_owner: Optional[str] = None):
+        """
+        Creates the table from the CSV, DynamoDB JSON or ION objects under the S3 prefix, without consuming write
+        capacity. The import only runs when the table is created. Global tables cannot be imported into, so the table
+        is built as a dynamodb.Table, without replicas
+
+        :type input_format: e.g. dynamodb.InputFormat.csv(delimiter=",") or dynamodb.InputFormat.dynamo_db_json()
+        """
+        self.__import_source = dynamodb.ImportSourceSpecification(bucket=bucket,
+                                                                  input_format=input_format,
+                                                                  compression_type=compression_type,
+                                                                  key_prefix=key_prefix,
+                                                                  bucket_owner=bucket_owner)
+        return self
+
+    @property
+    def table_alarms(self):
+        return self.__alarms
+
     def add_global_secondary_index(self, index_name, partition_key_name, sort_key_name,
                                    partition_key_type=dynamodb.AttributeType.STRING,
                                    sort_key_type=dynamodb.AttributeType.STRING,
-                                   projection_type=dynamodb.ProjectionType.ALL):
+                                   projection_type=dynamodb.ProjectionType.ALL,
+                                   read_capacity: Optional[AutoscaledCapacity] = None,
+                                   write_capacity: Optional[AutoscaledCapacity] = None,
+                                   warm_throughput: Optional[dynamodb.WarmThroughput] = None,
+                                   contributor_insights: Optional[bool] = None):
+        """
+        Read and write capacity of the index, inherited from the table when not given, require provisioned billing.
+        Contributor insights of the index, inherited from the table when not given, apply to the region of the stack,
+        replicas set theirs with add_replica
+        """
         index = dynamodb.GlobalSecondaryIndexPropsV2(index_name=index_name,
                                                      projection_type=projection_type,
                                                      partition_key=dynamodb.Attribute(name=partition_key_name,
                                                                                       type=partition_key_type),
                                                      sort_key=dynamodb.Attribute(name=sort_key_name,
-                                                                                 type=sort_key_type))
+                                                                                 type=sort_key_type),
+                                                     read_capacity=read_capacity and read_capacity.capacity(),
+                                                     write_capacity=write_capacity and write_capacity.capacity(),
+                                                     warm_throughput=warm_throughput)
         self.__global_secondary_indexes.append(index)
+        self.__index_capacities[index_name] = (read_capacity, write_capacity)
+        if contributor_insights is not None:
+            self.__index_contributor_insights[index_name] = contributor_insights
 
     def add_local_secondary_index(self, index_name, sort_key_name,
                                   sort_key_type=dynamodb.AttributeType.STRING,
@@ -61,14 +190,146 @@ class DynamodbBuilder(Builder):
                                                                               type=sort_key_type))
         self.__local_secondary_indexes.append(index)
 
-    def build(self) -> dynamodb.TableV2:
-        table = dynamodb.TableV2(self.stack, self.construct_id,
-                                 table_name=self.__table_name,
-                                 partition_key=self.__partition_key,
-                                 sort_key=self.__sort_key,
-                                 table_class=self.__table_class,
-                                 deletion_protection=self.__deletion_protection,
-                                 point_in_time_recovery=self.__point_in_time_recovery,
-                                 global_secondary_indexes=self.__global_secondary_indexes,
-                                 local_secondary_indexes=self.__local_secondary_indexes)
+    def add_replica(self, region: str, table_class: Optional[dynamodb.TableClass] = None,
+                    read_capacity: Optional[AutoscaledCapacity] = None,
+                    max_read_request_units: Optional[int] = None,
+                    contributor_insights: Optional[bool] = None,
+                    global_secondary_index_options: Optional[
+                        dict[str, dynamodb.ReplicaGlobalSecondaryIndexOptions]] = None):
+        """
+        Replica of the table in another region, turning it into a global table, so services read from a local replica.
+        Read capacity overrides require provisioned billing, maximum read request units on-demand billing. Writes are
+        replicated, the write capacity of the table applies to every replica
+
+        :type region: region of the replica, different from the region of the stack, which must not be a token
+        :type global_secondary_index_options: read capacity and contributor insights overrides per index name
+        """
+        replica = dynamodb.ReplicaTableProps(region=region,
+                                             table_class=table_class,
+                                             read_capacity=read_capacity and read_capacity.capacity(),
+                                             max_read_request_units=max_read_request_units,
+                                             contributor_insights=contributor_insights,
+                                             global_secondary_index_options=global_secondary_index_options)
+        self.__replicas.append(replica)
+        return self
+
+    def __is_provisioned(self):
+        return self.__billing is not None and self.__billing.mode == dynamodb.BillingMode.PROVISIONED
+
+    def __configure_index_contributor_insights(self, table: dynamodb.TableV2):
+        # the replica of the stack region is rendered last, with every index in the order they were added
+        global_table = table.node.default_child
+        replica_path = f"Replicas.{len(self.__replicas)}"
+        for index_idx, index in enumerate(self.__global_secondary_indexes):
+            if index.index_name in self.__index_contributor_insights:
+                global_table.add_property_override(
+                    f"{replica_path}.GlobalSecondaryIndexes.{index_idx}.ContributorInsightsSpecification",
+                    {"Enabled": self.__index_contributor_insights[index.index_name]})
+
+    def __validate_replicas(self):
+        if self.__replicas and self.__import_source is not None:
+            raise ValueError("Replicas are not supported on tables imported from S3")
+        provisioned = self.__is_provisioned()
+        index_names = {index.index_name for index in self.__global_secondary_indexes}
+        regions = [replica.region for replica in self.__replicas]
+        if len(regions) != len(set(regions)):
+            raise ValueError("Only one replica per region is allowed")
+        for replica in self.__replicas:
+            if replica.read_capacity and not provisioned:
+                raise ValueError(f"Replica {replica.region} read capacity requires provisioned billing on the table")
+            if replica.max_read_request_units and provisioned:
+                raise ValueError(f"Replica {replica.region} max read request units require on-demand billing")
+            for index_name in (replica.global_secondary_index_options or {}):
+                if index_name not in index_names:
+                    raise ValueError(f"Replica {replica.region} overrides unknown index {index_name}")
+
+    def __validate_billing(self):
+        provisioned = self.__is_provisioned()
+        for index in self.__global_secondary_indexes:
+            if (index.read_capacity or index.write_capacity) and not provisioned:
+                raise ValueError(f"Index {index.index_name} capacity requires provisioned billing on the table")
+
+    def __build_imported_table(self) -> dynamodb.Table:
+        provisioned = self.__is_provisioned()
+        read_capacity, write_capacity = self.__provisioned_capacity
+        max_read_request_units, max_write_request_units = self.__max_request_units
+        table = dynamodb.Table(self.stack, self.construct_id,
+                               table_name=self.__table_name,
+                               partition_key=self.__partition_key,
+                               sort_key=self.__sort_key,
+                               table_class=self.__table_class,
+                               deletion_protection=self.__deletion_protection,
+                               point_in_time_recovery=self.__point_in_time_recovery,
+                               billing_mode=dynamodb.BillingMode.PROVISIONED if provisioned
+                               else dynamodb.BillingMode.PAY_PER_REQUEST,
+                               read_capacity=read_capacity and read_capacity.initial_capacity(),
+                               write_capacity=write_capacity and write_capacity.initial_capacity(),
+                               max_read_request_units=max_read_request_units,
+                               max_write_request_units=max_write_request_units,
+                               warm_throughput=self.__warm_throughput,
+                               stream=self.__stream,
+                               contributor_insights_enabled=self.__contributor_insights,
+                               time_to_live_attribute=self.__time_to_live_attribute,
+                               import_source=self.__import_source)
+        if provisioned:
+            read_capacity.scale(table.auto_scale_read_capacity(min_capacity=read_capacity.min_capacity,
+                                                               max_capacity=read_capacity.max_capacity))
+            write_capacity.scale(table.auto_scale_write_capacity(min_capacity=write_capacity.min_capacity,
+                                                                 max_capacity=write_capacity.max_capacity))
+
+        for index in self.__global_secondary_indexes:
+            # provisioned indexes of a Table get a fixed initial capacity, scaled like the table
+            index_read, index_write = self.__index_capacities[index.index_name]
+            index_read, index_write = index_read or read_capacity, index_write or write_capacity
+            table.add_global_secondary_index(index_name=index.index_name,
+                                             partition_key=index.partition_key,
+                                             sort_key=index.sort_key,
+                                             projection_type=index.projection_type,
+                                             read_capacity=index_read and index_read.initial_capacity(),
+                                             write_capacity=index_write and index_write.initial_capacity(),
+                                             warm_throughput=index.warm_throughput,
+                                             contributor_insights_enabled=self.__index_contributor_insights.get(
+                                                 index.index_name, self.__contributor_insights))
+            if provisioned:
+                index_read.scale(table.auto_scale_global_secondary_index_read_capacity(
+                    index.index_name, min_capacity=index_read.min_capacity, max_capacity=index_read.max_capacity))
+                index_write.scale(table.auto_scale_global_secondary_index_write_capacity(
+                    index.index_name, min_capacity=index_write.min_capacity, max_capacity=index_write.max_capacity))
+
+        for index in self.__local_secondary_indexes:
+            table.add_local_secondary_index(index)
+        return table
+
+    def build(self) -> dynamodb.TableV2 | dynamodb.Table:
+        """
+        A dynamodb.Table when the table is imported from S3, a dynamodb.TableV2 otherwise
+        """
+        self.__validate_billing()
+        self.__validate_replicas()
+        if self.__import_source is not None:
+            table = self.__build_imported_table()
+        else:
+            table = dynamodb.TableV2(self.stack, self.construct_id,
+                                     table_name=self.__table_name,
+                                     partition_key=self.__partition_key,
+                                     sort_key=self.__sort_key,
+                                     table_class=self.__table_class,
+                                     deletion_protection=self.__deletion_protection,
+                                     point_in_time_recovery=self.__point_in_time_recovery,
+                                     global_secondary_indexes=self.__global_secondary_indexes,
+                                     local_secondary_indexes=self.__local_secondary_indexes,
+                                     billing=self.__billing,
+                                     warm_throughput=self.__warm_throughput,
+                                     replicas=self.__replicas,
+                                     dynamo_stream=self.__stream,
+                                     contributor_insights=self.__contributor_insights,
+                                     time_to_live_attribute=self.__time_to_live_attribute)
+            self.__configure_index_contributor_insights(table)
+
+        if self.__alarm_options is not None:
+            max_read_request_units, max_write_request_units = self.__max_request_units
+            self.__alarms = TableAlarms.create(self.stack, self.construct_id, table, self.__alarm_options,
+                                               [index.index_name for index in self.__global_secondary_indexes],
+                                               self.__is_provisioned(), max_read_request_units,
+                                               max_write_request_units)
         return table
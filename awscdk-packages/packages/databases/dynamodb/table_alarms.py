@@ -0,0 +1,86 @@
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+from aws_cdk import aws_cloudwatch as cloudwatch, aws_cloudwatch_actions as cloudwatch_actions, \
+    aws_dynamodb as dynamodb, aws_sns as sns, Stack, Duration
+
+
+@dataclass
+class TableAlarmOptions:
+    throttled_requests_threshold: int = 1  # throttle events per period, a hot key throttles well below table capacity
+    consumed_capacity_ratio: float = 0.8  # consumed over provisioned (or maximum on-demand) capacity
+    period: Duration = Duration.minutes(1)
+    evaluation_periods: int = 5
+    alarm_topic: Optional[sns.ITopic] = None
+
+
+class TableAlarms:
+
+    @staticmethod
+    def __alarm(stack: Stack, alarm_id: str, metric: cloudwatch.IMetric, threshold: float,
+                options: TableAlarmOptions, description: str) -> cloudwatch.Alarm:
+        alarm = cloudwatch.Alarm(stack, alarm_id,
+                                 metric=metric,
+                                 threshold=threshold,
+                                 evaluation_periods=options.evaluation_periods,
+                                 comparison_operator=cloudwatch.ComparisonOperator.GREATER_THAN_OR_EQUAL_TO_THRESHOLD,
+                                 treat_missing_data=cloudwatch.TreatMissingData.NOT_BREACHING,
+                                 alarm_description=description)
+        if options.alarm_topic is not None:
+            alarm.add_alarm_action(cloudwatch_actions.SnsAction(options.alarm_topic))
+        return alarm
+
+    @staticmethod
+    def __throttle_metric(table: dynamodb.ITable, operation: str, period: Duration,
+                          index_name: Optional[str] = None) -> cloudwatch.Metric:
+        dimensions = {"TableName": table.table_name}
+        if index_name is not None:
+            dimensions["GlobalSecondaryIndexName"] = index_name
+        return table.metric(f"{operation}ThrottleEvents", statistic="Sum", period=period, dimensions_map=dimensions)
+
+    @staticmethod
+    def __capacity_ratio(table: dynamodb.ITable, operation: str, period: Duration,
+                         max_request_units: Optional[int]) -> cloudwatch.MathExpression:
+        """
+        Consumed units per second over the provisioned units, or over the maximum request units of on-demand tables
+        """
+        consumed = table.metric(f"Consumed{operation}CapacityUnits", statistic="Sum", period=period)
+        if max_request_units is not None:
+            return cloudwatch.MathExpression(expression=f"consumed / {int(period.to_seconds())} / {max_request_units}",
+                                             using_metrics={"consumed": consumed},
+                                             period=period)
+        provisioned = table.metric(f"Provisioned{operation}CapacityUnits", statistic="Average", period=period)
+        return cloudwatch.MathExpression(expression=f"consumed / {int(period.to_seconds())} / provisioned",
+                                         using_metrics={"consumed": consumed, "provisioned": provisioned},
+                                         period=period)
+
+    @staticmethod
+    def create(stack: Stack, construct_id: str, table: dynamodb.ITable, options: TableAlarmOptions,
+               index_names: Sequence[str], provisioned: bool, max_read_request_units: Optional[int] = None,
+               max_write_request_units: Optional[int] = None) -> list[cloudwatch.Alarm]:
+        """
+        Throttle alarms on the table and each global secondary index, and consumed capacity ratio alarms when the
+        capacity of the table is bounded, i.e. provisioned or on-demand with maximum request units
+        """
+        alarms = []
+        for operation in ("Read", "Write"):
+            alarms.append(TableAlarms.__alarm(stack, f"{construct_id}{operation}ThrottleAlarm",
+                                              TableAlarms.__throttle_metric(table, operation, options.period),
+                                              options.throttled_requests_threshold, options,
+                                              f"{operation} requests throttled on the table"))
+            for index_name in index_names:
+                alarms.append(TableAlarms.__alarm(stack, f"{construct_id}{index_name}{operation}ThrottleAlarm",
+                                                  TableAlarms.__throttle_metric(table, operation, options.period,
+                                                                                index_name),
+                                                  options.throttled_requests_threshold, options,
+                                                  f"{operation} requests throttled on index {index_name}"))
+
+        for operation, max_request_units in (("Read", max_read_request_units), ("Write", max_write_request_units)):
+            if not provisioned and max_request_units is None:
+                continue
+            alarms.append(TableAlarms.__alarm(stack, f"{construct_id}{operation}CapacityAlarm",
+                                              TableAlarms.__capacity_ratio(table, operation, options.period,
+                                                                           None if provisioned else max_request_units),
+                                              options.consumed_capacity_ratio, options,
+                                              f"Consumed {operation.lower()} capacity close to the table capacity"))
+        return alarms
@@ -0,0 +1,139 @@
+import re
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Sequence
+
+from aws_cdk import aws_rds as rds, aws_applicationautoscaling as appscaling, custom_resources as cr, Stack, Duration, \
+    ArnFormat
+
+MAX_AURORA_REPLICAS = 15
+MAX_PROMOTION_TIER = 15
+# 1 to 63 letters, digits or hyphens, starting with a letter, without consecutive or trailing hyphens
+ENDPOINT_IDENTIFIER_PATTERN = re.compile(r"^[a-z](?!.*--)[a-z0-9-]{0,62}(?<!-)$")
+
+
+class ReaderScalingMetric(StrEnum):
+    CPU = 'cpu'
+    CONNECTIONS = 'connections'
+
+
+READER_SCALING_METRICS = {
+    ReaderScalingMetric.CPU: appscaling.PredefinedMetric.RDS_READER_AVERAGE_CPU_UTILIZATION,
+    ReaderScalingMetric.CONNECTIONS: appscaling.PredefinedMetric.RDS_READER_AVERAGE_DATABASE_CONNECTIONS,
+}
+
+
+@dataclass
+class ReaderAutoScalingOptions:
+    min_capacity: int = 1
+    max_capacity: int = MAX_AURORA_REPLICAS
+    metric: ReaderScalingMetric = ReaderScalingMetric.CPU
+    target_value: float = 70  # average reader CPU percent or number of connections, depending on the metric
+    scale_in_cooldown: Duration = Duration.minutes(5)
+    scale_out_cooldown: Duration = Duration.minutes(5)
+
+
+@dataclass
+class CustomReaderEndpoint:
+    endpoint_name: str
+    readers: Sequence[int]  # reader numbers, as created by readers(n), starting at 1
+
+
+class AuroraReaders:
+
+    @staticmethod
+    def reader_id(reader: int) -> str:
+        return f"reader-{reader}"
+
+    @staticmethod
+    def endpoint_identifier(endpoint_name: str) -> str:
+        """
+        Cluster endpoint identifier of the endpoint name, RDS stores the identifiers in lowercase
+        """
+        endpoint_identifier = endpoint_name.lower()
+        if not ENDPOINT_IDENTIFIER_PATTERN.match(endpoint_identifier):
+            raise ValueError(f"Endpoint name {endpoint_name} must have 1 to 63 letters, digits or hyphens, start with "
+                             f"a letter and contain no consecutive or trailing hyphens")
+        return endpoint_identifier
+
+    @staticmethod
+    def validate_reader(reader: int, reader_instances: int):
+        if not 1 <= reader <= reader_instances:
+            raise ValueError(f"Reader {reader} does not exist, the cluster has {reader_instances} readers")
+
+    @staticmethod
+    def promotion_tier(cluster: rds.DatabaseCluster, reader: int, promotion_tier: int):
+        """
+        Failover priority of a reader, lower tiers are promoted first. Serverless v2 readers in tier 0 or 1 scale
+        with the writer
+        """
+        if not 0 <= promotion_tier <= MAX_PROMOTION_TIER:
+            raise ValueError(f"Promotion tier must be between 0 and {MAX_PROMOTION_TIER}")
+        instance = cluster.node.find_child(AuroraReaders.reader_id(reader)).node.default_child
+        instance.add_property_override("PromotionTier", promotion_tier)
+
+    @staticmethod
+    def auto_scale(stack: Stack, construct_id: str, cluster: rds.DatabaseCluster,
+                   options: ReaderAutoScalingOptions) -> appscaling.ScalableTarget:
+        """
+        Aurora Replica auto scaling, replicas are added and removed on top of the readers of the cluster to keep the
+        reader metric around its target value
+        """
+        if not 0 <= options.min_capacity <= options.max_capacity <= MAX_AURORA_REPLICAS:
+            raise ValueError(f"Reader auto scaling capacity must be between 0 and {MAX_AURORA_REPLICAS} replicas")
+
+        scalable_target = appscaling.ScalableTarget(stack, f"{construct_id}ReaderScaling",
+                                                    service_namespace=appscaling.ServiceNamespace.RDS,
+                                                    resource_id=f"cluster:{cluster.cluster_identifier}",
+                                                    scalable_dimension="rds:cluster:ReadReplicaCount",
+                                                    min_capacity=options.min_capacity,
+                                                    max_capacity=options.max_capacity)
+        # Aurora only scales clusters that are available with at least one reader
+        scalable_target.node.add_dependency(cluster)
+        scalable_target.scale_to_track_metric(f"{construct_id}ReaderScalingPolicy",
+                                              predefined_metric=READER_SCALING_METRICS[options.metric],
+                                              target_value=options.target_value,
+                                              scale_in_cooldown=options.scale_in_cooldown,
+                                              scale_out_cooldown=options.scale_out_cooldown)
+        return scalable_target
+
+    @staticmethod
+    def custom_endpoint(stack: Stack, construct_id: str, cluster: rds.DatabaseCluster,
+                        endpoint: CustomReaderEndpoint) -> cr.AwsCustomResource:
+        """
+        Reader endpoint routing to the given readers only, e.g. to isolate analytics traffic from the application.
+        CloudFormation has no cluster endpoint resource, the endpoint is managed through the RDS API
+        """
+        static_members = [cluster.node.find_child(AuroraReaders.reader_id(reader)).node.default_child.ref
+                          for reader in endpoint.readers]
+        endpoint_identifier = AuroraReaders.endpoint_identifier(endpoint.endpoint_name)
+        endpoint_id = cr.PhysicalResourceId.of(endpoint_identifier)
+        endpoint_arn = stack.format_arn(service="rds", resource="cluster-endpoint",
+                                        resource_name=endpoint_identifier,
+                                        arn_format=ArnFormat.COLON_RESOURCE_NAME)
+        cluster_arn = stack.format_arn(service="rds", resource="cluster", resource_name=cluster.cluster_identifier,
+                                       arn_format=ArnFormat.COLON_RESOURCE_NAME)
+        cluster_endpoint = cr.AwsCustomResource(
+            stack, f"{construct_id}{endpoint.endpoint_name}Endpoint",
+            on_create=cr.AwsSdkCall(service="RDS",
+                                    action="createDBClusterEndpoint",
+                                    parameters={"DBClusterIdentifier": cluster.cluster_identifier,
+                                                "DBClusterEndpointIdentifier": endpoint_identifier,
+                                                "EndpointType": "READER",
+                                                "StaticMembers": static_members},
+                                    output_paths=["Endpoint"],
+                                    physical_resource_id=endpoint_id),
+            on_update=cr.AwsSdkCall(service="RDS",
+                                    action="modifyDBClusterEndpoint",
+                                    parameters={"DBClusterEndpointIdentifier": endpoint_identifier,
+                                                "EndpointType": "READER",
+                                                "StaticMembers": static_members},
+                                    output_paths=["Endpoint"],
+                                    physical_resource_id=endpoint_id),
+            on_delete=cr.AwsSdkCall(service="RDS",
+                                    action="deleteDBClusterEndpoint",
+                                    parameters={"DBClusterEndpointIdentifier": endpoint_identifier}),
+            policy=cr.AwsCustomResourcePolicy.from_sdk_calls(resources=[endpoint_arn, cluster_arn]),
+            install_latest_aws_sdk=False)
+        cluster_endpoint.node.add_dependency(cluster)
+        return cluster_endpoint
@@ -0,0 +1,64 @@
+import os
+from dataclasses import dataclass
+from typing import Sequence
+
+from aws_cdk import aws_rds as rds, aws_lambda as _lambda, aws_events as events, aws_events_targets as targets, \
+    aws_iam as iam, Stack, Duration
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CAPACITY_SCHEDULER_DIR = BASE_DIR + "/functions/capacity_scheduler/"
+MAX_SERVERLESS_V2_CAPACITY = 256
+SERVERLESS_V2_CAPACITY_INCREMENT = 0.5
+
+
+@dataclass
+class CapacityWindow:
+    start: events.Schedule  # e.g. events.Schedule.cron(minute="30", hour="0"), schedules are in UTC
+    end: events.Schedule  # the baseline capacity of the cluster is restored at the end of the window
+    min_capacity: float
+    max_capacity: float
+
+
+class ServerlessCapacitySchedule:
+
+    @staticmethod
+    def validate_capacity(min_capacity: float, max_capacity: float):
+        for capacity in (min_capacity, max_capacity):
+            if capacity % SERVERLESS_V2_CAPACITY_INCREMENT != 0:
+                raise ValueError(f"Serverless v2 capacity must be a multiple of {SERVERLESS_V2_CAPACITY_INCREMENT} ACU")
+        if not 0 <= min_capacity <= max_capacity <= MAX_SERVERLESS_V2_CAPACITY:
+            raise ValueError(f"Serverless v2 capacity must be between 0 and {MAX_SERVERLESS_V2_CAPACITY} ACUs, "
+                             "with the minimum not above the maximum")
+
+    @staticmethod
+    def create(stack: Stack, construct_id: str, cluster: rds.DatabaseCluster, windows: Sequence[CapacityWindow],
+               baseline_min_capacity: float, baseline_max_capacity: float) -> _lambda.Function:
+        """
+        Scheduled function changing the serverless v2 capacity of the cluster at the start and end of each window, so
+        capacity is warm before known peaks. The template capacity is only applied again when it changes
+        """
+        if baseline_min_capacity is None or baseline_max_capacity is None:
+            raise ValueError("Capacity windows require the serverless v2 min and max capacity of the cluster")
+        ServerlessCapacitySchedule.validate_capacity(baseline_min_capacity, baseline_max_capacity)
+        for window in windows:
+            ServerlessCapacitySchedule.validate_capacity(window.min_capacity, window.max_capacity)
+
+        scheduler = _lambda.Function(stack, f"{construct_id}CapacityScheduler",
+                                     runtime=_lambda.Runtime.PYTHON_3_12,
+                                     handler="index.handler",
+                                     code=_lambda.Code.from_asset(CAPACITY_SCHEDULER_DIR),
+                                     timeout=Duration.seconds(30),
+                                     environment={"DB_CLUSTER_IDENTIFIER": cluster.cluster_identifier})
+        scheduler.add_to_role_policy(iam.PolicyStatement(actions=["rds:ModifyDBCluster"],
+                                                         resources=[cluster.cluster_arn]))
+
+        for window_idx, window in enumerate(windows, start=1):
+            for boundary, schedule, min_capacity, max_capacity in [
+                ("Start", window.start, window.min_capacity, window.max_capacity),
+                ("End", window.end, baseline_min_capacity, baseline_max_capacity)
+            ]:
+                events.Rule(stack, f"{construct_id}CapacityWindow{window_idx}{boundary}",
+                            schedule=schedule,
+                            targets=[targets.LambdaFunction(scheduler, event=events.RuleTargetInput.from_object(
+                                {"min_capacity": min_capacity, "max_capacity": max_capacity}))])
+        return scheduler
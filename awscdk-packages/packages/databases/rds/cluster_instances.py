@@ -0,0 +1,119 @@
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Optional
+
+from aws_cdk import aws_rds as rds, aws_ec2 as ec2, Annotations
+from constructs import Construct
+
+SERVERLESS_V2 = "serverless"
+BURSTABLE_FAMILIES = ("t3", "t4g")
+BURSTABLE_SIZES = ("medium", "large")
+
+# Minimum engine versions supporting an instance class family (or Serverless v2), one entry per major version that
+# introduced the support: Aurora MySQL 2 and 3 versions for aurora-mysql, (major, minor) for aurora-postgresql.
+# Later major versions support every family listed for an earlier major version.
+AURORA_MYSQL_MIN_VERSIONS = {
+    SERVERLESS_V2: ((3, 2, 0),),
+    "t3": ((2, 0, 0),),
+    "t4g": ((2, 10, 1),),
+    "r5": ((2, 0, 0),),
+    "r6g": ((2, 9, 2),),
+    "r6i": ((3, 2, 1),),
+    "r6gd": ((3, 2, 0),),  # Optimized Reads
+    "r6id": ((3, 2, 0),),  # Optimized Reads
+    "r7g": ((3, 3, 1),),
+    "r7i": ((3, 6, 0),),
+    "r8g": ((3, 8, 0),),
+    "x2g": ((2, 10, 0),),
+}
+
+AURORA_POSTGRESQL_MIN_VERSIONS = {
+    SERVERLESS_V2: ((13, 6), (14, 3), (15, 2)),
+    "t3": ((11, 9),),
+    "t4g": ((11, 9),),
+    "r5": ((11, 9),),
+    "r6g": ((11, 9),),
+    "r6i": ((12, 13), (13, 9), (14, 6)),
+    "r6gd": ((14, 9), (15, 4)),  # Optimized Reads
+    "r6id": ((14, 9), (15, 4)),  # Optimized Reads
+    "r7g": ((13, 10), (14, 7), (15, 2)),
+    "r7i": ((13, 15), (14, 12), (15, 7), (16, 3)),
+    "r8g": ((13, 16), (14, 13), (15, 8), (16, 4)),
+    "x2g": ((12, 9), (13, 5)),
+}
+
+AURORA_MIN_VERSIONS = {
+    "aurora-mysql": AURORA_MYSQL_MIN_VERSIONS,
+    "aurora-postgresql": AURORA_POSTGRESQL_MIN_VERSIONS,
+}
+
+
+class ClusterInstanceKind(StrEnum):
+    SERVERLESS_V2 = 'serverless-v2'
+    PROVISIONED = 'provisioned'
+
+
+@dataclass
+class ClusterInstanceOptions:
+    kind: ClusterInstanceKind = ClusterInstanceKind.SERVERLESS_V2
+    instance_type: Optional[ec2.InstanceType] = None  # provisioned instances only, e.g. r6gd for Optimized Reads
+
+
+class ClusterInstances:
+
+    @staticmethod
+    def engine_version(engine: rds.IClusterEngine) -> tuple[int, ...]:
+        full_version = engine.engine_version.full_version
+        if engine.engine_type == "aurora-mysql":
+            # e.g. 8.0.mysql_aurora.3.04.0
+            full_version = full_version.split("mysql_aurora.")[-1]
+        return tuple(int(part) for part in full_version.split(".") if part.isdigit())
+
+    @staticmethod
+    def supports(min_versions: tuple[tuple[int, ...], ...], version: tuple[int, ...]) -> bool:
+        for min_version in min_versions:
+            if version[0] == min_version[0]:
+                return version >= min_version
+        return version[0] > max(min_version[0] for min_version in min_versions)
+
+    @staticmethod
+    def validate(engine: rds.IClusterEngine, options: ClusterInstanceOptions,
+                 warning_scope: Optional[Construct] = None):
+        """
+        Checks the instance kind and class are available for the Aurora engine version, engines without a version are
+        not validated
+
+        :param warning_scope: reports an unsupported engine version as a warning on the scope instead of an error, for
+                              the default instances which were not validated before
+        """
+        if options.kind == ClusterInstanceKind.PROVISIONED and options.instance_type is None:
+            raise ValueError("Provisioned cluster instances require an instance type")
+        if options.kind == ClusterInstanceKind.SERVERLESS_V2 and options.instance_type is not None:
+            raise ValueError("Serverless v2 cluster instances are sized by the serverless v2 capacity of the cluster")
+        if engine is None or engine.engine_version is None:
+            return
+        if engine.engine_type not in AURORA_MIN_VERSIONS:
+            raise ValueError(f"{engine.engine_type} is not an Aurora engine")
+
+        instance_class = SERVERLESS_V2
+        if options.kind == ClusterInstanceKind.PROVISIONED:
+            instance_class, instance_size = options.instance_type.to_string().split(".")
+            if instance_class in BURSTABLE_FAMILIES and instance_size not in BURSTABLE_SIZES:
+                raise ValueError(f"Aurora only supports {', '.join(BURSTABLE_SIZES)} burstable instances")
+
+        min_versions = AURORA_MIN_VERSIONS[engine.engine_type].get(instance_class)
+        if min_versions is None:
+            raise ValueError(f"{instance_class} instances are not supported by {engine.engine_type}")
+        if not ClusterInstances.supports(min_versions, ClusterInstances.engine_version(engine)):
+            message = f"{instance_class} instances are not supported by " \
+                      f"{engine.engine_type} {engine.engine_version.full_version}"
+            if warning_scope is None:
+                raise ValueError(message)
+            Annotations.of(warning_scope).add_warning(message)
+
+    @staticmethod
+    def create(instance_id: str, options: ClusterInstanceOptions, scale_with_writer=False,
+               **instance_props) -> rds.IClusterInstance:
+        if options.kind == ClusterInstanceKind.PROVISIONED:
+            return rds.ClusterInstance.provisioned(instance_id, instance_type=options.instance_type, **instance_props)
+        return rds.ClusterInstance.serverless_v2(instance_id, scale_with_writer=scale_with_writer, **instance_props)
@@ -0,0 +1,16 @@
+import os
+
+import boto3
+
+rds = boto3.client("rds")
+
+
+def handler(event, context):
+    """
+    Applies the serverless v2 capacity of a scheduled window to the cluster
+    """
+    rds.modify_db_cluster(DBClusterIdentifier=os.environ["DB_CLUSTER_IDENTIFIER"],
+                          ServerlessV2ScalingConfiguration={"MinCapacity": float(event["min_capacity"]),
+                                                            "MaxCapacity": float(event["max_capacity"])},
+                          ApplyImmediately=True)
+    return {"min_capacity": event["min_capacity"], "max_capacity": event["max_capacity"]}
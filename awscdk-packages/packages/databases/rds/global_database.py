@@ -0,0 +1,118 @@
+from dataclasses import dataclass
+from typing import Mapping, Optional
+
+from aws_cdk import aws_rds as rds, aws_ec2 as ec2, aws_kms as kms, Stack, Environment
+
+from packages.databases.rds.aurora_readers import AuroraReaders
+from packages.databases.rds.cluster_instances import ClusterInstanceOptions, ClusterInstances
+from packages.databases.rds.parameter_group_profiles import ParameterGroupProfiles, WorkloadProfile
+from packages.databases.rds.rds_proxy import PRIVATE_ISOLATED_SUBNETS
+from packages.network.vpc_builder import VpcBuilder
+
+
+@dataclass
+class SecondaryClusterOptions:
+    region: str
+    readers: int = 1  # readers in addition to the secondary writer instance, which serves reads until failover
+    write_forwarding: bool = False  # forwards writes from the secondary cluster to the primary
+    # Stack of the secondary cluster, created by the builder in the region when not given
+    stack: Optional[Stack] = None
+    vpc: Optional[ec2.IVpc] = None  # isolated VPC created in the secondary stack when not given
+    vpc_cidr: str = "10.1.0.0/16"
+    storage_encryption_key: Optional[kms.IKey] = None  # default RDS key of the region when not given
+    # Writer and reader instances of the primary cluster when not given, so a promoted secondary keeps their shape
+    writer_options: Optional[ClusterInstanceOptions] = None
+    reader_options: Optional[ClusterInstanceOptions] = None
+    # Parameter groups are regional, the workload profile of the primary is created in the secondary stack otherwise
+    parameter_group: Optional[rds.IParameterGroup] = None
+    performance_insight_encryption_key: Optional[kms.IKey] = None  # default key of the region when not given
+
+
+@dataclass
+class SecondaryCluster:
+    stack: Stack
+    cluster: rds.DatabaseClusterFromSnapshot
+
+
+class AuroraGlobalDatabase:
+
+    @staticmethod
+    def create_global_cluster(stack: Stack, construct_id: str, global_cluster_identifier: str,
+                              primary: rds.DatabaseCluster, deletion_protection: bool) -> rds.CfnGlobalCluster:
+        global_cluster = rds.CfnGlobalCluster(stack, f"{construct_id}GlobalCluster",
+                                              global_cluster_identifier=global_cluster_identifier,
+                                              source_db_cluster_identifier=primary.cluster_identifier,
+                                              deletion_protection=deletion_protection)
+        global_cluster.node.add_dependency(primary)
+        return global_cluster
+
+    @staticmethod
+    def secondary_stack(primary_stack: Stack, construct_id: str, options: SecondaryClusterOptions) -> Stack:
+        if options.stack:
+            return options.stack
+        stack_name = f"{primary_stack.stack_name}-{construct_id}-{options.region}".replace("_", "-")
+        return Stack(primary_stack.node.root, stack_name,
+                     env=Environment(account=primary_stack.account, region=options.region))
+
+    @staticmethod
+    def secondary_vpc(stack: Stack, construct_id: str, options: SecondaryClusterOptions) -> ec2.IVpc:
+        if options.vpc:
+            return options.vpc
+        vpc_builder = VpcBuilder(f"{construct_id}Vpc", stack)
+        vpc_builder.ip_addresses(options.vpc_cidr)
+        vpc_builder.subnet_configuration([
+            ec2.SubnetConfiguration(name="Database", subnet_type=ec2.SubnetType.PRIVATE_ISOLATED, cidr_mask=20)
+        ])
+        return vpc_builder.build()
+
+    @staticmethod
+    def create_secondary(primary_stack: Stack, construct_id: str, global_cluster: rds.CfnGlobalCluster,
+                         engine: rds.IClusterEngine, options: SecondaryClusterOptions, storage_encrypted: bool,
+                         writer_options: ClusterInstanceOptions, reader_options: ClusterInstanceOptions,
+                         workload_profile: Optional[WorkloadProfile], parameter_overrides: Optional[Mapping[str, str]],
+                         instance_props: dict, **cluster_props) -> SecondaryCluster:
+        """
+        Secondary cluster attached to the global cluster, without credentials of its own. It is created as a snapshot
+        restore then switched to a global cluster member, the same way clones are. Its instances are created with the
+        given options and props, like the instances of the primary cluster
+        """
+        stack = AuroraGlobalDatabase.secondary_stack(primary_stack, construct_id, options)
+        if stack.region == primary_stack.region:
+            raise ValueError("Secondary clusters must be in another region than the primary cluster")
+        # The global cluster is created with the primary stack, deploy it first
+        stack.add_dependency(primary_stack)
+
+        secondary_id = f"{construct_id}Secondary"
+        parameter_group = options.parameter_group
+        if parameter_group is None and workload_profile is not None:
+            parameter_group = ParameterGroupProfiles.create(stack, secondary_id, engine, workload_profile,
+                                                            parameter_overrides)
+        instance_props = {**instance_props,
+                          "parameter_group": parameter_group,
+                          "performance_insight_encryption_key": options.performance_insight_encryption_key}
+        cluster = rds.DatabaseClusterFromSnapshot(
+            stack, secondary_id,
+            snapshot_identifier=global_cluster.global_cluster_identifier,
+            engine=engine,
+            writer=ClusterInstances.create("writer", writer_options,
+                                           auto_minor_version_upgrade=True,
+                                           publicly_accessible=False,
+                                           **instance_props),
+            readers=[ClusterInstances.create(AuroraReaders.reader_id(instance_idx), reader_options,
+                                             scale_with_writer=instance_idx == 1,
+                                             auto_minor_version_upgrade=True,
+                                             publicly_accessible=False,
+                                             **instance_props)
+                     for instance_idx in range(1, options.readers + 1)],
+            vpc=AuroraGlobalDatabase.secondary_vpc(stack, secondary_id, options),
+            vpc_subnets=PRIVATE_ISOLATED_SUBNETS,
+            storage_encrypted=storage_encrypted,
+            storage_encryption_key=options.storage_encryption_key,
+            **cluster_props)
+
+        cfn_cluster: rds.CfnDBCluster = cluster.node.default_child
+        cfn_cluster.add_property_deletion_override("SnapshotIdentifier")
+        cfn_cluster.add_property_override("GlobalClusterIdentifier", global_cluster.global_cluster_identifier)
+        if options.write_forwarding:
+            cfn_cluster.add_property_override("EnableGlobalWriteForwarding", True)
+        return SecondaryCluster(stack=stack, cluster=cluster)
@@ -0,0 +1,125 @@
+from enum import StrEnum
+from typing import Mapping, Optional
+
+from aws_cdk import aws_rds as rds, Stack
+
+
+class WorkloadProfile(StrEnum):
+    OLTP = 'oltp'
+    READ_HEAVY = 'read-heavy'
+    ANALYTICS = 'analytics'
+
+
+class EngineFamily(StrEnum):
+    AURORA_MYSQL_3 = 'aurora-mysql'
+    AURORA_POSTGRESQL = 'aurora-postgresql'
+    MYSQL = 'mysql'
+    POSTGRESQL = 'postgres'
+
+
+# Values are RDS parameter formulas, DBInstanceClassMemory is resolved by RDS from the instance class, or from the
+# maximum ACU for Aurora Serverless v2 instances, so the profiles scale with the capacity of each instance.
+# Memory based parameters are in bytes for MySQL and in kB (work_mem, maintenance_work_mem) or 8kB pages
+# (shared_buffers, effective_cache_size) for PostgreSQL.
+MYSQL_PROFILES = {
+    WorkloadProfile.OLTP: {
+        "max_connections": "{DBInstanceClassMemory/12582880}",
+        "wait_timeout": "300",
+        "interactive_timeout": "300",
+        "innodb_lock_wait_timeout": "20",
+        "table_open_cache": "4000",
+    },
+    WorkloadProfile.READ_HEAVY: {
+        "max_connections": "{DBInstanceClassMemory/12582880}",
+        "wait_timeout": "600",
+        "innodb_adaptive_hash_index": "1",
+        "table_open_cache": "8000",
+        "table_definition_cache": "4000",
+    },
+    WorkloadProfile.ANALYTICS: {
+        "max_connections": "{DBInstanceClassMemory/50331648}",
+        "wait_timeout": "28800",
+        "sort_buffer_size": "8388608",
+        "join_buffer_size": "8388608",
+        "read_rnd_buffer_size": "4194304",
+        "tmp_table_size": "268435456",
+        "max_heap_table_size": "268435456",
+    },
+}
+
+# The buffer pool is managed by Aurora, it is only tuned on RDS for MySQL
+MYSQL_BUFFER_POOL = {
+    WorkloadProfile.OLTP: {"innodb_buffer_pool_size": "{DBInstanceClassMemory*3/4}"},
+    WorkloadProfile.READ_HEAVY: {"innodb_buffer_pool_size": "{DBInstanceClassMemory*4/5}"},
+    WorkloadProfile.ANALYTICS: {"innodb_buffer_pool_size": "{DBInstanceClassMemory*3/4}"},
+}
+
+POSTGRESQL_PROFILES = {
+    WorkloadProfile.OLTP: {
+        "max_connections": "LEAST({DBInstanceClassMemory/9531392},5000)",
+        "work_mem": "4096",
+        "random_page_cost": "1.1",
+        "idle_in_transaction_session_timeout": "60000",
+    },
+    WorkloadProfile.READ_HEAVY: {
+        "max_connections": "LEAST({DBInstanceClassMemory/9531392},5000)",
+        "work_mem": "8192",
+        "random_page_cost": "1.1",
+        "effective_cache_size": "{DBInstanceClassMemory*3/32768}",
+    },
+    WorkloadProfile.ANALYTICS: {
+        "max_connections": "LEAST({DBInstanceClassMemory/37748736},1000)",
+        "work_mem": "{DBInstanceClassMemory/65536}",
+        "maintenance_work_mem": "{DBInstanceClassMemory/16384}",
+        "max_parallel_workers_per_gather": "4",
+        "random_page_cost": "1.1",
+    },
+}
+
+# Shared buffers are managed by Aurora, they are only tuned on RDS for PostgreSQL
+POSTGRESQL_SHARED_BUFFERS = {
+    WorkloadProfile.OLTP: {"shared_buffers": "{DBInstanceClassMemory/32768}"},
+    WorkloadProfile.READ_HEAVY: {"shared_buffers": "{DBInstanceClassMemory/20480}"},
+    WorkloadProfile.ANALYTICS: {"shared_buffers": "{DBInstanceClassMemory/32768}"},
+}
+
+
+class ParameterGroupProfiles:
+
+    @staticmethod
+    def engine_family(engine: rds.IEngine) -> EngineFamily:
+        engine_type = engine.engine_type
+        if engine_type == EngineFamily.AURORA_MYSQL_3:
+            if engine.engine_version is None or not engine.engine_version.full_version.startswith("8.0"):
+                raise ValueError("Workload profiles support Aurora MySQL 3 only")
+        if engine_type not in [engine_family.value for engine_family in EngineFamily]:
+            raise ValueError(f"Workload profiles do not support the {engine_type} engine")
+        return EngineFamily(engine_type)
+
+    @staticmethod
+    def parameters(engine: rds.IEngine, workload_profile: WorkloadProfile,
+                   overrides: Optional[Mapping[str, str]] = None) -> dict[str, str]:
+        """
+        Instance parameters of the workload profile for the engine family, overrides take precedence
+        """
+        engine_family = ParameterGroupProfiles.engine_family(engine)
+        if engine_family in [EngineFamily.AURORA_MYSQL_3, EngineFamily.MYSQL]:
+            parameters = dict(MYSQL_PROFILES[workload_profile])
+            if engine_family == EngineFamily.MYSQL:
+                parameters.update(MYSQL_BUFFER_POOL[workload_profile])
+        else:
+            parameters = dict(POSTGRESQL_PROFILES[workload_profile])
+            if engine_family == EngineFamily.POSTGRESQL:
+                parameters.update(POSTGRESQL_SHARED_BUFFERS[workload_profile])
+        return {**parameters, **(overrides or {})}
+
+    @staticmethod
+    def create(stack: Stack, construct_id: str, engine: rds.IEngine, workload_profile: WorkloadProfile,
+               overrides: Optional[Mapping[str, str]] = None) -> rds.ParameterGroup:
+        """
+        Instance parameter group of the workload profile, Aurora clusters attach it to each of their instances
+        """
+        return rds.ParameterGroup(stack, f"{construct_id}ParameterGroup",
+                                  engine=engine,
+                                  description=f"{construct_id} {workload_profile} workload profile",
+                                  parameters=ParameterGroupProfiles.parameters(engine, workload_profile, overrides))
@@ -1,6 +1,15 @@
-from aws_cdk import aws_rds as rds, aws_ec2 as ec2, Stack, Duration, RemovalPolicy
+from typing import Optional
+
+from aws_cdk import aws_rds as rds, aws_ec2 as ec2, aws_iam as iam, aws_kms as kms, Stack, Duration, RemovalPolicy
+from aws_cdk import aws_applicationautoscaling as appscaling
 
 from packages.builder import Builder
+from packages.databases.rds.capacity_schedule import CapacityWindow, ServerlessCapacitySchedule
+from packages.databases.rds.cluster_instances import ClusterInstanceOptions, ClusterInstances
+from packages.databases.rds.global_database import AuroraGlobalDatabase, SecondaryCluster, SecondaryClusterOptions
+from packages.databases.rds.aurora_readers import AuroraReaders, CustomReaderEndpoint, ReaderAutoScalingOptions
+from packages.databases.rds.parameter_group_profiles import ParameterGroupProfiles, WorkloadProfile
+from packages.databases.rds.rds_proxy import RdsProxy, RdsProxyOptions, RdsProxyResources
 
 FIRST_READER_REPLICA = 1
 
@@ -18,10 +27,35 @@ class RdsClusterBuilder(Builder):
         self.__creds_rotation_days = 30
         self.__security_groups = None
         self.__storage_encrypted = True
+        self.__storage_type = None
         self.__cluster_identifier = None
-        self.__readers = []
+        self.__reader_instances = 0
         self.__serverless_v2_min_capacity = None
         self.__serverless_v2_max_capacity = None
+        self.__capacity_windows: list[CapacityWindow] = []
+        self.__writer_options: Optional[ClusterInstanceOptions] = None
+        self.__reader_options: Optional[ClusterInstanceOptions] = None
+        self.__reader_overrides: dict[int, ClusterInstanceOptions] = {}
+        self.__enable_performance_insights = None
+        self.__performance_insight_retention = None
+        self.__performance_insight_encryption_key = None
+        self.__monitoring_interval = None
+        self.__monitoring_role = None
+        self.__workload_profile: Optional[WorkloadProfile] = None
+        self.__parameter_overrides = None
+        self.__parameter_group: Optional[rds.ParameterGroup] = None
+        self.__proxy_options: Optional[RdsProxyOptions] = None
+        self.__proxy_resources: Optional[RdsProxyResources] = None
+        self.__reader_promotion_tiers: dict[int, int] = {}
+        self.__reader_auto_scaling: Optional[ReaderAutoScalingOptions] = None
+        self.__reader_scalable_target: Optional[appscaling.ScalableTarget] = None
+        self.__custom_reader_endpoints: list[CustomReaderEndpoint] = []
+        self.__reader_endpoints: dict[str, str] = {}
+        self.__global_cluster_identifier = None
+        self.__secondary_cluster_options: list[SecondaryClusterOptions] = []
+        self.__global_cluster: Optional[rds.CfnGlobalCluster] = None
+        self.__secondary_clusters: list[SecondaryCluster] = []
+        self.__regional_reader_endpoints: dict[str, rds.Endpoint] = {}
 
     def engine(self, engine: rds.DatabaseInstanceEngine):
         self.__engine = engine
@@ -50,6 +84,12 @@ class RdsClusterBuilder(Builder):
     def storage_encrypted(self, storage_encrypted):
         self.__storage_encrypted = storage_encrypted
 
+    def storage_type(self, storage_type: rds.DBClusterStorageType):
+        """
+        Aurora Standard by default, AURORA_IOPT1 (I/O-Optimized) has no per request I/O charges for I/O-heavy workloads
+        """
+        self.__storage_type = storage_type
+
     def cluster_identifier(self, cluster_identifier):
         self.__cluster_identifier = cluster_identifier
 
@@ -59,27 +99,252 @@ class RdsClusterBuilder(Builder):
     def serverless_v2_max_capacity(self, serverless_v2_max_capacity):
         self.__serverless_v2_max_capacity = serverless_v2_max_capacity
 
+    def capacity_window(self, capacity_window: CapacityWindow):
+        """
+        Scheduled serverless v2 min and max capacity, e.g. to pre-warm the cluster before nightly batch jobs. The
+        serverless v2 capacity of the cluster is restored at the end of the window
+        """
+        self.__capacity_windows.append(capacity_window)
+
     def readers(self, reader_instances: int):
         """
         Number of required reader instances
 
         :type reader_instances: positive number
         """
-        for instance_idx in range(1, reader_instances + 1):
-            is_first_reader = instance_idx == FIRST_READER_REPLICA
-            self.__readers.append(rds.ClusterInstance.serverless_v2(f"reader-{instance_idx}",
-                                                                    scale_with_writer=is_first_reader,
-                                                                    auto_minor_version_upgrade=True,
-                                                                    publicly_accessible=False))
+        self.__reader_instances = reader_instances
+
+    def reader_promotion_tier(self, reader: int, promotion_tier: int):
+        """
+        Failover priority of a reader, lower tiers are promoted first. Serverless v2 readers in tier 0 or 1 scale
+        with the writer
+
+        :type reader: reader number, starting at 1
+        :type promotion_tier: number between 0 and 15
+        """
+        self.__reader_promotion_tiers[reader] = promotion_tier
+
+    def reader_auto_scaling(self, reader_auto_scaling: ReaderAutoScalingOptions):
+        """
+        Aurora Replica auto scaling on top of the readers of the cluster, requires at least one reader
+        """
+        self.__reader_auto_scaling = reader_auto_scaling
+
+    def custom_reader_endpoint(self, endpoint_name: str, readers: list[int]):
+        """
+        Custom endpoint routing to dedicated readers, e.g. for analytics traffic
+
+        :type readers: reader numbers, starting at 1
+        """
+        self.__custom_reader_endpoints.append(CustomReaderEndpoint(endpoint_name=endpoint_name, readers=readers))
+
+    def writer_instance(self, writer_options: ClusterInstanceOptions):
+        """
+        Provisioned or serverless v2 writer, serverless v2 by default
+        """
+        self.__writer_options = writer_options
+
+    def reader_instance(self, reader_options: ClusterInstanceOptions, reader: Optional[int] = None):
+        """
+        Provisioned or serverless v2 readers, serverless v2 by default. Applies to every reader unless a reader is given
+
+        :type reader: reader number, starting at 1
+        """
+        if reader is None:
+            self.__reader_options = reader_options
+        else:
+            self.__reader_overrides[reader] = reader_options
+
+    def global_cluster(self, global_cluster_identifier: str):
+        """
+        Makes the cluster the primary cluster of an Aurora Global Database
+        """
+        self.__global_cluster_identifier = global_cluster_identifier
+
+    def secondary_cluster(self, secondary_cluster_options: SecondaryClusterOptions):
+        """
+        Secondary cluster of the global database in another region, with its own readers. Its stack is created by
+        the builder unless one is given in the options
+        """
+        self.__secondary_cluster_options.append(secondary_cluster_options)
+
+    def enable_performance_insights(self, enable_performance_insights: bool):
+        """
+        Performance Insights settings are applied to the writer and every reader of the cluster
+        """
+        self.__enable_performance_insights = enable_performance_insights
+
+    def performance_insight_retention(self, performance_insight_retention: rds.PerformanceInsightRetention):
+        self.__performance_insight_retention = performance_insight_retention
+
+    def performance_insight_encryption_key(self, performance_insight_encryption_key: kms.IKey):
+        self.__performance_insight_encryption_key = performance_insight_encryption_key
+
+    def monitoring_interval(self, monitoring_interval: Duration):
+        """
+        Enhanced Monitoring interval of the writer and every reader of the cluster, disabled when not set
+        """
+        self.__monitoring_interval = monitoring_interval
+
+    def monitoring_role(self, monitoring_role: iam.IRole):
+        self.__monitoring_role = monitoring_role
+
+    def workload_profile(self, workload_profile: WorkloadProfile, parameter_overrides: Optional[dict[str, str]] = None):
+        """
+        Parameter group tuned for the workload, shared by the writer and every reader of the cluster. Parameter
+        overrides take precedence over the profile values
+        """
+        self.__workload_profile = workload_profile
+        self.__parameter_overrides = parameter_overrides
+
+    def proxy(self, proxy_options: RdsProxyOptions):
+        self.__proxy_options = proxy_options
+
+    @property
+    def db_proxy(self) -> Optional[RdsProxyResources]:
+        """
+        RDS Proxy created by build, when proxy options were given
+        """
+        return self.__proxy_resources
+
+    @property
+    def reader_scalable_target(self) -> Optional[appscaling.ScalableTarget]:
+        return self.__reader_scalable_target
+
+    @property
+    def reader_endpoints(self) -> dict[str, str]:
+        """
+        Addresses of the custom reader endpoints created by build, by endpoint name
+        """
+        return self.__reader_endpoints
+
+    @property
+    def db_global_cluster(self) -> Optional[rds.CfnGlobalCluster]:
+        return self.__global_cluster
+
+    @property
+    def secondary_clusters(self) -> list[SecondaryCluster]:
+        """
+        Secondary clusters created by build with their stacks, for the app to deploy in their regions
+        """
+        return self.__secondary_clusters
+
+    @property
+    def regional_reader_endpoints(self) -> dict[str, rds.Endpoint]:
+        """
+        Reader endpoint of the primary and secondary clusters, by region
+        """
+        return self.__regional_reader_endpoints
+
+    def __create_global_database(self, primary: rds.DatabaseCluster):
+        self.__global_cluster = AuroraGlobalDatabase.create_global_cluster(self.stack, self.construct_id,
+                                                                           self.__global_cluster_identifier,
+                                                                           primary, self.__deletion_protection)
+        # the parameter group and Performance Insights key are regional, they are resolved for each secondary region
+        secondary_instance_props = {"enable_performance_insights": self.__enable_performance_insights,
+                                    "performance_insight_retention": self.__performance_insight_retention}
+        self.__secondary_clusters = [
+            AuroraGlobalDatabase.create_secondary(self.stack, self.construct_id, self.__global_cluster,
+                                                  self.__engine, options, self.__storage_encrypted,
+                                                  writer_options=self.__secondary_writer_options(options),
+                                                  reader_options=self.__secondary_reader_options(options),
+                                                  workload_profile=self.__workload_profile,
+                                                  parameter_overrides=self.__parameter_overrides,
+                                                  instance_props=secondary_instance_props,
+                                                  monitoring_interval=self.__monitoring_interval,
+                                                  port=self.__port,
+                                                  serverless_v2_min_capacity=self.__serverless_v2_min_capacity,
+                                                  serverless_v2_max_capacity=self.__serverless_v2_max_capacity,
+                                                  deletion_protection=self.__deletion_protection,
+                                                  removal_policy=self.__removal_policy,
+                                                  storage_type=self.__storage_type)
+            for options in self.__secondary_cluster_options]
+        self.__regional_reader_endpoints = {self.stack.region: primary.cluster_read_endpoint}
+        for secondary in self.__secondary_clusters:
+            self.__regional_reader_endpoints[secondary.stack.region] = secondary.cluster.cluster_read_endpoint
+
+    def __secondary_writer_options(self, options: SecondaryClusterOptions) -> ClusterInstanceOptions:
+        return options.writer_options or self.__writer_options or ClusterInstanceOptions()
+
+    def __secondary_reader_options(self, options: SecondaryClusterOptions) -> ClusterInstanceOptions:
+        return options.reader_options or self.__reader_options or ClusterInstanceOptions()
+
+    def __validate_secondary_clusters(self):
+        # a promoted secondary cluster takes over the workload of the primary, it must run on the same kind of instances
+        primary_writer = self.__writer_options or ClusterInstanceOptions()
+        primary_reader = self.__reader_options or ClusterInstanceOptions()
+        for options in self.__secondary_cluster_options:
+            for role, secondary, primary in (("writer", self.__secondary_writer_options(options), primary_writer),
+                                             ("reader", self.__secondary_reader_options(options), primary_reader)):
+                ClusterInstances.validate(self.__engine, secondary)
+                if secondary.kind != primary.kind:
+                    raise ValueError(f"Secondary cluster {role} in {options.region} must be {primary.kind} like the "
+                                     f"primary cluster {role}")
+
+    def __validate_readers(self):
+        endpoint_readers = [reader for endpoint in self.__custom_reader_endpoints for reader in endpoint.readers]
+        readers = [*self.__reader_promotion_tiers, *self.__reader_overrides, *endpoint_readers]
+        for reader in readers:
+            AuroraReaders.validate_reader(reader, self.__reader_instances)
+        for endpoint in self.__custom_reader_endpoints:
+            AuroraReaders.endpoint_identifier(endpoint.endpoint_name)
+        if self.__secondary_cluster_options and not self.__global_cluster_identifier:
+            raise ValueError("Secondary clusters require a global cluster identifier")
+        if self.__reader_auto_scaling and self.__reader_instances == 0:
+            raise ValueError("Reader auto scaling requires at least one reader")
+
+    def __create_parameter_group(self) -> Optional[rds.ParameterGroup]:
+        if self.__workload_profile is None:
+            return None
+        return ParameterGroupProfiles.create(self.stack, self.construct_id, self.__engine, self.__workload_profile,
+                                             self.__parameter_overrides)
+
+    def __instance_props(self) -> dict:
+        return {"parameter_group": self.__parameter_group,
+                "enable_performance_insights": self.__enable_performance_insights,
+                "performance_insight_retention": self.__performance_insight_retention,
+                "performance_insight_encryption_key": self.__performance_insight_encryption_key}
+
+    def __validate_instances(self):
+        # the options the instances are created with, the serverless v2 default only warns on older engine versions
+        # as it was not validated before
+        instance_options = [self.__writer_options,
+                            *(self.__reader_overrides.get(reader) or self.__reader_options
+                              for reader in range(1, self.__reader_instances + 1))]
+        for options in instance_options:
+            if options is not None:
+                ClusterInstances.validate(self.__engine, options)
+        if None in instance_options:
+            ClusterInstances.validate(self.__engine, ClusterInstanceOptions(), warning_scope=self.stack)
+
+    def __reader_instance_options(self, reader: int) -> ClusterInstanceOptions:
+        return self.__reader_overrides.get(reader) or self.__reader_options or ClusterInstanceOptions()
+
+    def __create_writer(self) -> rds.IClusterInstance:
+        return ClusterInstances.create("writer", self.__writer_options or ClusterInstanceOptions(),
+                                       auto_minor_version_upgrade=True,
+                                       publicly_accessible=False,
+                                       **self.__instance_props())
+
+    def __create_readers(self) -> list[rds.IClusterInstance]:
+        return [ClusterInstances.create(AuroraReaders.reader_id(instance_idx),
+                                        self.__reader_instance_options(instance_idx),
+                                        scale_with_writer=instance_idx == FIRST_READER_REPLICA,
+                                        auto_minor_version_upgrade=True,
+                                        publicly_accessible=False,
+                                        **self.__instance_props())
+                for instance_idx in range(1, self.__reader_instances + 1)]
 
     def build(self) -> rds.DatabaseInstance:
+        self.__validate_instances()
+        self.__validate_readers()
+        self.__validate_secondary_clusters()
+        self.__parameter_group = self.__create_parameter_group()
         instance = rds.DatabaseCluster(self.stack, self.construct_id,
                                        cluster_identifier=self.__cluster_identifier,
                                        engine=self.__engine,
-                                       writer=rds.ClusterInstance.serverless_v2("writer",
-                                                                                auto_minor_version_upgrade=True,
-                                                                                publicly_accessible=False),
-                                       readers=self.__readers,
+                                       writer=self.__create_writer(),
+                                       readers=self.__create_readers(),
                                        vpc=self.__vpc,
                                        vpc_subnets=ec2.SubnetSelection(subnet_type=ec2.SubnetType.PRIVATE_ISOLATED),
                                        serverless_v2_min_capacity=self.__serverless_v2_min_capacity,
@@ -89,9 +354,37 @@ class RdsClusterBuilder(Builder):
                                        deletion_protection=self.__deletion_protection,
                                        removal_policy=self.__removal_policy,
                                        security_groups=[self.__security_groups],
+                                       monitoring_interval=self.__monitoring_interval,
+                                       monitoring_role=self.__monitoring_role,
+                                       storage_type=self.__storage_type,
                                        storage_encrypted=self.__storage_encrypted)
 
         # Add single-user rotation to the RDS instance
         instance.add_rotation_single_user(automatically_after=Duration.days(self.__creds_rotation_days))
 
+        for reader, promotion_tier in self.__reader_promotion_tiers.items():
+            AuroraReaders.promotion_tier(instance, reader, promotion_tier)
+        if self.__reader_auto_scaling:
+            self.__reader_scalable_target = AuroraReaders.auto_scale(self.stack, self.construct_id, instance,
+                                                                     self.__reader_auto_scaling)
+        for endpoint in self.__custom_reader_endpoints:
+            cluster_endpoint = AuroraReaders.custom_endpoint(self.stack, self.construct_id, instance, endpoint)
+            self.__reader_endpoints[endpoint.endpoint_name] = cluster_endpoint.get_response_field("Endpoint")
+
+        if self.__global_cluster_identifier:
+            self.__create_global_database(instance)
+
+        if self.__capacity_windows:
+            ServerlessCapacitySchedule.create(self.stack, self.construct_id, instance, self.__capacity_windows,
+                                              self.__serverless_v2_min_capacity, self.__serverless_v2_max_capacity)
+
+        if self.__proxy_options:
+            self.__proxy_resources = RdsProxy.create(self.stack, self.construct_id,
+                                                     proxy_target=rds.ProxyTarget.from_cluster(instance),
+                                                     database=instance,
+                                                     secret=instance.secret,
+                                                     vpc=self.__vpc,
+                                                     options=self.__proxy_options,
+                                                     supports_readers=True)
+
         return instance
@@ -1,6 +1,13 @@
-from aws_cdk import aws_rds as rds, aws_ec2 as ec2, Stack, Duration, RemovalPolicy
+from typing import Optional
+
+from aws_cdk import aws_rds as rds, aws_ec2 as ec2, aws_iam as iam, aws_kms as kms, Stack, Duration, RemovalPolicy
 
 from packages.builder import Builder
+from packages.databases.rds.cluster_instances import ClusterInstanceOptions, ClusterInstances
+from packages.databases.rds.parameter_group_profiles import ParameterGroupProfiles, WorkloadProfile
+from packages.databases.rds.rds_proxy import RdsProxy, RdsProxyOptions, RdsProxyResources
+
+FIRST_READER_REPLICA = 1
 
 
 class RdsClusterFromSnapshotBuilder(Builder):
@@ -8,6 +15,8 @@ class RdsClusterFromSnapshotBuilder(Builder):
     def __init__(self, construct_id: str, stack: Stack):
         super().__init__(construct_id, stack)
         self.__snapshot_identifier = None
+        self.__clone_source_cluster_identifier = None
+        self.__clone_restore_to_time = None
         self.__engine = None
         self.__vpc = None
         self.__credentials = None
@@ -17,14 +26,38 @@ class RdsClusterFromSnapshotBuilder(Builder):
         self.__creds_rotation_days = 30
         self.__security_groups = None
         self.__storage_encrypted = True
+        self.__storage_type = None
         self.__cluster_identifier = None
-        self.__readers = []
+        self.__reader_instances = 0
         self.__serverless_v2_min_capacity = None
         self.__serverless_v2_max_capacity = None
+        self.__writer_options: Optional[ClusterInstanceOptions] = None
+        self.__reader_options: Optional[ClusterInstanceOptions] = None
+        self.__reader_overrides: dict[int, ClusterInstanceOptions] = {}
+        self.__enable_performance_insights = None
+        self.__performance_insight_retention = None
+        self.__performance_insight_encryption_key = None
+        self.__monitoring_interval = None
+        self.__monitoring_role = None
+        self.__workload_profile: Optional[WorkloadProfile] = None
+        self.__parameter_overrides = None
+        self.__parameter_group: Optional[rds.ParameterGroup] = None
+        self.__proxy_options: Optional[RdsProxyOptions] = None
+        self.__proxy_resources: Optional[RdsProxyResources] = None
 
     def snapshot_identifier(self, snapshot_identifier: str):
         self.__snapshot_identifier = snapshot_identifier
 
+    def clone_from(self, source_cluster_identifier: str, restore_to_time: Optional[str] = None):
+        """
+        Copy-on-write clone of a running cluster instead of a snapshot restore. The clone shares storage pages with
+        its source until they diverge, so it is available in minutes whatever the size of the source
+
+        :type restore_to_time: ISO 8601 UTC time to clone, latest restorable time when not set
+        """
+        self.__clone_source_cluster_identifier = source_cluster_identifier
+        self.__clone_restore_to_time = restore_to_time
+
     def engine(self, engine: rds.DatabaseInstanceEngine):
         self.__engine = engine
 
@@ -55,6 +88,12 @@ class RdsClusterFromSnapshotBuilder(Builder):
     def storage_encrypted(self, storage_encrypted):
         self.__storage_encrypted = storage_encrypted
 
+    def storage_type(self, storage_type: rds.DBClusterStorageType):
+        """
+        Aurora Standard by default, AURORA_IOPT1 (I/O-Optimized) has no per request I/O charges for I/O-heavy workloads
+        """
+        self.__storage_type = storage_type
+
     def cluster_identifier(self, cluster_identifier):
         self.__cluster_identifier = cluster_identifier
 
@@ -70,24 +109,136 @@ class RdsClusterFromSnapshotBuilder(Builder):
 
         :type reader_instances: positive number
         """
-        first_reader_replica = 1
-        for instance_idx in range(1, reader_instances + 1):
-            is_first_reader = instance_idx == first_reader_replica
-            self.__readers.append(rds.ClusterInstance.serverless_v2(f"reader-{instance_idx}",
-                                                                    scale_with_writer=is_first_reader,
-                                                                    auto_minor_version_upgrade=True,
-                                                                    publicly_accessible=False))
+        self.__reader_instances = reader_instances
+
+    def writer_instance(self, writer_options: ClusterInstanceOptions):
+        """
+        Provisioned or serverless v2 writer, serverless v2 by default
+        """
+        self.__writer_options = writer_options
+
+    def reader_instance(self, reader_options: ClusterInstanceOptions, reader: Optional[int] = None):
+        """
+        Provisioned or serverless v2 readers, serverless v2 by default. Applies to every reader unless a reader is given
+
+        :type reader: reader number, starting at 1
+        """
+        if reader is None:
+            self.__reader_options = reader_options
+        else:
+            self.__reader_overrides[reader] = reader_options
+
+    def enable_performance_insights(self, enable_performance_insights: bool):
+        """
+        Performance Insights settings are applied to the writer and every reader of the cluster
+        """
+        self.__enable_performance_insights = enable_performance_insights
+
+    def performance_insight_retention(self, performance_insight_retention: rds.PerformanceInsightRetention):
+        self.__performance_insight_retention = performance_insight_retention
+
+    def performance_insight_encryption_key(self, performance_insight_encryption_key: kms.IKey):
+        self.__performance_insight_encryption_key = performance_insight_encryption_key
+
+    def monitoring_interval(self, monitoring_interval: Duration):
+        """
+        Enhanced Monitoring interval of the writer and every reader of the cluster, disabled when not set
+        """
+        self.__monitoring_interval = monitoring_interval
+
+    def monitoring_role(self, monitoring_role: iam.IRole):
+        self.__monitoring_role = monitoring_role
+
+    def workload_profile(self, workload_profile: WorkloadProfile, parameter_overrides: Optional[dict[str, str]] = None):
+        """
+        Parameter group tuned for the workload, shared by the writer and every reader of the cluster. Parameter
+        overrides take precedence over the profile values
+        """
+        self.__workload_profile = workload_profile
+        self.__parameter_overrides = parameter_overrides
+
+    def proxy(self, proxy_options: RdsProxyOptions):
+        self.__proxy_options = proxy_options
+
+    @property
+    def db_proxy(self) -> Optional[RdsProxyResources]:
+        """
+        RDS Proxy created by build, when proxy options were given
+        """
+        return self.__proxy_resources
+
+    def __create_parameter_group(self) -> Optional[rds.ParameterGroup]:
+        if self.__workload_profile is None:
+            return None
+        return ParameterGroupProfiles.create(self.stack, self.construct_id, self.__engine, self.__workload_profile,
+                                             self.__parameter_overrides)
+
+    def __instance_props(self) -> dict:
+        return {"parameter_group": self.__parameter_group,
+                "enable_performance_insights": self.__enable_performance_insights,
+                "performance_insight_retention": self.__performance_insight_retention,
+                "performance_insight_encryption_key": self.__performance_insight_encryption_key}
+
+    def __validate_instances(self):
+        for reader in self.__reader_overrides:
+            if not 1 <= reader <= self.__reader_instances:
+                raise ValueError(f"Reader {reader} does not exist, the cluster has {self.__reader_instances} readers")
+        # the options the instances are created with, the serverless v2 default only warns on older engine versions
+        # as it was not validated before
+        instance_options = [self.__writer_options,
+                            *(self.__reader_overrides.get(reader) or self.__reader_options
+                              for reader in range(1, self.__reader_instances + 1))]
+        for options in instance_options:
+            if options is not None:
+                ClusterInstances.validate(self.__engine, options)
+        if None in instance_options:
+            ClusterInstances.validate(self.__engine, ClusterInstanceOptions(), warning_scope=self.stack)
+
+    def __reader_instance_options(self, reader: int) -> ClusterInstanceOptions:
+        return self.__reader_overrides.get(reader) or self.__reader_options or ClusterInstanceOptions()
+
+    def __create_writer(self) -> rds.IClusterInstance:
+        return ClusterInstances.create("writer", self.__writer_options or ClusterInstanceOptions(),
+                                       auto_minor_version_upgrade=True,
+                                       publicly_accessible=False,
+                                       **self.__instance_props())
+
+    def __create_readers(self) -> list[rds.IClusterInstance]:
+        return [ClusterInstances.create(f"reader-{instance_idx}", self.__reader_instance_options(instance_idx),
+                                        scale_with_writer=instance_idx == FIRST_READER_REPLICA,
+                                        auto_minor_version_upgrade=True,
+                                        publicly_accessible=False,
+                                        **self.__instance_props())
+                for instance_idx in range(1, self.__reader_instances + 1)]
+
+    def __validate_source(self):
+        if self.__snapshot_identifier and self.__clone_source_cluster_identifier:
+            raise ValueError("A cluster is either restored from a snapshot or cloned from a source cluster")
+        if not self.__snapshot_identifier and not self.__clone_source_cluster_identifier:
+            raise ValueError("A snapshot identifier or a source cluster identifier to clone is required")
+
+    def __configure_clone(self, cluster: rds.DatabaseClusterFromSnapshot):
+        cfn_cluster: rds.CfnDBCluster = cluster.node.default_child
+        cfn_cluster.add_property_deletion_override("SnapshotIdentifier")
+        cfn_cluster.add_property_override("SourceDBClusterIdentifier", self.__clone_source_cluster_identifier)
+        cfn_cluster.add_property_override("RestoreType", "copy-on-write")
+        if self.__clone_restore_to_time:
+            cfn_cluster.add_property_override("RestoreToTime", self.__clone_restore_to_time)
+        else:
+            cfn_cluster.add_property_override("UseLatestRestorableTime", True)
 
     def build(self) -> rds.DatabaseInstance:
+        self.__validate_source()
+        self.__validate_instances()
+        self.__parameter_group = self.__create_parameter_group()
+        # A clone is created as a snapshot restore, then switched to a copy-on-write restore of its source cluster
+        snapshot_identifier = self.__snapshot_identifier or self.__clone_source_cluster_identifier
         instance = rds.DatabaseClusterFromSnapshot(self.stack, self.construct_id,
-                                                   snapshot_identifier=self.__snapshot_identifier,
+                                                   snapshot_identifier=snapshot_identifier,
                                                    cluster_identifier=self.__cluster_identifier,
                                                    engine=self.__engine,
-                                                   writer=rds.ClusterInstance.serverless_v2("writer",
-                                                                                            auto_minor_version_upgrade=True,
-                                                                                            publicly_accessible=False
-                                                                                            ),
-                                                   readers=self.__readers,
+                                                   writer=self.__create_writer(),
+                                                   readers=self.__create_readers(),
                                                    vpc=self.__vpc,
                                                    vpc_subnets=ec2.SubnetSelection(
                                                        subnet_type=ec2.SubnetType.PRIVATE_ISOLATED
@@ -99,12 +250,27 @@ class RdsClusterFromSnapshotBuilder(Builder):
                                                    deletion_protection=self.__deletion_protection,
                                                    removal_policy=self.__removal_policy,
                                                    security_groups=[self.__security_groups],
+                                                   monitoring_interval=self.__monitoring_interval,
+                                                   monitoring_role=self.__monitoring_role,
+                                                   storage_type=self.__storage_type,
                                                    storage_encrypted=self.__storage_encrypted
                                                    )
+        if self.__clone_source_cluster_identifier:
+            self.__configure_clone(instance)
+
         # Add single-user rotation to the RDS instance
         instance.add_rotation_single_user(
 
             automatically_after=Duration.days(self.__creds_rotation_days)
         )
 
+        if self.__proxy_options:
+            self.__proxy_resources = RdsProxy.create(self.stack, self.construct_id,
+                                                     proxy_target=rds.ProxyTarget.from_cluster(instance),
+                                                     database=instance,
+                                                     secret=instance.secret,
+                                                     vpc=self.__vpc,
+                                                     options=self.__proxy_options,
+                                                     supports_readers=True)
+
         return instance
@@ -1,6 +1,11 @@
-from aws_cdk import aws_rds as rds, aws_ec2 as ec2, Stack, Duration, RemovalPolicy
+from typing import Optional
+
+from aws_cdk import aws_rds as rds, aws_ec2 as ec2, aws_iam as iam, aws_kms as kms, Stack, Duration, RemovalPolicy
 
 from packages.builder import Builder
+from packages.databases.rds.parameter_group_profiles import ParameterGroupProfiles, WorkloadProfile
+from packages.databases.rds.rds_proxy import RdsProxy, RdsProxyOptions, RdsProxyResources
+from packages.databases.rds.rds_storage import RdsStorage
 
 
 class RdsInstanceFromSnapshotBuilder(Builder):
@@ -16,11 +21,24 @@ class RdsInstanceFromSnapshotBuilder(Builder):
         self.__multi_az = None
         self.__auto_minor_version_upgrade = True
         self.__allocated_storage = None
+        self.__max_allocated_storage = None
+        self.__storage_type = None
+        self.__iops = None
+        self.__storage_throughput = None
         self.__deletion_protection = True
         self.__publicly_accessible = False
         self.__removal_policy = RemovalPolicy.SNAPSHOT  # (remove the resource, but retain a snapshot of the data)
         self.__creds_rotation_days = 30
         self.__security_groups = None
+        self.__enable_performance_insights = None
+        self.__performance_insight_retention = None
+        self.__performance_insight_encryption_key = None
+        self.__monitoring_interval = None
+        self.__monitoring_role = None
+        self.__workload_profile: Optional[WorkloadProfile] = None
+        self.__parameter_overrides = None
+        self.__proxy_options: Optional[RdsProxyOptions] = None
+        self.__proxy_resources: Optional[RdsProxyResources] = None
 
     def snapshot_identifier(self, snapshot_identifier: str):
         self.__snapshot_identifier = snapshot_identifier
@@ -49,6 +67,27 @@ class RdsInstanceFromSnapshotBuilder(Builder):
     def allocated_storage(self, allocated_storage):
         self.__allocated_storage = allocated_storage
 
+    def max_allocated_storage(self, max_allocated_storage: int):
+        """
+        Upper limit in GiB for storage autoscaling, storage autoscaling is disabled when not set
+        """
+        self.__max_allocated_storage = max_allocated_storage
+
+    def storage_type(self, storage_type: rds.StorageType):
+        self.__storage_type = storage_type
+
+    def iops(self, iops: int):
+        """
+        Provisioned IOPS of gp3, io1 and io2 storage
+        """
+        self.__iops = iops
+
+    def storage_throughput(self, storage_throughput: int):
+        """
+        Storage throughput in MiBps of gp3 storage
+        """
+        self.__storage_throughput = storage_throughput
+
     def deletion_protection(self, deletion_protection):
         self.__deletion_protection = deletion_protection
 
@@ -64,7 +103,47 @@ class RdsInstanceFromSnapshotBuilder(Builder):
     def security_groups(self, security_groups):
         self.__security_groups = security_groups
 
+    def enable_performance_insights(self, enable_performance_insights: bool):
+        self.__enable_performance_insights = enable_performance_insights
+
+    def performance_insight_retention(self, performance_insight_retention: rds.PerformanceInsightRetention):
+        self.__performance_insight_retention = performance_insight_retention
+
+    def performance_insight_encryption_key(self, performance_insight_encryption_key: kms.IKey):
+        self.__performance_insight_encryption_key = performance_insight_encryption_key
+
+    def monitoring_interval(self, monitoring_interval: Duration):
+        self.__monitoring_interval = monitoring_interval
+
+    def monitoring_role(self, monitoring_role: iam.IRole):
+        self.__monitoring_role = monitoring_role
+
+    def workload_profile(self, workload_profile: WorkloadProfile, parameter_overrides: Optional[dict[str, str]] = None):
+        """
+        Parameter group tuned for the workload, parameter overrides take precedence over the profile values
+        """
+        self.__workload_profile = workload_profile
+        self.__parameter_overrides = parameter_overrides
+
+    def proxy(self, proxy_options: RdsProxyOptions):
+        self.__proxy_options = proxy_options
+
+    @property
+    def db_proxy(self) -> Optional[RdsProxyResources]:
+        """
+        RDS Proxy created by build, when proxy options were given
+        """
+        return self.__proxy_resources
+
+    def __create_parameter_group(self) -> Optional[rds.ParameterGroup]:
+        if self.__workload_profile is None:
+            return None
+        return ParameterGroupProfiles.create(self.stack, self.construct_id, self.__engine, self.__workload_profile,
+                                             self.__parameter_overrides)
+
     def build(self) -> rds.DatabaseInstance:
+        RdsStorage.validate(self.__engine, self.__storage_type, self.__allocated_storage, self.__iops,
+                            self.__storage_throughput, self.__max_allocated_storage)
         instance = rds.DatabaseInstanceFromSnapshot(self.stack, self.construct_id,
                                                     snapshot_identifier=self.__snapshot_identifier,
                                                     engine=self.__engine,
@@ -78,13 +157,31 @@ class RdsInstanceFromSnapshotBuilder(Builder):
                                                     multi_az=self.__multi_az,
                                                     auto_minor_version_upgrade=self.__auto_minor_version_upgrade,
                                                     allocated_storage=self.__allocated_storage,
+                                                    max_allocated_storage=self.__max_allocated_storage,
+                                                    storage_type=self.__storage_type,
+                                                    iops=self.__iops,
+                                                    storage_throughput=self.__storage_throughput,
                                                     deletion_protection=self.__deletion_protection,
                                                     publicly_accessible=self.__publicly_accessible,
                                                     removal_policy=self.__removal_policy,
-                                                    security_groups=[self.__security_groups]
+                                                    security_groups=[self.__security_groups],
+                                                    parameter_group=self.__create_parameter_group(),
+                                                    enable_performance_insights=self.__enable_performance_insights,
+                                                    performance_insight_retention=self.__performance_insight_retention,
+                                                    performance_insight_encryption_key=self.__performance_insight_encryption_key,
+                                                    monitoring_interval=self.__monitoring_interval,
+                                                    monitoring_role=self.__monitoring_role
                                                     )
         # Add single-user rotation to the RDS instance
         instance.add_rotation_single_user(
             automatically_after=Duration.days(self.__creds_rotation_days)
         )
+        if self.__proxy_options:
+            self.__proxy_resources = RdsProxy.create(self.stack, self.construct_id,
+                                                     proxy_target=rds.ProxyTarget.from_instance(instance),
+                                                     database=instance,
+                                                     secret=instance.secret,
+                                                     vpc=self.__vpc,
+                                                     options=self.__proxy_options)
+
         return instance
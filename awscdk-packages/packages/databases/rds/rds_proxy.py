@@ -0,0 +1,81 @@
+import re
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+from aws_cdk import aws_rds as rds, aws_ec2 as ec2, aws_secretsmanager as secretsmanager, Stack, Duration
+
+PRIVATE_ISOLATED_SUBNETS = ec2.SubnetSelection(subnet_type=ec2.SubnetType.PRIVATE_ISOLATED)
+READ_ONLY_ENDPOINT_SUFFIX = "-read-only"
+MAX_ENDPOINT_NAME_LENGTH = 63
+
+
+@dataclass
+class RdsProxyOptions:
+    db_proxy_name: Optional[str] = None
+    idle_client_timeout: Duration = Duration.minutes(30)
+    max_connections_percent: int = 90
+    max_idle_connections_percent: Optional[int] = None
+    borrow_timeout: Duration = Duration.seconds(30)
+    require_tls: bool = True
+    security_groups: Optional[Sequence[ec2.ISecurityGroup]] = None
+    read_only_endpoint: bool = False  # Aurora clusters only, routes connections to the reader instances
+
+
+@dataclass
+class RdsProxyResources:
+    proxy: rds.DatabaseProxy
+    read_only_endpoint: Optional[rds.CfnDBProxyEndpoint] = None
+
+
+class RdsProxy:
+
+    @staticmethod
+    def read_only_endpoint_name(construct_id: str) -> str:
+        """
+        Proxy endpoint name derived from the construct id, letters, digits and single hyphens starting with a letter,
+        63 characters at most
+        """
+        name = re.sub(r"[^a-z0-9]+", "-", construct_id.lower()).strip("-")
+        if not name[:1].isalpha():
+            name = f"proxy-{name}".rstrip("-")
+        return name[:MAX_ENDPOINT_NAME_LENGTH - len(READ_ONLY_ENDPOINT_SUFFIX)].rstrip("-") + READ_ONLY_ENDPOINT_SUFFIX
+
+    @staticmethod
+    def create(stack: Stack, construct_id: str, proxy_target: rds.ProxyTarget, database: ec2.IConnectable,
+               secret: Optional[secretsmanager.ISecret], vpc: ec2.IVpc, options: RdsProxyOptions,
+               supports_readers=False) -> RdsProxyResources:
+        """
+        Proxy pinned to the generated credentials secret of the database, with its security group allowed into the
+        database port
+        """
+        if secret is None:
+            raise ValueError("RDS Proxy requires generated credentials")
+        if options.read_only_endpoint and not supports_readers:
+            raise ValueError("RDS Proxy read only endpoint is only supported by Aurora clusters")
+
+        proxy = rds.DatabaseProxy(stack, f"{construct_id}Proxy",
+                                  proxy_target=proxy_target,
+                                  secrets=[secret],
+                                  vpc=vpc,
+                                  vpc_subnets=PRIVATE_ISOLATED_SUBNETS,
+                                  db_proxy_name=options.db_proxy_name,
+                                  idle_client_timeout=options.idle_client_timeout,
+                                  max_connections_percent=options.max_connections_percent,
+                                  max_idle_connections_percent=options.max_idle_connections_percent,
+                                  borrow_timeout=options.borrow_timeout,
+                                  require_tls=options.require_tls,
+                                  security_groups=options.security_groups)
+        database.connections.allow_default_port_from(proxy, "Allow connections from RDS Proxy")
+
+        read_only_endpoint = None
+        if options.read_only_endpoint:
+            read_only_endpoint = rds.CfnDBProxyEndpoint(
+                stack, f"{construct_id}ProxyReadOnlyEndpoint",
+                db_proxy_name=proxy.db_proxy_name,
+                db_proxy_endpoint_name=RdsProxy.read_only_endpoint_name(construct_id),
+                vpc_subnet_ids=vpc.select_subnets(subnet_type=ec2.SubnetType.PRIVATE_ISOLATED).subnet_ids,
+                vpc_security_group_ids=[security_group.security_group_id for security_group in
+                                        proxy.connections.security_groups],
+                target_role="READ_ONLY")
+
+        return RdsProxyResources(proxy=proxy, read_only_endpoint=read_only_endpoint)
@@ -0,0 +1,40 @@
+from typing import Optional
+
+from aws_cdk import aws_rds as rds
+
+PROVISIONED_IOPS_STORAGE_TYPES = (rds.StorageType.GP3, rds.StorageType.IO1, rds.StorageType.IO2)
+IO_STORAGE_TYPES = (rds.StorageType.IO1, rds.StorageType.IO2)
+
+# Below these sizes gp3 volumes have a fixed baseline of 3000 IOPS and 125 MiBps that can not be changed
+GP3_BASELINE_STORAGE_GIB = {"sqlserver": 20, "oracle": 200}
+DEFAULT_GP3_BASELINE_STORAGE_GIB = 400
+
+
+class RdsStorage:
+
+    @staticmethod
+    def gp3_baseline_storage(engine: Optional[rds.IInstanceEngine]) -> int:
+        engine_type = engine.engine_type if engine else ""
+        return next((storage for engine_prefix, storage in GP3_BASELINE_STORAGE_GIB.items()
+                     if engine_type.startswith(engine_prefix)), DEFAULT_GP3_BASELINE_STORAGE_GIB)
+
+    @staticmethod
+    def validate(engine: Optional[rds.IInstanceEngine], storage_type: Optional[rds.StorageType],
+                 allocated_storage: Optional[int], iops: Optional[int], storage_throughput: Optional[int],
+                 max_allocated_storage: Optional[int]):
+        """
+        Fails at synth time on storage settings RDS would reject at deploy time
+        """
+        if storage_throughput is not None and storage_type != rds.StorageType.GP3:
+            raise ValueError("Storage throughput is only supported by gp3 storage")
+        if iops is not None and storage_type not in PROVISIONED_IOPS_STORAGE_TYPES:
+            raise ValueError("Provisioned IOPS are only supported by gp3, io1 and io2 storage")
+        if iops is None and storage_type in IO_STORAGE_TYPES:
+            raise ValueError(f"{storage_type} storage requires provisioned IOPS")
+        if storage_type == rds.StorageType.GP3 and (iops is not None or storage_throughput is not None):
+            baseline_storage = RdsStorage.gp3_baseline_storage(engine)
+            if allocated_storage is None or allocated_storage < baseline_storage:
+                raise ValueError(f"gp3 IOPS and throughput can only be set from {baseline_storage} GiB of storage")
+        if max_allocated_storage is not None and allocated_storage is not None \
+                and max_allocated_storage <= allocated_storage:
+            raise ValueError("Maximum allocated storage must be greater than the allocated storage")
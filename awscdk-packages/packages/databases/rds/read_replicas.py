@@ -0,0 +1,74 @@
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+from aws_cdk import aws_rds as rds, aws_ec2 as ec2, aws_kms as kms, Stack, RemovalPolicy
+
+from packages.databases.rds.rds_proxy import PRIVATE_ISOLATED_SUBNETS
+
+# Instance type given to DatabaseInstance by CDK when none is set
+DEFAULT_SOURCE_INSTANCE_TYPE = ec2.InstanceType.of(ec2.InstanceClass.M5, ec2.InstanceSize.LARGE)
+
+
+@dataclass
+class ReadReplicaOptions:
+    count: int = 1
+    instance_type: Optional[ec2.InstanceType] = None  # instance type of the source instance by default
+    availability_zones: Optional[Sequence[str]] = None  # replicas are placed round-robin across the zones
+    # Target stack of the replicas, e.g. in another region with cross_region_references enabled on both stacks
+    stack: Optional[Stack] = None
+    vpc: Optional[ec2.IVpc] = None  # required for replicas in another region
+    security_groups: Optional[Sequence[ec2.ISecurityGroup]] = None
+    storage_encryption_key: Optional[kms.IKey] = None  # required for encrypted replicas in another region
+    # Parameter group and Performance Insights key of the source are used in the same region, both are regional
+    parameter_group: Optional[rds.IParameterGroup] = None
+    performance_insight_encryption_key: Optional[kms.IKey] = None
+
+
+class RdsReadReplicas:
+
+    @staticmethod
+    def create(stack: Stack, construct_id: str, source: rds.DatabaseInstance,
+               source_instance_type: Optional[ec2.InstanceType],
+               vpc: ec2.IVpc, security_groups: Sequence[ec2.ISecurityGroup], storage_encrypted: bool,
+               removal_policy: RemovalPolicy, parameter_group: Optional[rds.IParameterGroup],
+               performance_insight_encryption_key: Optional[kms.IKey], options: ReadReplicaOptions,
+               **instance_props) -> list[rds.DatabaseInstanceReadReplica]:
+        """
+        Read replicas of the source instance, sharing its removal policy, parameter group and Performance Insights key
+        unless they are placed in another region
+        """
+        if options.count < 1:
+            raise ValueError("At least one read replica is required")
+        target_stack = options.stack or stack
+        cross_region = target_stack.region != stack.region
+        if cross_region and options.vpc is None:
+            raise ValueError("Read replicas in another region require a VPC of that region")
+        if cross_region and storage_encrypted and options.storage_encryption_key is None:
+            raise ValueError("Encrypted read replicas in another region require a KMS key of that region")
+
+        if cross_region:
+            # the parameter group and key of the source cannot be used in another region
+            parameter_group, performance_insight_encryption_key = None, None
+        parameter_group = options.parameter_group or parameter_group
+        performance_insight_encryption_key = \
+            options.performance_insight_encryption_key or performance_insight_encryption_key
+
+        availability_zones = options.availability_zones or [None]
+        return [rds.DatabaseInstanceReadReplica(target_stack, f"{construct_id}ReadReplica{replica_idx}",
+                                                source_database_instance=source,
+                                                instance_type=options.instance_type or source_instance_type or
+                                                DEFAULT_SOURCE_INSTANCE_TYPE,
+                                                availability_zone=availability_zones[
+                                                    (replica_idx - 1) % len(availability_zones)],
+                                                vpc=options.vpc or vpc,
+                                                vpc_subnets=PRIVATE_ISOLATED_SUBNETS,
+                                                security_groups=options.security_groups or (
+                                                    None if cross_region else security_groups),
+                                                storage_encrypted=storage_encrypted,
+                                                storage_encryption_key=options.storage_encryption_key,
+                                                publicly_accessible=False,
+                                                removal_policy=removal_policy,
+                                                parameter_group=parameter_group,
+                                                performance_insight_encryption_key=performance_insight_encryption_key,
+                                                **instance_props)
+                for replica_idx in range(1, options.count + 1)]
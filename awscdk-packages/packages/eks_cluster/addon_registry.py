@@ -0,0 +1,145 @@
+import copy
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Mapping, Optional, Sequence
+
+from packages.parser.yaml_parser import load_yaml
+from packages.utils.dict_utils import DictUtils
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ADDONS_DIR = BASE_DIR + "/addons/"
+
+
+@dataclass(frozen=True)
+class AddOnManifest:
+    id: str
+    file: str
+    parse_env: bool = True
+
+
+@dataclass(frozen=True)
+class AddOn:
+    """
+    Descriptor of a helm chart installed on the cluster, with the manifests applied alongside it.
+    The CloudFormation template, when given, receives the ClusterName and OICPIssuer parameters.
+    """
+    name: str
+    construct_id: str
+    chart: str
+    release: str
+    repository: str
+    namespace: str
+    version: str
+    values_files: Sequence[str] = ()
+    manifests: Sequence[AddOnManifest] = ()
+    substitutions: Mapping[str, str] = field(default_factory=dict)
+    depends_on: Sequence[str] = ()  # installed after these addons when they are installed too
+    template_file: Optional[str] = None
+    parse_env: bool = True
+    create_namespace: bool = True
+
+
+@dataclass
+class RenderedAddOn:
+    values: dict
+    manifests: Sequence[tuple[str, dict]]
+
+
+KARPENTER_ADDON = AddOn(name="karpenter",
+                        construct_id="Karpenter",
+                        chart="karpenter",
+                        release="karpenter",
+                        repository="oci://public.ecr.aws/karpenter/karpenter",
+                        namespace="karpenter",
+                        version="0.37.0",
+                        values_files=(ADDONS_DIR + "karpenter/karpenter_values.yaml",),
+                        template_file=ADDONS_DIR + "karpenter/karpenter_template.yaml")
+
+ARGOCD_ADDON = AddOn(name="argocd",
+                     construct_id="ArgoCDAddOn",
+                     chart="argo-cd",
+                     release="argocd",
+                     repository="https://argoproj.github.io/argo-helm",
+                     namespace="argocd",
+                     version="6.7.8",
+                     values_files=(ADDONS_DIR + "argocd/argocd_values.yaml",),
+                     manifests=(AddOnManifest(id="ArgoCdDevOps",
+                                             file=ADDONS_DIR + "argocd/argocd_devops_application.yaml"),
+                               AddOnManifest(id="ArgoCdGithubSecret",
+                                             file=ADDONS_DIR + "argocd/argocd_github_secret.yaml")),
+                     # ArgoCD workloads run on nodes provisioned by Karpenter
+                     depends_on=("karpenter",))
+
+ADOT_COLLECTOR_ADDON = AddOn(name="adot-collector",
+                             construct_id="AdotCollector",
+                             chart="opentelemetry-collector",
+                             release="adot-collector",
+                             repository="https://open-telemetry.github.io/opentelemetry-helm-charts",
+                             namespace="adot-collector",
+                             version="0.88.0",
+                             values_files=(ADDONS_DIR + "adot/adot_collector_values.yaml",),
+                             depends_on=("karpenter",))
+
+
+class AddOnRegistry:
+    """
+    Registry of the addons that can be installed by EksClusterBuilder.
+    Rendered YAML files are cached by the registry, share one instance between builders to render them once per synth.
+    """
+
+    def __init__(self, addons: Sequence[AddOn] = ()):
+        self.__addons: dict[str, AddOn] = {}
+        self.__rendered_files: dict[tuple, dict] = {}
+        self.__lock = threading.Lock()
+        for addon in addons:
+            self.register(addon)
+
+    @staticmethod
+    def default():
+        return AddOnRegistry([KARPENTER_ADDON, ARGOCD_ADDON, ADOT_COLLECTOR_ADDON])
+
+    def register(self, addon: AddOn):
+        self.__addons[addon.name] = addon
+        return self
+
+    def get(self, name: str) -> AddOn:
+        if name not in self.__addons:
+            raise ValueError(f"AddOn {name} is not registered")
+        return self.__addons[name]
+
+    def names(self) -> list[str]:
+        return list(self.__addons)
+
+    def render(self, addons: Sequence[AddOn], max_workers: Optional[int] = None) -> dict[str, RenderedAddOn]:
+        """
+        Render values and manifests of the addons concurrently, keyed by addon name
+        """
+        for addon in addons:
+            for dependency in addon.depends_on:
+                if dependency not in self.__addons:
+                    raise ValueError(f"AddOn {addon.name} depends on {dependency}, which is not registered")
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {addon.name: executor.submit(self.__render_addon, addon) for addon in addons}
+            return {name: future.result() for name, future in futures.items()}
+
+    def __render_addon(self, addon: AddOn) -> RenderedAddOn:
+        values = {}
+        for values_file in addon.values_files:
+            values = DictUtils.deep_merge(values, self.__render_file(values_file, addon.parse_env,
+                                                                     addon.substitutions))
+        manifests = [(manifest.id, self.__render_file(manifest.file, manifest.parse_env, addon.substitutions))
+                     for manifest in addon.manifests]
+        return RenderedAddOn(values=values, manifests=manifests)
+
+    def __render_file(self, file: str, parse_env: bool, substitutions: Mapping[str, str]) -> dict:
+        # Files parsing the environment are rendered again whenever the environment changes
+        environment = tuple(sorted(os.environ.items())) if parse_env else ()
+        cache_key = (file, parse_env, tuple(sorted(substitutions.items())), environment)
+        with self.__lock:
+            if cache_key in self.__rendered_files:
+                return copy.deepcopy(self.__rendered_files[cache_key])
+        rendered = load_yaml(file, parse_env=parse_env, variables=substitutions)
+        with self.__lock:
+            return copy.deepcopy(self.__rendered_files.setdefault(cache_key, rendered))
@@ -1,15 +1,17 @@
-import os
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from enum import StrEnum
 from typing import Optional, Sequence
 
-from aws_cdk import aws_eks as eks, aws_ec2 as ec2, aws_iam as iam, cloudformation_include as cfn_inc, Stack
+from aws_cdk import aws_eks as eks, aws_ec2 as ec2, aws_iam as iam, cloudformation_include as cfn_inc, Stack, Size, \
+    Duration
 
 from packages.builder import Builder
-from packages.parser.yaml_parser import load_yaml
+from packages.eks_cluster.addon_registry import AddOn, AddOnRegistry, RenderedAddOn, ADDONS_DIR, KARPENTER_ADDON, \
+    ARGOCD_ADDON, ADOT_COLLECTOR_ADDON
+from packages.utils.dict_utils import DictUtils
 
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-ADDONS_DIR = BASE_DIR + "/addons/"
+BATCHED_MANIFESTS_ID = "AddOnManifests"
+MAX_KUBECTL_HANDLER_TIMEOUT = Duration.minutes(15)
 
 
 @dataclass
@@ -34,6 +36,23 @@ class AccessPolicies(StrEnum):
     VIEW_POLICY = 'AmazonEKSViewPolicy'
 
 
+@dataclass
+class ObservabilityOptions:
+    """
+    ADOT collector scraping the Karpenter and ArgoCD Prometheus metrics into CloudWatch
+    """
+    scrape_interval: Duration = Duration.seconds(60)
+    scrape_timeout: Duration = Duration.seconds(10)
+    batch_timeout: Duration = Duration.seconds(60)
+    batch_size: int = 8192
+    replicas: int = 1
+
+
+class ArgoCdProfile(StrEnum):
+    DEFAULT = 'argocd_values.yaml'
+    HIGH_AVAILABILITY = 'argocd_ha_values.yaml'
+
+
 class EksClusterBuilder(Builder):
 
     def __init__(self, construct_id: str, stack: Stack, vpc: ec2.Vpc):
@@ -48,6 +67,16 @@ class EksClusterBuilder(Builder):
         self.__authentication_mode = eks.AuthenticationMode.API_AND_CONFIG_MAP
         self.__endpoint_access = eks.EndpointAccess.PUBLIC_AND_PRIVATE
         self.__access_entries: Optional[Sequence[AccessEntry]] = None
+        self.__batch_manifests = False
+        self.__kubectl_memory: Optional[Size] = None
+        self.__kubectl_handler_timeout: Optional[Duration] = None
+        self.__kubectl_concurrency: Optional[int] = None
+        self.__batched_manifests = []
+        self.__argocd_profile = ArgoCdProfile.DEFAULT
+        self.__addon_registry = AddOnRegistry.default()
+        self.__addon_names: list[str] = []
+        self.__addon_values: dict[str, dict] = {}
+        self.__observability: Optional[ObservabilityOptions] = None
 
     def cluster_name(self, cluster_name):
         self.__cluster_name = cluster_name
@@ -85,25 +114,80 @@ class EksClusterBuilder(Builder):
         self.__access_entries = access_entries
         return self
 
+    def argocd_profile(self, argocd_profile: ArgoCdProfile):
+        """
+        Profile values merged on top of the default ArgoCD values, HIGH_AVAILABILITY enables redis-ha,
+        server and repo-server autoscaling and application controller sharding by cluster
+        """
+        self.__argocd_profile = argocd_profile
+        return self
+
+    def argocd_values(self, argocd_values: dict):
+        """
+        Helm values merged on top of the selected ArgoCD profile
+        """
+        return self.addon_values(ARGOCD_ADDON.name, argocd_values)
+
+    def addon_registry(self, addon_registry: AddOnRegistry):
+        """
+        Registry the addons are looked up in, shared registries render each values file once
+        """
+        self.__addon_registry = addon_registry
+        return self
+
+    def add_addon(self, addon: AddOn):
+        """
+        Register and install an addon, it is installed after its depends_on addons that are installed too
+        """
+        self.__addon_registry.register(addon)
+        self.__addon_names.append(addon.name)
+        return self
+
+    def addon_values(self, addon_name: str, values: dict):
+        """
+        Helm values merged on top of the rendered values files of the addon
+        """
+        self.__addon_values[addon_name] = values
+        return self
+
+    def observability(self, observability: ObservabilityOptions):
+        self.__observability = observability
+        return self
+
+    def batch_manifests(self, batch_manifests: bool):
+        """
+        Apply every addon manifest with a single kubectl custom resource instead of one resource per manifest.
+        The batched manifest is applied after the addon helm charts, since it relies on their namespaces and CRDs.
+        """
+        self.__batch_manifests = batch_manifests
+        return self
+
+    def kubectl_memory(self, kubectl_memory: Size):
+        self.__kubectl_memory = kubectl_memory
+        return self
+
+    def kubectl_handler_timeout(self, kubectl_handler_timeout: Duration):
+        """
+        :type kubectl_handler_timeout: at most 15 minutes, the Lambda timeout limit
+        """
+        self.__kubectl_handler_timeout = kubectl_handler_timeout
+        return self
+
+    def kubectl_concurrency(self, kubectl_concurrency: int):
+        """
+        Reserved concurrent executions of the kubectl provider handler, it caps the concurrent handler invocations
+        and does not make CloudFormation apply the kubectl resources in parallel
+
+        :type kubectl_concurrency: positive number
+        """
+        self.__kubectl_concurrency = kubectl_concurrency
+        return self
+
     def __iam_masters_role(self):
         return iam.Role(self.stack, "MastersRole",
                         role_name="mastersRole",
                         assumed_by=iam.AccountRootPrincipal())
 
-    def __karpenter_addon(self, eks_cluster):
-        cfn_inc.CfnInclude(self.stack, "KarpenterTemplate",
-                           template_file=ADDONS_DIR + "karpenter/karpenter_template.yaml",
-                           parameters={"ClusterName": self.__cluster_name,
-                                       "OICPIssuer": eks_cluster.cluster_open_id_connect_issuer})
-        eks_cluster.add_helm_chart("Karpenter",
-                                   chart="karpenter",
-                                   release="karpenter",
-                                   repository="oci://public.ecr.aws/karpenter/karpenter",
-                                   namespace="karpenter",
-                                   version="0.37.0",
-                                   create_namespace=True,
-                                   values=load_yaml(ADDONS_DIR + "karpenter/karpenter_values.yaml", parse_env=True))
-
     def __create_access_entries(self, eks_cluster):
         for access_entry in self.__access_entries:
             access_policies = self.__create_access_policies(access_entry)
@@ -118,24 +202,117 @@ class EksClusterBuilder(Builder):
                                                          namespaces=access_policy.namespaces) for access_policy in
                 access_entry.access_policies]
 
-    @staticmethod
-    def __argocd_addon(eks_cluster):
-        eks_cluster.add_helm_chart("ArgoCDAddOn",
-                                   chart="argo-cd",
-                                   release="argocd",
-                                   repository="https://argoproj.github.io/argo-helm",
-                                   namespace="argocd",
-                                   version="6.7.8",
-                                   create_namespace=True,
-                                   values=load_yaml(ADDONS_DIR + "argocd/argocd_values.yaml", parse_env=True))
-
-        argocd_devops_application = load_yaml(ADDONS_DIR + "argocd/argocd_devops_application.yaml")
-        eks_cluster.add_manifest("ArgoCdDevOps", argocd_devops_application)
-
-        argocd_github_secret = load_yaml(ADDONS_DIR + "argocd/argocd_github_secret.yaml", parse_env=True)
-        eks_cluster.add_manifest("ArgoCdGithubSecret", argocd_github_secret)
+    def __enabled_addons(self) -> list[AddOn]:
+        default_addons = {KARPENTER_ADDON.name: self.__create_karpenter,
+                          ARGOCD_ADDON.name: self.__create_argocd,
+                          ADOT_COLLECTOR_ADDON.name: self.__observability is not None}
+        addon_names = [name for name, enabled in default_addons.items() if enabled] + self.__addon_names
+
+        addons = [self.__addon_registry.get(addon_name) for addon_name in dict.fromkeys(addon_names)]
+        return [self.__with_argocd_profile(addon) if addon.name == ARGOCD_ADDON.name else
+                self.__with_cluster_name(addon) if addon.name == ADOT_COLLECTOR_ADDON.name else addon
+                for addon in addons]
+
+    def __with_argocd_profile(self, addon: AddOn) -> AddOn:
+        if self.__argocd_profile == ArgoCdProfile.DEFAULT:
+            return addon
+        return replace(addon, values_files=(*addon.values_files, ADDONS_DIR + "argocd/" + self.__argocd_profile))
+
+    def __with_cluster_name(self, addon: AddOn) -> AddOn:
+        return replace(addon, substitutions={**addon.substitutions, "CLUSTER_NAME": self.__cluster_name})
+
+    def __install_addons(self, eks_cluster, addon_values: dict[str, dict]):
+        addons = self.__enabled_addons()
+        rendered_addons = self.__addon_registry.render(addons)
+        helm_charts = {addon.name: self.__install_addon(eks_cluster, addon, rendered_addons[addon.name],
+                                                        addon_values.get(addon.name, {}))
+                       for addon in addons}
+
+        for addon in addons:
+            for dependency in addon.depends_on:
+                if dependency in helm_charts:
+                    helm_charts[addon.name].node.add_dependency(helm_charts[dependency])
+
+        if self.__batched_manifests:
+            self.__apply_batched_manifests(eks_cluster, helm_charts.values())
+
+        return helm_charts
+
+    def __install_addon(self, eks_cluster, addon: AddOn, rendered_addon: RenderedAddOn,
+                        values: dict) -> eks.HelmChart:
+        if addon.template_file:
+            cfn_inc.CfnInclude(self.stack, f"{addon.construct_id}Template",
+                               template_file=addon.template_file,
+                               parameters={"ClusterName": self.__cluster_name,
+                                           "OICPIssuer": eks_cluster.cluster_open_id_connect_issuer})
+
+        helm_chart = eks_cluster.add_helm_chart(addon.construct_id,
+                                                chart=addon.chart,
+                                                release=addon.release,
+                                                repository=addon.repository,
+                                                namespace=addon.namespace,
+                                                version=addon.version,
+                                                create_namespace=addon.create_namespace,
+                                                values=DictUtils.deep_merge(rendered_addon.values, values))
+
+        for manifest_id, manifest in rendered_addon.manifests:
+            if self.__batch_manifests:
+                self.__batched_manifests.append(manifest)
+            else:
+                eks_cluster.add_manifest(manifest_id, manifest).node.add_dependency(helm_chart)
+
+        return helm_chart
+
+    def __observability_values(self) -> dict:
+        scrape_config = {"scrape_interval": f"{self.__observability.scrape_interval.to_seconds()}s",
+                         "scrape_timeout": f"{self.__observability.scrape_timeout.to_seconds()}s"}
+        batch_config = {"timeout": f"{self.__observability.batch_timeout.to_seconds()}s",
+                        "send_batch_size": self.__observability.batch_size,
+                        "send_batch_max_size": self.__observability.batch_size * 2}
+        return {"replicaCount": self.__observability.replicas,
+                "config": {"receivers": {"prometheus": {"config": {"global": scrape_config}}},
+                           "processors": {"batch": batch_config}}}
+
+    def __create_observability_service_account(self, eks_cluster, adot_collector_chart):
+        namespace = eks_cluster.add_manifest(f"{ADOT_COLLECTOR_ADDON.construct_id}Namespace",
+                                             {"apiVersion": "v1",
+                                              "kind": "Namespace",
+                                              "metadata": {"name": ADOT_COLLECTOR_ADDON.namespace}})
+        service_account = eks_cluster.add_service_account(f"{ADOT_COLLECTOR_ADDON.construct_id}ServiceAccount",
+                                                          name="adot-collector",
+                                                          namespace=ADOT_COLLECTOR_ADDON.namespace)
+        service_account.role.add_managed_policy(
+            iam.ManagedPolicy.from_aws_managed_policy_name("CloudWatchAgentServerPolicy"))
+        service_account.node.add_dependency(namespace)
+        adot_collector_chart.node.add_dependency(service_account)
+
+    def __apply_batched_manifests(self, eks_cluster, helm_charts):
+        batched_manifest = eks_cluster.add_manifest(BATCHED_MANIFESTS_ID, *self.__batched_manifests)
+        for helm_chart in helm_charts:
+            batched_manifest.node.add_dependency(helm_chart)
+
+    def __validate(self):
+        if self.__kubectl_handler_timeout is not None and \
+                self.__kubectl_handler_timeout.to_seconds() > MAX_KUBECTL_HANDLER_TIMEOUT.to_seconds():
+            raise ValueError("Kubectl handler timeout cannot be above 15 minutes")
+        if self.__kubectl_concurrency is not None and self.__kubectl_concurrency < 1:
+            raise ValueError("Kubectl concurrency must be a positive number")
+        if self.__observability is not None and self.__cluster_name is None:
+            raise ValueError("Observability requires a cluster name, the metrics log group is named after it")
+
+    def __configure_kubectl_provider(self, eks_cluster):
+        # The provider is created by the cluster itself, a stack holds a single EKS cluster and so a single provider.
+        # KubectlProvider.get_or_create is not used since it makes the scope depend on the kubectl ready barrier
+        kubectl_provider = next(child for child in Stack.of(eks_cluster).node.children
+                                if isinstance(child, eks.KubectlProvider))
+        kubectl_handler = kubectl_provider.node.find_child("Handler").node.default_child
+        if self.__kubectl_handler_timeout is not None:
+            kubectl_handler.add_property_override("Timeout", self.__kubectl_handler_timeout.to_seconds())
+        if self.__kubectl_concurrency is not None:
+            kubectl_handler.add_property_override("ReservedConcurrentExecutions", self.__kubectl_concurrency)
 
     def build(self) -> eks.FargateCluster:
+        self.__validate()
         eks_cluster = eks.FargateCluster(self.stack, self.construct_id,
                                          cluster_name=self.__cluster_name,
                                          vpc=self.__vpc,
@@ -152,13 +329,21 @@ class EksClusterBuilder(Builder):
                                          default_profile=eks.FargateProfileOptions(
                                              selectors=[eks.Selector(namespace="karpenter")]),
                                          version=self.__version,
-                                         endpoint_access=self.__endpoint_access)
+                                         endpoint_access=self.__endpoint_access,
+                                         kubectl_memory=self.__kubectl_memory)
+
+        addon_values = dict(self.__addon_values)
+        if self.__observability:
+            addon_values[ADOT_COLLECTOR_ADDON.name] = DictUtils.deep_merge(
+                self.__observability_values(), self.__addon_values.get(ADOT_COLLECTOR_ADDON.name, {}))
+
+        helm_charts = self.__install_addons(eks_cluster, addon_values)
 
-        if self.__create_karpenter:
-            self.__karpenter_addon(eks_cluster)
+        if self.__observability:
+            self.__create_observability_service_account(eks_cluster, helm_charts[ADOT_COLLECTOR_ADDON.name])
 
-        if self.__create_argocd:
-            self.__argocd_addon(eks_cluster)
+        if self.__kubectl_handler_timeout is not None or self.__kubectl_concurrency is not None:
+            self.__configure_kubectl_provider(eks_cluster)
 
         if self.__access_entries:
             self.__create_access_entries(eks_cluster)
@@ -0,0 +1,99 @@
+from dataclasses import dataclass
+from typing import Mapping, Optional, Sequence
+
+from aws_cdk import aws_eks as eks, aws_ec2 as ec2, aws_iam as iam, Stack
+
+from packages.builder import Builder
+
+# Memory reserved by Fargate on every pod for the kubelet, kube-proxy and containerd
+FARGATE_RESERVED_MEMORY_MIB = 256
+
+# vCPU -> memory GiB combinations supported by Fargate
+FARGATE_POD_SIZES = {
+    0.25: [0.5, 1, 2],
+    0.5: list(range(1, 5)),
+    1: list(range(2, 9)),
+    2: list(range(4, 17)),
+    4: list(range(8, 31)),
+    8: list(range(16, 61, 4)),
+    16: list(range(32, 121, 8)),
+}
+
+
+@dataclass(frozen=True)
+class FargatePodSize:
+    vcpu: float
+    memory_gib: float
+
+    @staticmethod
+    def for_requests(cpu: float, memory_mib: int):
+        """
+        Smallest Fargate size fitting the pod requests, Fargate bills the pod at this size
+
+        :param cpu: sum of the pod containers cpu requests in vCPU
+        :param memory_mib: sum of the pod containers memory requests in MiB
+        """
+        memory_gib = (memory_mib + FARGATE_RESERVED_MEMORY_MIB) / 1024
+        for vcpu, memory_sizes in FARGATE_POD_SIZES.items():
+            if cpu <= vcpu and memory_gib <= memory_sizes[-1]:
+                return FargatePodSize(vcpu=vcpu, memory_gib=next(size for size in memory_sizes if size >= memory_gib))
+        raise ValueError(f"No Fargate size fits {cpu} vCPU and {memory_mib} MiB")
+
+    def requests(self) -> dict:
+        """
+        Kubernetes resource requests filling this size, so the pod uses all the capacity it is billed for
+        """
+        return {"cpu": f"{int(self.vcpu * 1000)}m",
+                "memory": f"{int(self.memory_gib * 1024) - FARGATE_RESERVED_MEMORY_MIB}Mi"}
+
+
+class FargateProfileBuilder(Builder):
+
+    def __init__(self, construct_id: str, stack: Stack, cluster: eks.Cluster):
+        super().__init__(construct_id, stack)
+        self.__cluster = cluster
+        self.__fargate_profile_name = None
+        self.__namespaces: Sequence[str] = []
+        self.__labels: Optional[Mapping[str, str]] = None
+        self.__subnet_selection: Optional[ec2.SubnetSelection] = None
+        self.__pod_execution_role: Optional[iam.IRole] = None
+
+    def fargate_profile_name(self, fargate_profile_name: str):
+        self.__fargate_profile_name = fargate_profile_name
+        return self
+
+    def namespaces(self, namespaces: Sequence[str]):
+        """
+        Namespaces selected by the profile, one selector is created for each namespace
+        """
+        self.__namespaces = namespaces
+        return self
+
+    def labels(self, labels: Mapping[str, str]):
+        """
+        Pod labels every selector must match
+        """
+        self.__labels = labels
+        return self
+
+    def subnet_selection(self, subnet_selection: ec2.SubnetSelection):
+        self.__subnet_selection = subnet_selection
+        return self
+
+    def pod_execution_role(self, pod_execution_role: iam.IRole):
+        self.__pod_execution_role = pod_execution_role
+        return self
+
+    def build(self) -> eks.FargateProfile:
+        if not self.__namespaces:
+            raise ValueError("Fargate profile requires at least one namespace")
+
+        selectors = [eks.Selector(namespace=namespace, labels=self.__labels) for namespace in self.__namespaces]
+        return eks.FargateProfile(self.stack, self.construct_id,
+                                  cluster=self.__cluster,
+                                  selectors=selectors,
+                                  fargate_profile_name=self.__fargate_profile_name,
+                                  # the subnet selection is only applied to the given VPC
+                                  vpc=self.__cluster.vpc,
+                                  subnet_selection=self.__subnet_selection,
+                                  pod_execution_role=self.__pod_execution_role)
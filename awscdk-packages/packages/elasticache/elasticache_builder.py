@@ -1,14 +1,32 @@
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
 from aws_cdk import aws_elasticache as elasticache, aws_ec2 as ec2, Stack
 
 from packages.builder import Builder
+from packages.elasticache.replication_group_scaling import ReplicaAutoScalingOptions, ReplicationGroupScaling, \
+    ShardAutoScalingOptions
 from packages.utils.vpc_utils import VpcUtils
 
+HASH_SLOTS = 16384
+MAX_NODE_GROUPS = 500
+MAX_REPLICAS_PER_NODE_GROUP = 5
+MAX_CACHE_CLUSTERS = 6
+
 
 class ClusterMode:
     ENABLED = "enabled"
     DISABLED = "disabled"
 
 
+@dataclass
+class NodeGroup:
+    slots: Optional[str] = None  # hash slot range of the shard, e.g. "0-8191", slots are split evenly when not given
+    primary_availability_zone: Optional[str] = None
+    replica_availability_zones: Optional[Sequence[str]] = None  # one zone per replica of the shard
+    node_group_id: Optional[str] = None  # 4 digit shard id, e.g. "0001"
+
+
 class SubnetGroup(Builder):
 
     def __init__(self, construct_id: str, stack: Stack, vpc: ec2.Vpc):
@@ -43,6 +61,14 @@ class ElasticacheBuilder(Builder):
         self.__security_group_ids = None
         self.__replication_group_id = None
         self.__global_replication_group_id = None
+        self.__cache_parameter_group_name = None
+        self.__num_node_groups = None
+        self.__replicas_per_node_group = None
+        self.__node_groups: list[NodeGroup] = []
+        self.__shard_auto_scaling = None
+        self.__replica_auto_scaling = None
+        self.__shard_scalable_target = None
+        self.__replica_scalable_target = None
 
     def replication_group_description(self, replication_group_description):
         self.__replication_group_description = replication_group_description
@@ -80,10 +106,123 @@ class ElasticacheBuilder(Builder):
     def global_replication_group_id(self, global_replication_group_id: str):
         self.__global_replication_group_id = global_replication_group_id
 
+    def cache_parameter_group_name(self, cache_parameter_group_name: str):
+        """
+        Cluster mode enabled requires a parameter group with cluster-enabled set, e.g. default.redis7.cluster.on
+        """
+        self.__cache_parameter_group_name = cache_parameter_group_name
+
+    def num_node_groups(self, num_node_groups: int):
+        """
+        Number of shards, each owning a range of the hash slots, to scale writes horizontally. More than one shard
+        requires ClusterMode.ENABLED
+        """
+        self.__num_node_groups = num_node_groups
+
+    def replicas_per_node_group(self, replicas_per_node_group: int):
+        """
+        Read replicas of each shard, used instead of num_cache_clusters
+
+        :type replicas_per_node_group: number between 0 and 5
+        """
+        self.__replicas_per_node_group = replicas_per_node_group
+
+    def add_node_group(self, node_group: NodeGroup):
+        """
+        Slots and availability zones of a shard, node groups are given for every shard or for none
+        """
+        self.__node_groups.append(node_group)
+
+    def shard_auto_scaling(self, shard_auto_scaling: ShardAutoScalingOptions):
+        """
+        Target tracking on the number of shards, requires ClusterMode.ENABLED, Redis OSS 6 or later or Valkey, and
+        r or m node types
+        """
+        self.__shard_auto_scaling = shard_auto_scaling
+
+    def replica_auto_scaling(self, replica_auto_scaling: ReplicaAutoScalingOptions):
+        """
+        Target tracking on the number of replicas of every shard, requires ClusterMode.ENABLED
+        """
+        self.__replica_auto_scaling = replica_auto_scaling
+
+    @property
+    def shard_scalable_target(self):
+        return self.__shard_scalable_target
+
+    @property
+    def replica_scalable_target(self):
+        return self.__replica_scalable_target
+
+    def __validate_slots(self):
+        slots = [node_group.slots for node_group in self.__node_groups]
+        if not any(slots):
+            return
+        if not all(slots):
+            raise ValueError("Slots must be given for every node group or for none")
+        covered = [0] * HASH_SLOTS
+        for slot_range in slots:
+            start, end = (int(slot) for slot in slot_range.split("-"))
+            if not 0 <= start <= end < HASH_SLOTS:
+                raise ValueError(f"Slot range {slot_range} must be within 0-{HASH_SLOTS - 1}")
+            for slot in range(start, end + 1):
+                covered[slot] += 1
+        if any(count != 1 for count in covered):
+            raise ValueError(f"Slot ranges must cover the {HASH_SLOTS} hash slots exactly once")
+
+    def __validate_node_groups(self):
+        cluster_mode_enabled = self.__cluster_mode == ClusterMode.ENABLED
+        num_node_groups = self.__num_node_groups or len(self.__node_groups) or 1
+        if self.__num_cache_clusters is not None and (self.__replicas_per_node_group is not None or
+                                                      self.__num_node_groups is not None or self.__node_groups):
+            raise ValueError("num_cache_clusters cannot be combined with node group configuration")
+        if self.__num_cache_clusters is not None and not 1 <= self.__num_cache_clusters <= MAX_CACHE_CLUSTERS:
+            raise ValueError(f"num_cache_clusters must be between 1 and {MAX_CACHE_CLUSTERS}")
+        if cluster_mode_enabled and self.__num_cache_clusters is not None:
+            raise ValueError("ClusterMode.ENABLED is sized with num_node_groups and replicas_per_node_group")
+        if not cluster_mode_enabled and num_node_groups > 1:
+            raise ValueError("More than one node group requires ClusterMode.ENABLED")
+        if not 1 <= num_node_groups <= MAX_NODE_GROUPS:
+            raise ValueError(f"num_node_groups must be between 1 and {MAX_NODE_GROUPS}")
+        if self.__node_groups and len(self.__node_groups) != num_node_groups:
+            raise ValueError(f"{len(self.__node_groups)} node groups configured for {num_node_groups} shards")
+
+        replicas = self.__replicas_per_node_group
+        if replicas is not None and not 0 <= replicas <= MAX_REPLICAS_PER_NODE_GROUP:
+            raise ValueError(f"replicas_per_node_group must be between 0 and {MAX_REPLICAS_PER_NODE_GROUP}")
+        for node_group in self.__node_groups:
+            zones = node_group.replica_availability_zones
+            if zones is not None and replicas is not None and len(zones) != replicas:
+                raise ValueError(f"Node group needs one replica availability zone per replica, {replicas} expected")
+        if self.__multi_az_enabled and (self.__num_cache_clusters or 0) < 2 and not replicas:
+            raise ValueError("Multi-AZ requires at least one replica")
+        self.__validate_slots()
+        if self.__shard_auto_scaling is not None and not cluster_mode_enabled:
+            raise ValueError("Shard auto scaling requires ClusterMode.ENABLED")
+        if self.__replica_auto_scaling is not None and not cluster_mode_enabled:
+            raise ValueError("Replica auto scaling requires ClusterMode.ENABLED")
+
+    def __node_group_configuration(self):
+        return [elasticache.CfnReplicationGroup.NodeGroupConfigurationProperty(
+            node_group_id=node_group.node_group_id,
+            slots=node_group.slots,
+            primary_availability_zone=node_group.primary_availability_zone,
+            replica_availability_zones=node_group.replica_availability_zones,
+            replica_count=self.__replicas_per_node_group
+        ) for node_group in self.__node_groups] or None
+
+    def __automatic_failover_enabled(self) -> Optional[bool]:
+        # ElastiCache rejects cluster mode enabled and Multi-AZ replication groups without automatic failover
+        if self.__cluster_mode == ClusterMode.ENABLED or self.__multi_az_enabled:
+            return True
+        return None
+
     def build(self) -> elasticache.CfnReplicationGroup:
+        self.__validate_node_groups()
         redis_cluster = elasticache.CfnReplicationGroup(self.stack, self.construct_id,
                                                         replication_group_description=self.__replication_group_description,
                                                         multi_az_enabled=self.__multi_az_enabled,
+                                                        automatic_failover_enabled=self.__automatic_failover_enabled(),
                                                         transit_encryption_enabled=False,
                                                         at_rest_encryption_enabled=True,
                                                         cluster_mode=self.__cluster_mode,
@@ -91,9 +230,21 @@ class ElasticacheBuilder(Builder):
                                                         engine=self.__engine,
                                                         cache_node_type=self.__cache_node_type,
                                                         num_cache_clusters=self.__num_cache_clusters,
+                                                        num_node_groups=self.__num_node_groups,
+                                                        replicas_per_node_group=self.__replicas_per_node_group,
+                                                        node_group_configuration=self.__node_group_configuration(),
+                                                        cache_parameter_group_name=self.__cache_parameter_group_name,
                                                         cache_subnet_group_name=self.__cache_subnet_group_name,
                                                         cache_security_group_names=self.__cache_security_group_names,
                                                         security_group_ids=self.__security_group_ids,
                                                         replication_group_id=self.__replication_group_id,
                                                         global_replication_group_id=self.__global_replication_group_id)
+
+        if self.__shard_auto_scaling is not None:
+            self.__shard_scalable_target = ReplicationGroupScaling.shards(self.stack, self.construct_id, redis_cluster,
+                                                                          self.__shard_auto_scaling)
+        if self.__replica_auto_scaling is not None:
+            self.__replica_scalable_target = ReplicationGroupScaling.replicas(self.stack, self.construct_id,
+                                                                              redis_cluster,
+                                                                              self.__replica_auto_scaling)
         return redis_cluster
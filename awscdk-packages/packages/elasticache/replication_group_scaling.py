@@ -0,0 +1,130 @@
+from dataclasses import dataclass, field
+from enum import StrEnum
+from typing import Sequence
+
+from aws_cdk import aws_elasticache as elasticache, aws_applicationautoscaling as appscaling, Stack, Duration
+
+MAX_SHARDS = 500
+MAX_REPLICAS = 5
+
+
+class ShardScalingMetric(StrEnum):
+    CPU = 'cpu'
+    MEMORY = 'memory'
+
+
+SHARD_SCALING_METRICS = {
+    ShardScalingMetric.CPU: appscaling.PredefinedMetric.ELASTICACHE_PRIMARY_ENGINE_CPU_UTILIZATION,
+    ShardScalingMetric.MEMORY:
+        appscaling.PredefinedMetric.ELASTICACHE_DATABASE_MEMORY_USAGE_COUNTED_FOR_EVICT_PERCENTAGE,
+}
+REPLICA_SCALING_METRIC = appscaling.PredefinedMetric.ELASTICACHE_REPLICA_ENGINE_CPU_UTILIZATION
+
+
+@dataclass
+class ScaleInProtectionWindow:
+    start: appscaling.Schedule  # e.g. appscaling.Schedule.cron(hour="8", minute="0"), schedules are in UTC
+    end: appscaling.Schedule  # the minimum capacity of the scaling options is restored at the end of the window
+    min_capacity: int  # capacity does not scale in below it during the window
+
+
+@dataclass
+class ShardAutoScalingOptions:
+    min_capacity: int = 1
+    max_capacity: int = 10
+    metric: ShardScalingMetric = ShardScalingMetric.CPU
+    target_value: float = 60  # average primary engine CPU or memory percent, depending on the metric
+    scale_in_cooldown: Duration = Duration.minutes(10)  # resharding moves slots, shards are not removed in a hurry
+    scale_out_cooldown: Duration = Duration.minutes(5)
+    disable_scale_in: bool = False
+    scale_in_protection_windows: Sequence[ScaleInProtectionWindow] = field(default_factory=list)
+
+
+@dataclass
+class ReplicaAutoScalingOptions:
+    min_capacity: int = 1
+    max_capacity: int = MAX_REPLICAS
+    target_value: float = 60  # average replica engine CPU percent
+    scale_in_cooldown: Duration = Duration.minutes(5)
+    scale_out_cooldown: Duration = Duration.minutes(5)
+    disable_scale_in: bool = False
+    scale_in_protection_windows: Sequence[ScaleInProtectionWindow] = field(default_factory=list)
+
+
+class ReplicationGroupScaling:
+
+    @staticmethod
+    def __validate_capacity(min_capacity: int, max_capacity: int, windows: Sequence[ScaleInProtectionWindow],
+                            lower_bound: int, upper_bound: int, name: str):
+        if not lower_bound <= min_capacity <= max_capacity <= upper_bound:
+            raise ValueError(f"{name} auto scaling capacity must be between {lower_bound} and {upper_bound}")
+        for window in windows:
+            if not min_capacity <= window.min_capacity <= max_capacity:
+                raise ValueError(f"{name} scale-in protection capacity must be within the auto scaling capacity")
+
+    @staticmethod
+    def __scalable_target(stack: Stack, construct_id: str, replication_group: elasticache.CfnReplicationGroup,
+                          scalable_dimension: str, min_capacity: int, max_capacity: int,
+                          windows: Sequence[ScaleInProtectionWindow]) -> appscaling.ScalableTarget:
+        scalable_target = appscaling.ScalableTarget(stack, construct_id,
+                                                    service_namespace=appscaling.ServiceNamespace.ELASTICACHE,
+                                                    resource_id=f"replication-group/{replication_group.ref}",
+                                                    scalable_dimension=scalable_dimension,
+                                                    min_capacity=min_capacity,
+                                                    max_capacity=max_capacity)
+        scalable_target.node.add_dependency(replication_group)
+
+        # raising the minimum capacity keeps the scaling policy from scaling in during the window
+        for window_idx, window in enumerate(windows, start=1):
+            scalable_target.scale_on_schedule(f"ScaleInProtectionWindow{window_idx}Start",
+                                              schedule=window.start,
+                                              min_capacity=window.min_capacity,
+                                              max_capacity=max_capacity)
+            scalable_target.scale_on_schedule(f"ScaleInProtectionWindow{window_idx}End",
+                                              schedule=window.end,
+                                              min_capacity=min_capacity,
+                                              max_capacity=max_capacity)
+        return scalable_target
+
+    @staticmethod
+    def shards(stack: Stack, construct_id: str, replication_group: elasticache.CfnReplicationGroup,
+               options: ShardAutoScalingOptions) -> appscaling.ScalableTarget:
+        """
+        Adds and removes shards of a cluster mode enabled replication group to keep the engine CPU or memory of the
+        primaries around the target value
+        """
+        ReplicationGroupScaling.__validate_capacity(options.min_capacity, options.max_capacity,
+                                                    options.scale_in_protection_windows, 1, MAX_SHARDS, "Shard")
+        scalable_target = ReplicationGroupScaling.__scalable_target(stack, f"{construct_id}ShardScaling",
+                                                                    replication_group,
+                                                                    "elasticache:replication-group:NodeGroups",
+                                                                    options.min_capacity, options.max_capacity,
+                                                                    options.scale_in_protection_windows)
+        scalable_target.scale_to_track_metric(f"{construct_id}ShardScalingPolicy",
+                                              predefined_metric=SHARD_SCALING_METRICS[options.metric],
+                                              target_value=options.target_value,
+                                              scale_in_cooldown=options.scale_in_cooldown,
+                                              scale_out_cooldown=options.scale_out_cooldown,
+                                              disable_scale_in=options.disable_scale_in)
+        return scalable_target
+
+    @staticmethod
+    def replicas(stack: Stack, construct_id: str, replication_group: elasticache.CfnReplicationGroup,
+                 options: ReplicaAutoScalingOptions) -> appscaling.ScalableTarget:
+        """
+        Adds and removes replicas of every shard to keep the engine CPU of the replicas around the target value
+        """
+        ReplicationGroupScaling.__validate_capacity(options.min_capacity, options.max_capacity,
+                                                    options.scale_in_protection_windows, 0, MAX_REPLICAS, "Replica")
+        scalable_target = ReplicationGroupScaling.__scalable_target(stack, f"{construct_id}ReplicaScaling",
+                                                                    replication_group,
+                                                                    "elasticache:replication-group:Replicas",
+                                                                    options.min_capacity, options.max_capacity,
+                                                                    options.scale_in_protection_windows)
+        scalable_target.scale_to_track_metric(f"{construct_id}ReplicaScalingPolicy",
+                                              predefined_metric=REPLICA_SCALING_METRIC,
+                                              target_value=options.target_value,
+                                              scale_in_cooldown=options.scale_in_cooldown,
+                                              scale_out_cooldown=options.scale_out_cooldown,
+                                              disable_scale_in=options.disable_scale_in)
+        return scalable_target
@@ -0,0 +1,152 @@
+from enum import StrEnum
+from typing import Optional
+
+from aws_cdk import aws_elasticache as elasticache, aws_ec2 as ec2, Stack
+
+from packages.builder import Builder
+from packages.utils.vpc_utils import VpcUtils
+
+MAX_DATA_STORAGE_GB = 5000
+MIN_ECPU_PER_SECOND = 1000
+MAX_ECPU_PER_SECOND = 15000000
+MAX_SNAPSHOT_RETENTION_LIMIT = 35
+
+
+class ServerlessEngine(StrEnum):
+    VALKEY = 'valkey'
+    REDIS = 'redis'
+    MEMCACHED = 'memcached'
+
+
+class ServerlessCacheBuilder(Builder):
+
+    def __init__(self, construct_id: str, stack: Stack):
+        super().__init__(construct_id, stack)
+        self.__serverless_cache_name = None
+        self.__description = None
+        self.__engine = ServerlessEngine.VALKEY
+        self.__major_engine_version = None
+        self.__data_storage = None
+        self.__ecpu_per_second = None
+        self.__vpc = None
+        self.__security_group_ids = None
+        self.__kms_key_id = None
+        self.__user_group_id = None
+        self.__snapshot_retention_limit = None
+        self.__daily_snapshot_time = None
+        self.__final_snapshot_name = None
+        self.__snapshot_arns_to_restore = None
+
+    def serverless_cache_name(self, serverless_cache_name: str):
+        self.__serverless_cache_name = serverless_cache_name
+
+    def description(self, description: str):
+        self.__description = description
+
+    def engine(self, engine: ServerlessEngine):
+        self.__engine = engine
+
+    def major_engine_version(self, major_engine_version: str):
+        self.__major_engine_version = major_engine_version
+
+    def data_storage(self, maximum_gb: Optional[int] = None, minimum_gb: Optional[int] = None):
+        """
+        Bounds of the data stored in the cache, a minimum keeps the storage warm, a maximum caps the cost
+        """
+        self.__data_storage = (minimum_gb, maximum_gb)
+
+    def ecpu_per_second(self, maximum: Optional[int] = None, minimum: Optional[int] = None):
+        """
+        Bounds of the ElastiCache Processing Units consumed per second, a minimum pre-scales the cache for a known peak
+        """
+        self.__ecpu_per_second = (minimum, maximum)
+
+    def vpc(self, vpc: ec2.Vpc):
+        """
+        The cache endpoints are placed in the private subnets of the VPC
+        """
+        self.__vpc = vpc
+
+    def security_group_ids(self, security_group_ids: []):
+        self.__security_group_ids = security_group_ids
+
+    def kms_key_id(self, kms_key_id: str):
+        self.__kms_key_id = kms_key_id
+
+    def user_group_id(self, user_group_id: str):
+        self.__user_group_id = user_group_id
+
+    def snapshot_retention_limit(self, snapshot_retention_limit: int):
+        self.__snapshot_retention_limit = snapshot_retention_limit
+
+    def daily_snapshot_time(self, daily_snapshot_time: str):
+        """
+        :type daily_snapshot_time: UTC time of the daily snapshot, e.g. "04:00"
+        """
+        self.__daily_snapshot_time = daily_snapshot_time
+
+    def final_snapshot_name(self, final_snapshot_name: str):
+        self.__final_snapshot_name = final_snapshot_name
+
+    def snapshot_arns_to_restore(self, snapshot_arns_to_restore: []):
+        self.__snapshot_arns_to_restore = snapshot_arns_to_restore
+
+    @staticmethod
+    def __validate_limits(limits, lower_bound: int, upper_bound: int, name: str):
+        minimum, maximum = limits
+        if minimum is not None and not lower_bound <= minimum <= upper_bound:
+            raise ValueError(f"{name} minimum must be between {lower_bound} and {upper_bound}")
+        if maximum is not None and not lower_bound <= maximum <= upper_bound:
+            raise ValueError(f"{name} maximum must be between {lower_bound} and {upper_bound}")
+        if minimum is not None and maximum is not None and minimum > maximum:
+            raise ValueError(f"{name} minimum cannot be above the maximum")
+
+    def __validate(self):
+        if self.__serverless_cache_name is None:
+            raise ValueError("Serverless cache requires a name")
+        if self.__data_storage is not None:
+            self.__validate_limits(self.__data_storage, 1, MAX_DATA_STORAGE_GB, "Data storage")
+        if self.__ecpu_per_second is not None:
+            self.__validate_limits(self.__ecpu_per_second, MIN_ECPU_PER_SECOND, MAX_ECPU_PER_SECOND, "ECPU per second")
+        snapshots = [self.__snapshot_retention_limit, self.__daily_snapshot_time, self.__final_snapshot_name,
+                     self.__snapshot_arns_to_restore]
+        if self.__engine == ServerlessEngine.MEMCACHED and any(snapshot is not None for snapshot in snapshots):
+            raise ValueError("Snapshots are only supported by the Valkey and Redis engines")
+        if self.__snapshot_retention_limit is not None and \
+                not 0 <= self.__snapshot_retention_limit <= MAX_SNAPSHOT_RETENTION_LIMIT:
+            raise ValueError(f"Snapshot retention limit must be between 0 and {MAX_SNAPSHOT_RETENTION_LIMIT} days")
+
+    def __cache_usage_limits(self):
+        if self.__data_storage is None and self.__ecpu_per_second is None:
+            return None
+        data_storage = None
+        if self.__data_storage is not None:
+            minimum, maximum = self.__data_storage
+            data_storage = elasticache.CfnServerlessCache.DataStorageProperty(unit="GB", minimum=minimum,
+                                                                              maximum=maximum)
+        ecpu_per_second = None
+        if self.__ecpu_per_second is not None:
+            minimum, maximum = self.__ecpu_per_second
+            ecpu_per_second = elasticache.CfnServerlessCache.ECPUPerSecondProperty(minimum=minimum, maximum=maximum)
+        return elasticache.CfnServerlessCache.CacheUsageLimitsProperty(data_storage=data_storage,
+                                                                       ecpu_per_second=ecpu_per_second)
+
+    def build(self) -> elasticache.CfnServerlessCache:
+        self.__validate()
+        serverless_cache = elasticache.CfnServerlessCache(
+            self.stack, self.construct_id,
+            serverless_cache_name=self.__serverless_cache_name,
+            description=self.__description,
+            engine=self.__engine,
+            major_engine_version=self.__major_engine_version,
+            cache_usage_limits=self.__cache_usage_limits(),
+            subnet_ids=VpcUtils.get_private_subnets(self.__vpc) if self.__vpc is not None else None,
+            security_group_ids=self.__security_group_ids,
+            kms_key_id=self.__kms_key_id,
+            user_group_id=self.__user_group_id,
+            snapshot_retention_limit=self.__snapshot_retention_limit,
+            daily_snapshot_time=self.__daily_snapshot_time,
+            final_snapshot_name=self.__final_snapshot_name,
+            snapshot_arns_to_restore=self.__snapshot_arns_to_restore
+        )
+        return serverless_cache
@@ -1,10 +1,29 @@
-from typing import Any, Mapping
+from dataclasses import dataclass
+from typing import Any, Mapping, Optional
 
-from aws_cdk import aws_lambda as _lambda, aws_s3 as s3, aws_iam as iam, Stack, Duration
+from aws_cdk import aws_lambda as _lambda, aws_s3 as s3, aws_iam as iam, aws_dynamodb as dynamodb, aws_sqs as sqs, \
+    aws_lambda_event_sources as event_sources, Stack, Duration
 
 from packages.api_gateway.lambda_rest_api_builder import LambdaRestApiBuilder
 from packages.builder import Builder
 
+MAX_STREAM_BATCH_SIZE = 10000
+MAX_PARALLELIZATION_FACTOR = 10
+
+
+@dataclass
+class StreamEventSourceOptions:
+    batch_size: int = 100
+    max_batching_window: Optional[Duration] = None  # waits up to 5 minutes to fill the batch
+    parallelization_factor: int = 1  # concurrent batches per shard, concurrency follows the shard count of the stream
+    bisect_batch_on_error: bool = True
+    report_batch_item_failures: bool = True  # the handler returns batchItemFailures to retry only failed records
+    tumbling_window: Optional[Duration] = None  # aggregation window up to 15 minutes, state is passed between batches
+    on_failure: Optional[sqs.IQueue] = None  # receives the metadata of the batches discarded after retries
+    retry_attempts: Optional[int] = None
+    max_record_age: Optional[Duration] = None
+    starting_position: _lambda.StartingPosition = _lambda.StartingPosition.TRIM_HORIZON
+
 
 class LambdaBuilder(Builder):
 
@@ -21,6 +40,7 @@ class LambdaBuilder(Builder):
         self.__bucket_object_key = None
         self.__bucket_object_version = None
         self.__rest_api_enabled = False
+        self.__dynamodb_event_sources = []
 
     def function_name(self, function_name: str):
         self.__function_name = function_name
@@ -60,6 +80,19 @@ class LambdaBuilder(Builder):
         self.__rest_api_enabled = rest_api_enabled
         return self
 
+    def dynamodb_event_source(self, table: dynamodb.ITableV2,
+                              options: Optional[StreamEventSourceOptions] = None):
+        """
+        Processes the changes of a table, its stream must be enabled, e.g. with DynamodbBuilder.stream
+        """
+        options = options or StreamEventSourceOptions()
+        if not 1 <= options.batch_size <= MAX_STREAM_BATCH_SIZE:
+            raise ValueError(f"Stream batch size must be between 1 and {MAX_STREAM_BATCH_SIZE}")
+        if not 1 <= options.parallelization_factor <= MAX_PARALLELIZATION_FACTOR:
+            raise ValueError(f"Parallelization factor must be between 1 and {MAX_PARALLELIZATION_FACTOR}")
+        self.__dynamodb_event_sources.append((table, options))
+        return self
+
     def build(self) -> _lambda.Function:
         s3_bucket = self.__get_s3_bucket()
         lambda_function = _lambda.Function(self.stack, self.construct_id,
@@ -77,6 +110,9 @@ class LambdaBuilder(Builder):
             actions=["s3:GetObject"],
             resources=[f"{s3_bucket.bucket_arn}/*"]))
 
+        for table, options in self.__dynamodb_event_sources:
+            lambda_function.add_event_source(self.__create_dynamodb_event_source(table, options))
+
         if self.__rest_api_enabled:
             self.__create_rest_api(lambda_function)
 
@@ -87,6 +123,21 @@ class LambdaBuilder(Builder):
         rest_api_builder.handler(lambda_function)
         return rest_api_builder.build()
 
+    @staticmethod
+    def __create_dynamodb_event_source(table: dynamodb.ITableV2, options: StreamEventSourceOptions):
+        return event_sources.DynamoEventSource(table,
+                                               starting_position=options.starting_position,
+                                               batch_size=options.batch_size,
+                                               max_batching_window=options.max_batching_window,
+                                               parallelization_factor=options.parallelization_factor,
+                                               bisect_batch_on_error=options.bisect_batch_on_error,
+                                               report_batch_item_failures=options.report_batch_item_failures,
+                                               tumbling_window=options.tumbling_window,
+                                               retry_attempts=options.retry_attempts,
+                                               max_record_age=options.max_record_age,
+                                               on_failure=options.on_failure and event_sources.SqsDlq(
+                                                   options.on_failure))
+
     def __get_s3_bucket(self):
         return s3.Bucket.from_bucket_name(self.stack, f"CodeBucket{self.construct_id}",
                                           bucket_name=self.__bucket_name)
@@ -1,35 +1,37 @@
 import ast
 import os
 import string
+from typing import Mapping, Optional
 
 import yaml
 from yaml.loader import SafeLoader
 
 
-def load_yaml(file: str, parse_env=False) -> dict:
+def load_yaml(file: str, parse_env=False, variables: Optional[Mapping[str, str]] = None) -> dict:
     with open(file) as f:
-        loader = __env_safe_loader() if parse_env else SafeLoader
+        loader = __env_safe_loader(variables) if parse_env else SafeLoader
         return yaml.load(f, Loader=loader)
 
 
-def load_all_yaml(file: str, parse_env=False) -> list:
+def load_all_yaml(file: str, parse_env=False, variables: Optional[Mapping[str, str]] = None) -> list:
     with open(file) as f:
-        loader = __env_safe_loader() if parse_env else SafeLoader
+        loader = __env_safe_loader(variables) if parse_env else SafeLoader
         return list(yaml.load_all(f, Loader=loader))
 
 
-def __env_safe_loader():
-    env_safe_loader = yaml.SafeLoader
+def __env_safe_loader(variables: Optional[Mapping[str, str]] = None):
+    # A dedicated loader class per call, so SafeLoader itself is left untouched and loads can run concurrently
+    env_safe_loader = type("EnvSafeLoader", (SafeLoader,), {})
     env_safe_loader.add_constructor('tag:yaml.org,2002:str',
-                                    __str_constructor)
+                                    lambda _, node: __str_constructor(node, variables))
     token_re = string.Template.pattern
     env_safe_loader.add_implicit_resolver('tag:yaml.org,2002:str', token_re, None)
     return env_safe_loader
 
 
-def __str_constructor(_, node):
+def __str_constructor(node, variables: Optional[Mapping[str, str]] = None):
     try:
-        new_value = string.Template(node.value).substitute(dict(os.environ))
+        new_value = string.Template(node.value).substitute({**os.environ, **(variables or {})})
     except ValueError:
         return node.value
 
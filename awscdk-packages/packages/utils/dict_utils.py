@@ -0,0 +1,17 @@
+import copy
+
+
+class DictUtils:
+
+    @staticmethod
+    def deep_merge(base: dict, overrides: dict) -> dict:
+        """
+        Merge overrides into a copy of base, nested dictionaries are merged key by key
+        """
+        merged = copy.deepcopy(base)
+        for key, value in overrides.items():
+            if isinstance(value, dict) and isinstance(merged.get(key), dict):
+                merged[key] = DictUtils.deep_merge(merged[key], value)
+            else:
+                merged[key] = copy.deepcopy(value)
+        return merged
@@ -7,7 +7,7 @@ setup(
     long_description=open('README.md').read(),
     long_description_content_type='text/markdown',
     url='https://github.com/<your-company>/infra-awscdk-devops-packages.git',
-    packages=find_packages(exclude=["tests", "tests.*", "stacks", "stacks.*", "dist", "dist.*", "*.egg-info/"]),
+    packages=find_packages(exclude=["tests", "tests.*", "tools", "tools.*", "stacks", "stacks.*", "dist", "dist.*", "*.egg-info/"]),
     include_package_data=True,
     keywords='infra awscdk devops packages',
     zip_safe=True,
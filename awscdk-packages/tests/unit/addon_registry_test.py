@@ -0,0 +1,66 @@
+import os
+import tempfile
+import unittest
+from dataclasses import replace
+
+from packages.eks_cluster.addon_registry import AddOn, AddOnRegistry
+
+
+class AddOnRegistryTestCase(unittest.TestCase):
+
+    def setUp(self):
+        values_file = tempfile.NamedTemporaryFile("w", suffix=".yaml", delete=False)
+        values_file.write("controller:\n  ingressClass: ${INGRESS_CLASS}\n")
+        values_file.close()
+        self.values_file = values_file.name
+        self.addon = AddOn(name="ingress-nginx",
+                           construct_id="IngressNginx",
+                           chart="ingress-nginx",
+                           release="ingress-nginx",
+                           repository="https://kubernetes.github.io/ingress-nginx",
+                           namespace="ingress-nginx",
+                           version="4.10.0",
+                           values_files=(self.values_file,))
+
+    def tearDown(self):
+        os.remove(self.values_file)
+        os.environ.pop("INGRESS_CLASS", None)
+
+    def test_render_follows_environment(self):
+        registry = AddOnRegistry([self.addon])
+
+        os.environ["INGRESS_CLASS"] = "internal"
+        self.assertEqual({"controller": {"ingressClass": "internal"}},
+                         registry.render([self.addon])["ingress-nginx"].values)
+
+        os.environ["INGRESS_CLASS"] = "external"
+        self.assertEqual({"controller": {"ingressClass": "external"}},
+                         registry.render([self.addon])["ingress-nginx"].values)
+
+    def test_render_returns_copies(self):
+        registry = AddOnRegistry([self.addon])
+        os.environ["INGRESS_CLASS"] = "internal"
+
+        registry.render([self.addon])["ingress-nginx"].values["controller"]["ingressClass"] = "changed"
+
+        self.assertEqual({"controller": {"ingressClass": "internal"}},
+                         registry.render([self.addon])["ingress-nginx"].values)
+
+    def test_render_without_dependency(self):
+        addon = replace(self.addon, depends_on=("karpenter",))
+        registry = AddOnRegistry.default().register(addon)
+        os.environ["INGRESS_CLASS"] = "internal"
+
+        self.assertEqual(["ingress-nginx"], list(registry.render([addon])))
+
+    def test_render_with_unregistered_dependency(self):
+        addon = replace(self.addon, depends_on=("cert-manager",))
+        registry = AddOnRegistry([addon])
+        os.environ["INGRESS_CLASS"] = "internal"
+
+        with self.assertRaisesRegex(ValueError, "depends on cert-manager, which is not registered"):
+            registry.render([addon])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import unittest
+
+from aws_cdk import aws_dynamodb as dynamodb, aws_ec2 as ec2, aws_iam as iam, Stack, Duration
+from aws_cdk.assertions import Match, Template
+
+from packages.databases.dynamodb.dax_builder import DaxBuilder
+from packages.databases.dynamodb.dynamodb_builder import DynamodbBuilder
+from packages.network.vpc_builder import VpcBuilder
+
+
+class DaxTestCase(unittest.TestCase):
+
+    def test_dax_builder(self):
+        stack = Stack()
+
+        vpc_builder = VpcBuilder("VPC_NAME", stack)
+        vpc_builder.ip_addresses("10.0.0.0/16")
+        vpc_builder.availability_zones(["us-east-1a", "us-east-1b", "us-east-1c"])
+        vpc_builder.subnet_configuration([
+            ec2.SubnetConfiguration(name="Public", subnet_type=ec2.SubnetType.PUBLIC, cidr_mask=20),
+            ec2.SubnetConfiguration(name="Private", subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS, cidr_mask=20)
+        ])
+        vpc = vpc_builder.build()
+
+        dynamodb_builder = DynamodbBuilder("Table1", stack)
+        dynamodb_builder.partition_key(dynamodb.Attribute(name="pk", type=dynamodb.AttributeType.STRING))
+        dynamodb_builder.table_name("test-table")
+        dynamodb_table = dynamodb_builder.build()
+
+        application_role = iam.Role(stack, "ApplicationRole",
+                                    assumed_by=iam.ServicePrincipal("ecs-tasks.amazonaws.com"))
+        application_security_group = ec2.SecurityGroup(stack, "ApplicationSecurityGroup", vpc=vpc)
+
+        dax_builder = DaxBuilder("DaxCluster", stack)
+        dax_builder.cluster_name("test-dax")
+        dax_builder.node_type("dax.r5.large")
+        dax_builder.replication_factor(3)
+        dax_builder.vpc(vpc)
+        dax_builder.item_ttl(Duration.minutes(10))
+        dax_builder.query_ttl(Duration.minutes(1))
+        dax_builder.table(dynamodb_table)
+        dax_builder.grant(application_role, connectable=application_security_group)
+        dax_cluster = dax_builder.build()
+
+        self.assertIsNotNone(dax_cluster)
+
+        template = Template.from_stack(stack)
+        template.has_resource_properties("AWS::DAX::Cluster", {
+            "ReplicationFactor": 3,
+            "SSESpecification": {"SSEEnabled": True},
+            "ClusterEndpointEncryptionType": "TLS"
+        })
+        template.has_resource_properties("AWS::DAX::ParameterGroup", {
+            "ParameterNameValues": {"record-ttl-millis": "600000", "query-ttl-millis": "60000"}
+        })
+        template.resource_count_is("AWS::DAX::SubnetGroup", 1)
+        template.has_resource_properties("AWS::DAX::Cluster", {
+            "SecurityGroupIds": [{"Fn::GetAtt": [Match.string_like_regexp("^DaxClusterSecurityGroup"), "GroupId"]}]
+        })
+        template.has_resource_properties("AWS::EC2::SecurityGroupIngress", {
+            "IpProtocol": "tcp",
+            "FromPort": 9111,
+            "ToPort": 9111,
+            "GroupId": {"Fn::GetAtt": [Match.string_like_regexp("^DaxClusterSecurityGroup"), "GroupId"]},
+            "SourceSecurityGroupId": {
+                "Fn::GetAtt": [Match.string_like_regexp("^ApplicationSecurityGroup"), "GroupId"]}
+        })
+
+    def test_dax_builder_with_security_group_without_encryption(self):
+        stack = Stack()
+        vpc = ec2.Vpc(stack, "VPC")
+        dynamodb_table = dynamodb.TableV2(stack, "Table",
+                                          partition_key=dynamodb.Attribute(name="pk",
+                                                                           type=dynamodb.AttributeType.STRING))
+        security_group = ec2.SecurityGroup(stack, "DaxSecurityGroup", vpc=vpc)
+        application_security_group = ec2.SecurityGroup(stack, "ApplicationSecurityGroup", vpc=vpc)
+        application_role = iam.Role(stack, "ApplicationRole",
+                                    assumed_by=iam.ServicePrincipal("lambda.amazonaws.com"))
+
+        dax_builder = DaxBuilder("DaxCluster", stack)
+        dax_builder.vpc(vpc)
+        dax_builder.security_group(security_group)
+        dax_builder.encryption(False)
+        dax_builder.table(dynamodb_table)
+        dax_builder.grant(application_role, read_only=True, connectable=application_security_group)
+        dax_builder.build()
+
+        template = Template.from_stack(stack)
+        template.resource_count_is("AWS::EC2::SecurityGroup", 2)
+        template.has_resource_properties("AWS::DAX::Cluster", {
+            "SecurityGroupIds": [{"Fn::GetAtt": [Match.string_like_regexp("^DaxSecurityGroup"), "GroupId"]}],
+            "ClusterEndpointEncryptionType": "NONE"
+        })
+        template.has_resource_properties("AWS::EC2::SecurityGroupIngress", {
+            "FromPort": 8111,
+            "ToPort": 8111,
+            "SourceSecurityGroupId": {
+                "Fn::GetAtt": [Match.string_like_regexp("^ApplicationSecurityGroup"), "GroupId"]}
+        })
+
+    def test_dax_builder_without_table(self):
+        stack = Stack()
+        vpc = ec2.Vpc(stack, "VPC")
+
+        dax_builder = DaxBuilder("DaxCluster", stack)
+        dax_builder.vpc(vpc)
+
+        with self.assertRaises(ValueError):
+            dax_builder.build()
+
+
+if __name__ == '__main__':
+    unittest.main()
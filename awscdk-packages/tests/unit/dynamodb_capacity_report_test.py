@@ -0,0 +1,140 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+import urllib.request
+from datetime import datetime, timedelta, timezone
+
+import boto3
+from moto import mock_aws
+from moto.server import ThreadedMotoServer
+
+from tools.dynamodb_capacity_report import add_metrics, capacity_report, describe_tables, list_table_names, main, \
+    write_report
+
+
+@mock_aws
+class CapacityReportTestCase(unittest.TestCase):
+
+    def setUp(self):
+        os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+        os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+        self.dynamodb = boto3.client("dynamodb", region_name="us-east-1")
+        self.cloudwatch = boto3.client("cloudwatch", region_name="us-east-1")
+
+    def __create_table(self, table_name, billing_mode="PAY_PER_REQUEST"):
+        throughput = {"ProvisionedThroughput": {"ReadCapacityUnits": 10, "WriteCapacityUnits": 5}} \
+            if billing_mode == "PROVISIONED" else {}
+        self.dynamodb.create_table(TableName=table_name,
+                                   KeySchema=[{"AttributeName": "pk", "KeyType": "HASH"}],
+                                   AttributeDefinitions=[{"AttributeName": "pk", "AttributeType": "S"}],
+                                   BillingMode=billing_mode,
+                                   **throughput)
+
+    def test_list_table_names_paginates(self):
+        for table_idx in range(105):
+            self.__create_table(f"table-{table_idx:03}")
+
+        table_names = list_table_names(self.dynamodb)
+
+        self.assertEqual(105, len(table_names))
+
+    def test_capacity_report(self):
+        self.__create_table("orders", billing_mode="PROVISIONED")
+        self.__create_table("sessions")
+        end_time = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+        self.cloudwatch.put_metric_data(Namespace="AWS/DynamoDB", MetricData=[
+            {"MetricName": "ConsumedReadCapacityUnits", "Dimensions": [{"Name": "TableName", "Value": "orders"}],
+             "Timestamp": end_time - timedelta(minutes=30), "Value": 36000},
+            {"MetricName": "ReadThrottleEvents", "Dimensions": [{"Name": "TableName", "Value": "orders"}],
+             "Timestamp": end_time - timedelta(minutes=30), "Value": 12}
+        ])
+
+        tables = describe_tables(self.dynamodb, list_table_names(self.dynamodb), max_workers=4)
+        add_metrics(self.cloudwatch, tables, end_time - timedelta(hours=1), end_time)
+        orders = next(table for table in tables if table.table_name == "orders")
+        sessions = next(table for table in tables if table.table_name == "sessions")
+
+        self.assertEqual("PROVISIONED", orders.billing_mode)
+        self.assertEqual(10, orders.provisioned_read_capacity_units)
+        self.assertEqual(10, orders.consumed_read_capacity_units)
+        self.assertEqual(12, orders.read_throttle_events)
+        self.assertEqual("PAY_PER_REQUEST", sessions.billing_mode)
+        self.assertEqual(0, sessions.consumed_read_capacity_units)
+
+    def test_describe_tables_skips_deleted_tables(self):
+        self.__create_table("orders")
+        self.__create_table("sessions")
+        table_names = list_table_names(self.dynamodb)
+        self.dynamodb.delete_table(TableName="sessions")
+
+        with self.assertLogs("tools.dynamodb_capacity_report", level="WARNING") as logs:
+            tables = describe_tables(self.dynamodb, table_names, max_workers=4)
+
+        self.assertEqual(["orders"], [table.table_name for table in tables])
+        self.assertIn("Skipping table sessions", logs.output[0])
+
+    def test_write_report(self):
+        self.__create_table("orders")
+
+        tables = capacity_report("us-east-1", hours=1)
+        csv_output, json_output = io.StringIO(), io.StringIO()
+        write_report(tables, csv_output, "csv")
+        write_report(tables, json_output, "json")
+
+        self.assertTrue(csv_output.getvalue().startswith("table_name,billing_mode"))
+        self.assertEqual("orders", json.loads(json_output.getvalue())[0]["table_name"])
+
+    def test_capacity_report_rejects_empty_period(self):
+        for hours in ("0", "-1"):
+            with self.assertRaises(SystemExit), contextlib.redirect_stderr(io.StringIO()):
+                main(["--region", "us-east-1", "--hours", hours])
+        with self.assertRaises(ValueError):
+            capacity_report("us-east-1", hours=0)
+
+
+class CapacityReportServerTestCase(unittest.TestCase):
+    """
+    Runs the command line against a local stand-in, DynamoDB and CloudWatch requests both go to its endpoint
+    """
+
+    def setUp(self):
+        os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+        os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+        self.server = ThreadedMotoServer(ip_address="127.0.0.1", port=0)
+        self.server.start()
+        host, port = self.server.get_host_and_port()
+        self.endpoint_url = f"http://{host}:{port}"
+        # the server shares the in-process state of the mocked tests
+        urllib.request.urlopen(urllib.request.Request(f"{self.endpoint_url}/moto-api/reset", method="POST"))
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_main(self):
+        dynamodb = boto3.client("dynamodb", region_name="us-east-1", endpoint_url=self.endpoint_url)
+        cloudwatch = boto3.client("cloudwatch", region_name="us-east-1", endpoint_url=self.endpoint_url)
+        dynamodb.create_table(TableName="orders",
+                              KeySchema=[{"AttributeName": "pk", "KeyType": "HASH"}],
+                              AttributeDefinitions=[{"AttributeName": "pk", "AttributeType": "S"}],
+                              BillingMode="PAY_PER_REQUEST")
+        cloudwatch.put_metric_data(Namespace="AWS/DynamoDB", MetricData=[
+            {"MetricName": "WriteThrottleEvents", "Dimensions": [{"Name": "TableName", "Value": "orders"}],
+             "Timestamp": datetime.now(timezone.utc) - timedelta(minutes=30), "Value": 3}
+        ])
+
+        with tempfile.TemporaryDirectory() as report_dir:
+            report_file = os.path.join(report_dir, "report.json")
+            main(["--region", "us-east-1", "--hours", "1", "--format", "json", "--output", report_file,
+                  "--endpoint-url", self.endpoint_url])
+            with open(report_file) as report:
+                tables = json.load(report)
+
+        self.assertEqual(["orders"], [table["table_name"] for table in tables])
+        self.assertEqual(3, tables[0]["write_throttle_events"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,10 @@
 import unittest
 
-from aws_cdk import Stack, aws_dynamodb as dynamodb
+from aws_cdk import Environment, Stack, aws_dynamodb as dynamodb, aws_s3 as s3
+from aws_cdk.assertions import Match, Template
 
-from packages.databases.dynamodb.dynamodb_builder import DynamodbBuilder
+from packages.databases.dynamodb.dynamodb_builder import AutoscaledCapacity, DynamodbBuilder
+from packages.databases.dynamodb.table_alarms import TableAlarmOptions
 
 
 class DynamoDBTestCase(unittest.TestCase):
@@ -17,5 +19,165 @@ class DynamoDBTestCase(unittest.TestCase):
         self.assertIsNotNone(dynamodb_table)
 
 
+    def test_dynamodb_builder_with_provisioned_capacity(self):
+        stack = Stack()
+        dynamodb_builder = DynamodbBuilder("Table1", stack)
+        dynamodb_builder.partition_key(dynamodb.Attribute(name="pk", type=dynamodb.AttributeType.STRING))
+        dynamodb_builder.table_name("test-table")
+        dynamodb_builder.provisioned(read_capacity=AutoscaledCapacity(min_capacity=5, max_capacity=100),
+                                     write_capacity=AutoscaledCapacity(min_capacity=5, max_capacity=50))
+        dynamodb_builder.warm_throughput(read_units_per_second=15000, write_units_per_second=5000)
+        dynamodb_builder.add_global_secondary_index("gsi1", "gsi1pk", "gsi1sk",
+                                                    read_capacity=AutoscaledCapacity(max_capacity=200),
+                                                    write_capacity=AutoscaledCapacity(max_capacity=20))
+        dynamodb_table = dynamodb_builder.build()
+
+        self.assertIsNotNone(dynamodb_table)
+
+        template = Template.from_stack(stack)
+        template.has_resource_properties("AWS::DynamoDB::GlobalTable", {
+            "BillingMode": "PROVISIONED",
+            "WarmThroughput": {"ReadUnitsPerSecond": 15000, "WriteUnitsPerSecond": 5000}
+        })
+        template.resource_count_is("AWS::ApplicationAutoScaling::ScalableTarget", 0)  # managed by the global table
+        template.has_resource_properties("AWS::DynamoDB::GlobalTable", {
+            "WriteProvisionedThroughputSettings": {
+                "WriteCapacityAutoScalingSettings": {"MinCapacity": 5, "MaxCapacity": 50}
+            }
+        })
+
+    def test_dynamodb_builder_index_capacity_requires_provisioned_billing(self):
+        stack = Stack()
+        dynamodb_builder = DynamodbBuilder("Table1", stack)
+        dynamodb_builder.partition_key(dynamodb.Attribute(name="pk", type=dynamodb.AttributeType.STRING))
+        dynamodb_builder.add_global_secondary_index("gsi1", "gsi1pk", "gsi1sk",
+                                                    read_capacity=AutoscaledCapacity(max_capacity=200))
+
+        with self.assertRaises(ValueError):
+            dynamodb_builder.build()
+
+    def test_dynamodb_builder_with_replicas(self):
+        stack = Stack(env=Environment(region="us-east-1"))
+        dynamodb_builder = DynamodbBuilder("Table1", stack)
+        dynamodb_builder.partition_key(dynamodb.Attribute(name="pk", type=dynamodb.AttributeType.STRING))
+        dynamodb_builder.table_name("test-table")
+        dynamodb_builder.provisioned(read_capacity=AutoscaledCapacity(max_capacity=100),
+                                     write_capacity=AutoscaledCapacity(max_capacity=50))
+        dynamodb_builder.add_global_secondary_index("gsi1", "gsi1pk", "gsi1sk")
+        dynamodb_builder.add_replica("eu-west-1",
+                                     table_class=dynamodb.TableClass.STANDARD_INFREQUENT_ACCESS,
+                                     read_capacity=AutoscaledCapacity(max_capacity=300),
+                                     contributor_insights=True,
+                                     global_secondary_index_options={
+                                         "gsi1": dynamodb.ReplicaGlobalSecondaryIndexOptions(contributor_insights=True)
+                                     })
+        dynamodb_builder.add_replica("ap-southeast-2")
+        dynamodb_table = dynamodb_builder.build()
+
+        self.assertIsNotNone(dynamodb_table)
+
+        template = Template.from_stack(stack)
+        template.has_resource_properties("AWS::DynamoDB::GlobalTable", {
+            "Replicas": Match.array_with([
+                Match.object_like({
+                    "Region": "eu-west-1",
+                    "TableClass": "STANDARD_INFREQUENT_ACCESS",
+                    "ContributorInsightsSpecification": {"Enabled": True},
+                    "ReadProvisionedThroughputSettings": {
+                        "ReadCapacityAutoScalingSettings": Match.object_like({"MaxCapacity": 300})
+                    }
+                }),
+                Match.object_like({"Region": "ap-southeast-2"}),
+                Match.object_like({"Region": "us-east-1"})
+            ])
+        })
+
+    def test_dynamodb_builder_replica_read_capacity_requires_provisioned_billing(self):
+        stack = Stack(env=Environment(region="us-east-1"))
+        dynamodb_builder = DynamodbBuilder("Table1", stack)
+        dynamodb_builder.partition_key(dynamodb.Attribute(name="pk", type=dynamodb.AttributeType.STRING))
+        dynamodb_builder.add_replica("eu-west-1", read_capacity=AutoscaledCapacity(max_capacity=300))
+
+        with self.assertRaises(ValueError):
+            dynamodb_builder.build()
+
+    def test_dynamodb_builder_with_contributor_insights_ttl_and_alarms(self):
+        stack = Stack()
+        dynamodb_builder = DynamodbBuilder("Table1", stack)
+        dynamodb_builder.partition_key(dynamodb.Attribute(name="pk", type=dynamodb.AttributeType.STRING))
+        dynamodb_builder.table_name("test-table")
+        dynamodb_builder.provisioned(read_capacity=AutoscaledCapacity(max_capacity=100),
+                                     write_capacity=AutoscaledCapacity(max_capacity=50))
+        dynamodb_builder.contributor_insights(True)
+        dynamodb_builder.time_to_live_attribute("expires_at")
+        dynamodb_builder.add_global_secondary_index("gsi1", "gsi1pk", "gsi1sk")
+        dynamodb_builder.add_global_secondary_index("gsi2", "gsi2pk", "gsi2sk", contributor_insights=False)
+        dynamodb_builder.alarms(TableAlarmOptions(consumed_capacity_ratio=0.9))
+        dynamodb_table = dynamodb_builder.build()
+
+        self.assertIsNotNone(dynamodb_table)
+        self.assertEqual(8, len(dynamodb_builder.table_alarms))
+
+        template = Template.from_stack(stack)
+        template.has_resource_properties("AWS::DynamoDB::GlobalTable", {
+            "TimeToLiveSpecification": {"AttributeName": "expires_at", "Enabled": True},
+            "Replicas": [Match.object_like({
+                "ContributorInsightsSpecification": {"Enabled": True},
+                "GlobalSecondaryIndexes": [
+                    Match.object_like({"IndexName": "gsi1", "ContributorInsightsSpecification": {"Enabled": True}}),
+                    Match.object_like({"IndexName": "gsi2", "ContributorInsightsSpecification": {"Enabled": False}})
+                ]
+            })]
+        })
+        template.resource_count_is("AWS::CloudWatch::Alarm", 8)
+        template.has_resource_properties("AWS::CloudWatch::Alarm", {
+            "MetricName": "ReadThrottleEvents",
+            "Dimensions": Match.array_with([{"Name": "GlobalSecondaryIndexName", "Value": "gsi1"}])
+        })
+        template.has_resource_properties("AWS::CloudWatch::Alarm", {
+            "Threshold": 0.9,
+            "Metrics": Match.array_with([Match.object_like({"Expression": "consumed / 60 / provisioned"})])
+        })
+
+    def test_dynamodb_builder_with_import_source(self):
+        stack = Stack()
+        bucket = s3.Bucket.from_bucket_name(stack, "ImportBucket", "reference-data")
+        dynamodb_builder = DynamodbBuilder("Table1", stack)
+        dynamodb_builder.partition_key(dynamodb.Attribute(name="pk", type=dynamodb.AttributeType.STRING))
+        dynamodb_builder.table_name("test-table")
+        dynamodb_builder.provisioned(read_capacity=AutoscaledCapacity(min_capacity=5, max_capacity=100),
+                                     write_capacity=AutoscaledCapacity(min_capacity=5, max_capacity=50))
+        dynamodb_builder.add_global_secondary_index("gsi1", "gsi1pk", "gsi1sk")
+        dynamodb_builder.import_source(bucket, dynamodb.InputFormat.csv(delimiter=","),
+                                       compression_type=dynamodb.InputCompressionType.GZIP,
+                                       key_prefix="tables/reference/")
+        dynamodb_table = dynamodb_builder.build()
+
+        self.assertIsInstance(dynamodb_table, dynamodb.Table)
+
+        template = Template.from_stack(stack)
+        template.has_resource_properties("AWS::DynamoDB::Table", {
+            "ImportSourceSpecification": {
+                "InputCompressionType": "GZIP",
+                "InputFormat": "CSV",
+                "S3BucketSource": Match.object_like({"S3Bucket": "reference-data", "S3KeyPrefix": "tables/reference/"})
+            },
+            "ProvisionedThroughput": {"ReadCapacityUnits": 5, "WriteCapacityUnits": 5},
+            "GlobalSecondaryIndexes": [Match.object_like({"IndexName": "gsi1"})]
+        })
+        template.resource_count_is("AWS::ApplicationAutoScaling::ScalableTarget", 4)
+
+    def test_dynamodb_builder_import_source_without_replicas(self):
+        stack = Stack(env=Environment(region="us-east-1"))
+        bucket = s3.Bucket.from_bucket_name(stack, "ImportBucket", "reference-data")
+        dynamodb_builder = DynamodbBuilder("Table1", stack)
+        dynamodb_builder.partition_key(dynamodb.Attribute(name="pk", type=dynamodb.AttributeType.STRING))
+        dynamodb_builder.import_source(bucket, dynamodb.InputFormat.dynamo_db_json())
+        dynamodb_builder.add_replica("eu-west-1")
+
+        with self.assertRaises(ValueError):
+            dynamodb_builder.build()
+
+
 if __name__ == '__main__':
     unittest.main()
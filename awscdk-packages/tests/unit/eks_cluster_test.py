@@ -1,10 +1,13 @@
 import os
 import unittest
 
-from aws_cdk import Stack, aws_ec2 as ec2, aws_eks as eks, Tags
+from aws_cdk import Stack, aws_ec2 as ec2, aws_eks as eks, Tags, Size, Duration
+from aws_cdk.assertions import Template, Match
 from aws_cdk.lambda_layer_kubectl_v30 import KubectlV30Layer
 
-from packages.eks_cluster.eks_cluster_builder import EksClusterBuilder, AccessEntry, AccessPolicy, AccessPolicies
+from packages.eks_cluster.addon_registry import AddOn, AddOnRegistry
+from packages.eks_cluster.eks_cluster_builder import EksClusterBuilder, AccessEntry, AccessPolicy, AccessPolicies, \
+    ArgoCdProfile, ObservabilityOptions
 from packages.network.security_group_builder import SecurityGroupBuilder, IngressRule
 from packages.network.vpc_builder import VpcBuilder
 
@@ -59,6 +62,231 @@ class EksClusterTestCase(unittest.TestCase):
         self.assertIsNotNone(vpc)
         self.assertIsNotNone(eks_cluster)
 
+    def test_eks_cluster_builder_with_batched_manifests(self):
+        stack = Stack()
+        vpc_builder = VpcBuilder("VPC_NAME", stack)
+        vpc_builder.ip_addresses("10.64.32.0/20")
+        vpc_builder.availability_zones(["us-east-1a", "us-east-1b", "us-east-1c"])
+        vpc = vpc_builder.build()
+
+        os.environ["EKS_CLUSTER_NAME"] = "EKS_CLUSTER_NAME"
+        os.environ["KARPENTER_ROLE_ARN"] = "KARPENTER_ROLE_ARN"
+        os.environ["ARGOCD_DOMAIN"] = "ARGOCD_DOMAIN"
+        os.environ["ENVIRONMENT"] = "prod"
+        os.environ["GITHUB_TOKEN"] = "GITHUB_TOKEN"
+        os.environ["GITHUB_EMAIL"] = "GITHUB_EMAIL"
+
+        eks_cluster_builder = EksClusterBuilder("EKS_CLUSTER_ID", stack, vpc)
+        eks_cluster_builder.cluster_name("EKS_CLUSTER_NAME")
+        eks_cluster_builder.kubectl_layer(KubectlV30Layer(stack, "KubectlV30Layer"))
+        eks_cluster_builder.version(eks.KubernetesVersion.V1_30)
+        eks_cluster_builder.batch_manifests(True)
+        eks_cluster_builder.kubectl_memory(Size.gibibytes(2))
+        eks_cluster_builder.kubectl_handler_timeout(Duration.minutes(10))
+        eks_cluster_builder.kubectl_concurrency(5)
+
+        eks_cluster = eks_cluster_builder.build()
+
+        self.assertIsNotNone(eks_cluster)
+        Template.from_stack(stack).resource_count_is("Custom::AWSCDK-EKS-KubernetesResource", 2)
+
+        kubectl_provider = next(child for child in stack.node.children if isinstance(child, eks.KubectlProvider))
+        Template.from_stack(kubectl_provider).has_resource_properties("AWS::Lambda::Function", {
+            "MemorySize": 2048,
+            "Timeout": 600,
+            "ReservedConcurrentExecutions": 5
+        })
+
+    def test_eks_cluster_builder_with_invalid_kubectl_provider(self):
+        stack = Stack()
+        vpc_builder = VpcBuilder("VPC_NAME", stack)
+        vpc_builder.ip_addresses("10.64.32.0/20")
+        vpc_builder.availability_zones(["us-east-1a", "us-east-1b", "us-east-1c"])
+        vpc = vpc_builder.build()
+
+        eks_cluster_builder = EksClusterBuilder("EKS_CLUSTER_ID", stack, vpc)
+        eks_cluster_builder.cluster_name("EKS_CLUSTER_NAME")
+        eks_cluster_builder.version(eks.KubernetesVersion.V1_30)
+        eks_cluster_builder.kubectl_handler_timeout(Duration.minutes(20))
+        with self.assertRaisesRegex(ValueError, "15 minutes"):
+            eks_cluster_builder.build()
+
+        eks_cluster_builder.kubectl_handler_timeout(Duration.minutes(10))
+        eks_cluster_builder.kubectl_concurrency(0)
+        with self.assertRaisesRegex(ValueError, "positive number"):
+            eks_cluster_builder.build()
+
+    def test_eks_cluster_builder_with_argocd_ha_profile(self):
+        stack = Stack()
+        vpc_builder = VpcBuilder("VPC_NAME", stack)
+        vpc_builder.ip_addresses("10.64.32.0/20")
+        vpc_builder.availability_zones(["us-east-1a", "us-east-1b", "us-east-1c"])
+        vpc = vpc_builder.build()
+
+        os.environ["EKS_CLUSTER_NAME"] = "EKS_CLUSTER_NAME"
+        os.environ["KARPENTER_ROLE_ARN"] = "KARPENTER_ROLE_ARN"
+        os.environ["ARGOCD_DOMAIN"] = "ARGOCD_DOMAIN"
+        os.environ["ENVIRONMENT"] = "prod"
+        os.environ["GITHUB_TOKEN"] = "GITHUB_TOKEN"
+        os.environ["GITHUB_EMAIL"] = "GITHUB_EMAIL"
+
+        eks_cluster_builder = EksClusterBuilder("EKS_CLUSTER_ID", stack, vpc)
+        eks_cluster_builder.cluster_name("EKS_CLUSTER_NAME")
+        eks_cluster_builder.kubectl_layer(KubectlV30Layer(stack, "KubectlV30Layer"))
+        eks_cluster_builder.version(eks.KubernetesVersion.V1_30)
+        eks_cluster_builder.argocd_profile(ArgoCdProfile.HIGH_AVAILABILITY)
+        eks_cluster_builder.argocd_values({"controller": {"replicas": 5}})
+
+        eks_cluster = eks_cluster_builder.build()
+
+        self.assertIsNotNone(eks_cluster)
+        Template.from_stack(stack).has_resource_properties("Custom::AWSCDK-EKS-HelmChart", {
+            "Release": "argocd",
+            "Values": Match.serialized_json(Match.object_like({
+                # default values are kept
+                "global": Match.object_like({"domain": "ARGOCD_DOMAIN"}),
+                "redis-ha": {"enabled": True},
+                "configs": Match.object_like({
+                    "params": Match.object_like({"server.insecure": True,
+                                                 "controller.sharding.algorithm": "round-robin"})}),
+                # argocd_values are merged on top of the profile
+                "controller": Match.object_like({"replicas": 5}),
+                "server": Match.object_like({"autoscaling": Match.object_like({"enabled": True, "minReplicas": 2})}),
+                "repoServer": Match.object_like({"autoscaling": Match.object_like({"enabled": True,
+                                                                                   "maxReplicas": 10})})
+            }))
+        })
+
+    def test_eks_cluster_builder_with_argocd_without_karpenter(self):
+        stack = Stack()
+        vpc_builder = VpcBuilder("VPC_NAME", stack)
+        vpc_builder.ip_addresses("10.64.32.0/20")
+        vpc_builder.availability_zones(["us-east-1a", "us-east-1b", "us-east-1c"])
+        vpc = vpc_builder.build()
+
+        os.environ["EKS_CLUSTER_NAME"] = "EKS_CLUSTER_NAME"
+        os.environ["ARGOCD_DOMAIN"] = "ARGOCD_DOMAIN"
+        os.environ["ENVIRONMENT"] = "prod"
+        os.environ["GITHUB_TOKEN"] = "GITHUB_TOKEN"
+        os.environ["GITHUB_EMAIL"] = "GITHUB_EMAIL"
+
+        eks_cluster_builder = EksClusterBuilder("EKS_CLUSTER_ID", stack, vpc)
+        eks_cluster_builder.cluster_name("EKS_CLUSTER_NAME")
+        eks_cluster_builder.kubectl_layer(KubectlV30Layer(stack, "KubectlV30Layer"))
+        eks_cluster_builder.version(eks.KubernetesVersion.V1_30)
+        eks_cluster_builder.create_karpenter(False)
+
+        eks_cluster = eks_cluster_builder.build()
+
+        self.assertIsNotNone(eks_cluster)
+        template = Template.from_stack(stack)
+        template.resource_count_is("Custom::AWSCDK-EKS-HelmChart", 1)
+        template.has_resource_properties("Custom::AWSCDK-EKS-HelmChart", {"Release": "argocd"})
+
+    def test_eks_cluster_builder_with_registered_addon(self):
+        stack = Stack()
+        vpc_builder = VpcBuilder("VPC_NAME", stack)
+        vpc_builder.ip_addresses("10.64.32.0/20")
+        vpc_builder.availability_zones(["us-east-1a", "us-east-1b", "us-east-1c"])
+        vpc = vpc_builder.build()
+
+        os.environ["EKS_CLUSTER_NAME"] = "EKS_CLUSTER_NAME"
+        os.environ["KARPENTER_ROLE_ARN"] = "KARPENTER_ROLE_ARN"
+        os.environ["ARGOCD_DOMAIN"] = "ARGOCD_DOMAIN"
+        os.environ["ENVIRONMENT"] = "prod"
+        os.environ["GITHUB_TOKEN"] = "GITHUB_TOKEN"
+        os.environ["GITHUB_EMAIL"] = "GITHUB_EMAIL"
+
+        ingress_nginx_addon = AddOn(name="ingress-nginx",
+                                    construct_id="IngressNginx",
+                                    chart="ingress-nginx",
+                                    release="ingress-nginx",
+                                    repository="https://kubernetes.github.io/ingress-nginx",
+                                    namespace="ingress-nginx",
+                                    version="4.10.0",
+                                    depends_on=["karpenter"])
+
+        eks_cluster_builder = EksClusterBuilder("EKS_CLUSTER_ID", stack, vpc)
+        eks_cluster_builder.cluster_name("EKS_CLUSTER_NAME")
+        eks_cluster_builder.kubectl_layer(KubectlV30Layer(stack, "KubectlV30Layer"))
+        eks_cluster_builder.version(eks.KubernetesVersion.V1_30)
+        eks_cluster_builder.addon_registry(AddOnRegistry.default())
+        eks_cluster_builder.add_addon(ingress_nginx_addon)
+        eks_cluster_builder.addon_values("ingress-nginx", {"controller": {"replicaCount": 2}})
+
+        eks_cluster = eks_cluster_builder.build()
+
+        self.assertIsNotNone(eks_cluster)
+        template = Template.from_stack(stack)
+        template.resource_count_is("Custom::AWSCDK-EKS-HelmChart", 3)
+        template.has_resource_properties("Custom::AWSCDK-EKS-HelmChart", {
+            "Release": "ingress-nginx",
+            "Chart": "ingress-nginx",
+            "Version": "4.10.0",
+            "Namespace": "ingress-nginx",
+            "Repository": "https://kubernetes.github.io/ingress-nginx",
+            "Values": Match.serialized_json({"controller": {"replicaCount": 2}})
+        })
+
+    def test_eks_cluster_builder_with_observability(self):
+        stack = Stack()
+        vpc_builder = VpcBuilder("VPC_NAME", stack)
+        vpc_builder.ip_addresses("10.64.32.0/20")
+        vpc_builder.availability_zones(["us-east-1a", "us-east-1b", "us-east-1c"])
+        vpc = vpc_builder.build()
+
+        os.environ["EKS_CLUSTER_NAME"] = "EKS_CLUSTER_NAME"
+        os.environ["KARPENTER_ROLE_ARN"] = "KARPENTER_ROLE_ARN"
+        os.environ["ARGOCD_DOMAIN"] = "ARGOCD_DOMAIN"
+        os.environ["ENVIRONMENT"] = "prod"
+        os.environ["GITHUB_TOKEN"] = "GITHUB_TOKEN"
+        os.environ["GITHUB_EMAIL"] = "GITHUB_EMAIL"
+
+        eks_cluster_builder = EksClusterBuilder("EKS_CLUSTER_ID", stack, vpc)
+        eks_cluster_builder.cluster_name("EKS_CLUSTER_NAME")
+        eks_cluster_builder.kubectl_layer(KubectlV30Layer(stack, "KubectlV30Layer"))
+        eks_cluster_builder.version(eks.KubernetesVersion.V1_30)
+        eks_cluster_builder.observability(ObservabilityOptions(scrape_interval=Duration.seconds(30),
+                                                               batch_size=4096))
+        eks_cluster_builder.addon_values("adot-collector", {"replicaCount": 3})
+
+        eks_cluster = eks_cluster_builder.build()
+
+        self.assertIsNotNone(eks_cluster)
+        template = Template.from_stack(stack)
+        template.resource_count_is("Custom::AWSCDK-EKS-HelmChart", 3)
+        template.has_resource_properties("Custom::AWSCDK-EKS-HelmChart", {
+            "Release": "adot-collector",
+            "Values": Match.serialized_json(Match.object_like({
+                "replicaCount": 3,
+                "config": Match.object_like({
+                    "receivers": {"prometheus": {"config": Match.object_like({
+                        "global": {"scrape_interval": "30s", "scrape_timeout": "10s"}})}},
+                    "processors": Match.object_like({"batch": Match.object_like({"send_batch_size": 4096,
+                                                                                 "send_batch_max_size": 8192})}),
+                    "exporters": {"awsemf": Match.object_like({
+                        "log_group_name": "/aws/containerinsights/EKS_CLUSTER_NAME/prometheus"})},
+                    "service": {"pipelines": {"metrics": {"receivers": ["prometheus"],
+                                                          "processors": ["memory_limiter", "batch"],
+                                                          "exporters": ["awsemf"]}}}
+                })
+            }))
+        })
+
+    def test_eks_cluster_builder_with_observability_without_cluster_name(self):
+        stack = Stack()
+        vpc_builder = VpcBuilder("VPC_NAME", stack)
+        vpc_builder.ip_addresses("10.64.32.0/20")
+        vpc_builder.availability_zones(["us-east-1a", "us-east-1b", "us-east-1c"])
+        vpc = vpc_builder.build()
+
+        eks_cluster_builder = EksClusterBuilder("EKS_CLUSTER_ID", stack, vpc)
+        eks_cluster_builder.version(eks.KubernetesVersion.V1_30)
+        eks_cluster_builder.observability(ObservabilityOptions())
+
+        with self.assertRaisesRegex(ValueError, "Observability requires a cluster name"):
+            eks_cluster_builder.build()
+
 
 if __name__ == '__main__':
     unittest.main()
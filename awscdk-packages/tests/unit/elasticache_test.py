@@ -0,0 +1,145 @@
+import unittest
+
+from aws_cdk import aws_applicationautoscaling as appscaling, Stack
+from aws_cdk.assertions import Match, Template
+
+from packages.elasticache.elasticache_builder import ClusterMode, ElasticacheBuilder, NodeGroup
+from packages.elasticache.replication_group_scaling import ReplicaAutoScalingOptions, ScaleInProtectionWindow, \
+    ShardAutoScalingOptions, ShardScalingMetric
+
+
+class ElasticacheTestCase(unittest.TestCase):
+
+    def test_elasticache_builder(self):
+        stack = Stack()
+        elasticache_builder = ElasticacheBuilder("Redis", stack)
+        elasticache_builder.replication_group_description("redis")
+        elasticache_builder.engine("redis")
+        elasticache_builder.cache_node_type("cache.r7g.large")
+        elasticache_builder.cluster_mode(ClusterMode.DISABLED)
+        elasticache_builder.num_cache_clusters(2)
+        elasticache_builder.multi_az_enabled(True)
+        redis_cluster = elasticache_builder.build()
+
+        self.assertIsNotNone(redis_cluster)
+
+    def test_elasticache_builder_with_node_groups(self):
+        stack = Stack()
+        elasticache_builder = ElasticacheBuilder("Redis", stack)
+        elasticache_builder.replication_group_description("redis")
+        elasticache_builder.engine("redis")
+        elasticache_builder.cache_node_type("cache.r7g.large")
+        elasticache_builder.cluster_mode(ClusterMode.ENABLED)
+        elasticache_builder.cache_parameter_group_name("default.redis7.cluster.on")
+        elasticache_builder.num_node_groups(2)
+        elasticache_builder.replicas_per_node_group(1)
+        elasticache_builder.multi_az_enabled(True)
+        elasticache_builder.add_node_group(NodeGroup(slots="0-8191", primary_availability_zone="us-east-1a",
+                                                     replica_availability_zones=["us-east-1b"]))
+        elasticache_builder.add_node_group(NodeGroup(slots="8192-16383", primary_availability_zone="us-east-1b",
+                                                     replica_availability_zones=["us-east-1c"]))
+        redis_cluster = elasticache_builder.build()
+
+        self.assertIsNotNone(redis_cluster)
+
+        template = Template.from_stack(stack)
+        template.has_resource_properties("AWS::ElastiCache::ReplicationGroup", {
+            "ClusterMode": "enabled",
+            "AutomaticFailoverEnabled": True,
+            "NumNodeGroups": 2,
+            "ReplicasPerNodeGroup": 1,
+            "NodeGroupConfiguration": [
+                {"Slots": "0-8191", "PrimaryAvailabilityZone": "us-east-1a",
+                 "ReplicaAvailabilityZones": ["us-east-1b"], "ReplicaCount": 1},
+                {"Slots": "8192-16383", "PrimaryAvailabilityZone": "us-east-1b",
+                 "ReplicaAvailabilityZones": ["us-east-1c"], "ReplicaCount": 1}
+            ]
+        })
+
+    def test_elasticache_builder_node_groups_require_cluster_mode(self):
+        stack = Stack()
+        elasticache_builder = ElasticacheBuilder("Redis", stack)
+        elasticache_builder.cluster_mode(ClusterMode.DISABLED)
+        elasticache_builder.num_node_groups(3)
+
+        with self.assertRaises(ValueError):
+            elasticache_builder.build()
+
+    def test_elasticache_builder_slots_cover_hash_slots(self):
+        stack = Stack()
+        elasticache_builder = ElasticacheBuilder("Redis", stack)
+        elasticache_builder.cluster_mode(ClusterMode.ENABLED)
+        elasticache_builder.num_node_groups(2)
+        elasticache_builder.add_node_group(NodeGroup(slots="0-8000"))
+        elasticache_builder.add_node_group(NodeGroup(slots="8192-16383"))
+
+        with self.assertRaises(ValueError):
+            elasticache_builder.build()
+
+    def test_elasticache_builder_with_auto_scaling(self):
+        stack = Stack()
+        elasticache_builder = ElasticacheBuilder("Redis", stack)
+        elasticache_builder.replication_group_description("redis")
+        elasticache_builder.engine("redis")
+        elasticache_builder.cache_node_type("cache.r7g.large")
+        elasticache_builder.cluster_mode(ClusterMode.ENABLED)
+        elasticache_builder.num_node_groups(2)
+        elasticache_builder.replicas_per_node_group(1)
+        elasticache_builder.shard_auto_scaling(ShardAutoScalingOptions(
+            min_capacity=2, max_capacity=8, metric=ShardScalingMetric.MEMORY, target_value=70,
+            scale_in_protection_windows=[ScaleInProtectionWindow(start=appscaling.Schedule.cron(hour="8", minute="0"),
+                                                                 end=appscaling.Schedule.cron(hour="20", minute="0"),
+                                                                 min_capacity=4)]))
+        elasticache_builder.replica_auto_scaling(ReplicaAutoScalingOptions(min_capacity=1, max_capacity=3))
+        redis_cluster = elasticache_builder.build()
+
+        self.assertIsNotNone(redis_cluster)
+        self.assertIsNotNone(elasticache_builder.shard_scalable_target)
+
+        template = Template.from_stack(stack)
+        template.has_resource_properties("AWS::ApplicationAutoScaling::ScalableTarget", {
+            "ScalableDimension": "elasticache:replication-group:NodeGroups",
+            "MinCapacity": 2,
+            "MaxCapacity": 8,
+            "ScheduledActions": Match.array_with([
+                Match.object_like({"Schedule": "cron(0 8 * * ? *)", "ScalableTargetAction": {"MinCapacity": 4,
+                                                                                               "MaxCapacity": 8}})
+            ])
+        })
+        template.has_resource_properties("AWS::ApplicationAutoScaling::ScalableTarget", {
+            "ScalableDimension": "elasticache:replication-group:Replicas",
+            "MinCapacity": 1,
+            "MaxCapacity": 3
+        })
+        template.has_resource_properties("AWS::ApplicationAutoScaling::ScalingPolicy", {
+            "TargetTrackingScalingPolicyConfiguration": Match.object_like({
+                "PredefinedMetricSpecification": {
+                    "PredefinedMetricType": "ElastiCacheDatabaseMemoryUsageCountedForEvictPercentage"
+                },
+                "TargetValue": 70
+            })
+        })
+
+    def test_elasticache_builder_shard_auto_scaling_requires_cluster_mode(self):
+        stack = Stack()
+        elasticache_builder = ElasticacheBuilder("Redis", stack)
+        elasticache_builder.cluster_mode(ClusterMode.DISABLED)
+        elasticache_builder.shard_auto_scaling(ShardAutoScalingOptions())
+
+        with self.assertRaises(ValueError):
+            elasticache_builder.build()
+
+
+    def test_elasticache_builder_replica_auto_scaling_requires_cluster_mode(self):
+        stack = Stack()
+        elasticache_builder = ElasticacheBuilder("Redis", stack)
+        elasticache_builder.cluster_mode(ClusterMode.DISABLED)
+        elasticache_builder.num_cache_clusters(2)
+        elasticache_builder.replica_auto_scaling(ReplicaAutoScalingOptions())
+
+        with self.assertRaisesRegex(ValueError, "Replica auto scaling requires ClusterMode.ENABLED"):
+            elasticache_builder.build()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+
+from aws_cdk import Stack, aws_ec2 as ec2, aws_eks as eks
+from aws_cdk.assertions import Template, Match
+from aws_cdk.lambda_layer_kubectl_v30 import KubectlV30Layer
+
+from packages.eks_cluster.fargate_profile_builder import FargateProfileBuilder, FargatePodSize
+from packages.network.vpc_builder import VpcBuilder
+
+
+class FargateProfileTestCase(unittest.TestCase):
+
+    def test_fargate_profile_builder(self):
+        stack = Stack()
+        vpc_builder = VpcBuilder("VPC_NAME", stack)
+        vpc_builder.ip_addresses("10.64.32.0/20")
+        vpc_builder.availability_zones(["us-east-1a", "us-east-1b", "us-east-1c"])
+        vpc = vpc_builder.build()
+        cluster = eks.FargateCluster(stack, "EKS_CLUSTER_ID",
+                                     vpc=vpc,
+                                     kubectl_layer=KubectlV30Layer(stack, "KubectlV30Layer"),
+                                     version=eks.KubernetesVersion.V1_30)
+
+        fargate_profile_builder = FargateProfileBuilder("FargateProfile", stack, cluster)
+        fargate_profile_builder.fargate_profile_name("workloads")
+        fargate_profile_builder.namespaces(["staging", "production"])
+        fargate_profile_builder.labels({"compute": "fargate"})
+        fargate_profile_builder.subnet_selection(ec2.SubnetSelection(subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS))
+        fargate_profile = fargate_profile_builder.build()
+
+        self.assertIsNotNone(fargate_profile)
+        private_subnets = [{"Ref": stack.get_logical_id(subnet.node.default_child)} for subnet in
+                           vpc.select_subnets(subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS).subnets]
+        Template.from_stack(stack).has_resource_properties("Custom::AWSCDK-EKS-FargateProfile", {
+            "Config": Match.object_like({
+                "fargateProfileName": "workloads",
+                "selectors": [{"namespace": "staging", "labels": {"compute": "fargate"}},
+                              {"namespace": "production", "labels": {"compute": "fargate"}}],
+                "subnets": private_subnets
+            })
+        })
+
+    def test_fargate_pod_size(self):
+        self.assertEqual(FargatePodSize(vcpu=0.25, memory_gib=0.5), FargatePodSize.for_requests(0.1, 128))
+        self.assertEqual(FargatePodSize(vcpu=0.25, memory_gib=2), FargatePodSize.for_requests(0.25, 1024))
+        self.assertEqual(FargatePodSize(vcpu=1, memory_gib=3), FargatePodSize.for_requests(0.6, 2560))
+        self.assertEqual(FargatePodSize(vcpu=8, memory_gib=20), FargatePodSize.for_requests(6, 16384))
+        self.assertEqual({"cpu": "500m", "memory": "768Mi"}, FargatePodSize(vcpu=0.5, memory_gib=1).requests())
+        self.assertRaises(ValueError, FargatePodSize.for_requests, 32, 1024)
+
+
+if __name__ == '__main__':
+    unittest.main()
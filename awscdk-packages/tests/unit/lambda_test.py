@@ -1,8 +1,10 @@
 import unittest
 
-from aws_cdk import aws_lambda as _lambda, Stack
+from aws_cdk import aws_lambda as _lambda, aws_dynamodb as dynamodb, aws_sqs as sqs, Stack, Duration
+from aws_cdk.assertions import Template
 
-from packages.lambda_function.lambda_builder import LambdaBuilder
+from packages.databases.dynamodb.dynamodb_builder import DynamodbBuilder
+from packages.lambda_function.lambda_builder import LambdaBuilder, StreamEventSourceOptions
 
 
 class LambdaTestCase(unittest.TestCase):
@@ -13,12 +15,62 @@ class LambdaTestCase(unittest.TestCase):
         lambda_builder.function_name("lambda-example")
         lambda_builder.runtime(_lambda.Runtime.PYTHON_3_9)
         lambda_builder.handler("example.handler")
-        lambda_builder.code_from_bucket(object_key="example")
+        lambda_builder.code_from_bucket(bucket_name="example-bucket", object_key="example")
 
         lambda_function = lambda_builder.build()
 
         self.assertIsNotNone(lambda_function)
 
+    def test_lambda_builder_with_dynamodb_event_source(self):
+        stack = Stack()
+        dynamodb_builder = DynamodbBuilder("Table1", stack)
+        dynamodb_builder.partition_key(dynamodb.Attribute(name="pk", type=dynamodb.AttributeType.STRING))
+        dynamodb_builder.stream(dynamodb.StreamViewType.NEW_AND_OLD_IMAGES)
+        dynamodb_table = dynamodb_builder.build()
+        failure_queue = sqs.Queue(stack, "FailureQueue")
+
+        lambda_builder = LambdaBuilder("LambdaExample", stack)
+        lambda_builder.function_name("lambda-example")
+        lambda_builder.runtime(_lambda.Runtime.PYTHON_3_9)
+        lambda_builder.handler("example.handler")
+        lambda_builder.code_from_bucket(bucket_name="example-bucket", object_key="example")
+        lambda_builder.dynamodb_event_source(dynamodb_table, StreamEventSourceOptions(
+            batch_size=500,
+            max_batching_window=Duration.seconds(5),
+            parallelization_factor=4,
+            tumbling_window=Duration.minutes(1),
+            on_failure=failure_queue))
+
+        lambda_function = lambda_builder.build()
+
+        self.assertIsNotNone(lambda_function)
+
+        template = Template.from_stack(stack)
+        template.has_resource_properties("AWS::DynamoDB::GlobalTable", {
+            "StreamSpecification": {"StreamViewType": "NEW_AND_OLD_IMAGES"}
+        })
+        template.has_resource_properties("AWS::Lambda::EventSourceMapping", {
+            "BatchSize": 500,
+            "MaximumBatchingWindowInSeconds": 5,
+            "ParallelizationFactor": 4,
+            "BisectBatchOnFunctionError": True,
+            "FunctionResponseTypes": ["ReportBatchItemFailures"],
+            "TumblingWindowInSeconds": 60,
+            "StartingPosition": "TRIM_HORIZON"
+        })
+
+    def test_lambda_builder_dynamodb_event_source_parallelization_factor(self):
+        stack = Stack()
+        dynamodb_builder = DynamodbBuilder("Table1", stack)
+        dynamodb_builder.partition_key(dynamodb.Attribute(name="pk", type=dynamodb.AttributeType.STRING))
+        dynamodb_builder.stream(dynamodb.StreamViewType.NEW_IMAGE)
+        dynamodb_table = dynamodb_builder.build()
+
+        lambda_builder = LambdaBuilder("LambdaExample", stack)
+
+        with self.assertRaises(ValueError):
+            lambda_builder.dynamodb_event_source(dynamodb_table, StreamEventSourceOptions(parallelization_factor=20))
+
 
 if __name__ == '__main__':
     unittest.main()
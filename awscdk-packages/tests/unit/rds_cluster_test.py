@@ -1,8 +1,15 @@
 import unittest
 
-from aws_cdk import aws_ec2 as ec2, aws_rds as rds, Stack
+from aws_cdk import aws_ec2 as ec2, aws_events as events, aws_rds as rds, App, Environment, Stack, Duration
+from aws_cdk.assertions import Annotations, Match, Template
 
+from packages.databases.rds.aurora_readers import ReaderAutoScalingOptions, ReaderScalingMetric
+from packages.databases.rds.capacity_schedule import CapacityWindow
+from packages.databases.rds.cluster_instances import ClusterInstanceKind, ClusterInstanceOptions, ClusterInstances
+from packages.databases.rds.global_database import SecondaryClusterOptions
+from packages.databases.rds.parameter_group_profiles import WorkloadProfile
 from packages.databases.rds.rds_cluster_builder import RdsClusterBuilder
+from packages.databases.rds.rds_proxy import RdsProxy, RdsProxyOptions
 from packages.network.security_group_builder import IngressRule, SecurityGroupBuilder
 from packages.network.vpc_builder import VpcBuilder
 
@@ -33,7 +40,7 @@ class RdsInstanceTestCase(unittest.TestCase):
         security_group = security_group_builder.build()
         rds_cluster_builder = RdsClusterBuilder("RDS_Cluster", stack)
         rds_cluster_builder.cluster_identifier("sample-cluster-name")
-        rds_cluster_builder.engine(rds.DatabaseClusterEngine.aurora_mysql(version=rds.AuroraMysqlEngineVersion.VER_3_01_0))
+        rds_cluster_builder.engine(rds.DatabaseClusterEngine.aurora_mysql(version=rds.AuroraMysqlEngineVersion.VER_3_04_0))
         rds_cluster_builder.readers(3)
         rds_cluster_builder.vpc(vpc)
         rds_cluster_builder.credentials("root")
@@ -71,7 +78,7 @@ class RdsInstanceTestCase(unittest.TestCase):
         security_group = security_group_builder.build()
         rds_cluster_builder = RdsClusterBuilder("RDS_Cluster", stack)
         rds_cluster_builder.engine("sample-cluster-name")
-        rds_cluster_builder.engine(rds.DatabaseClusterEngine.aurora_mysql(version=rds.AuroraMysqlEngineVersion.VER_3_01_0))
+        rds_cluster_builder.engine(rds.DatabaseClusterEngine.aurora_mysql(version=rds.AuroraMysqlEngineVersion.VER_3_04_0))
         rds_cluster_builder.readers(-2)
         rds_cluster_builder.vpc(vpc)
         rds_cluster_builder.credentials("root")
@@ -109,7 +116,7 @@ class RdsInstanceTestCase(unittest.TestCase):
         security_group = security_group_builder.build()
         rds_cluster_builder = RdsClusterBuilder("RDS_Cluster", stack)
         rds_cluster_builder.cluster_identifier("sample-cluster-name")
-        rds_cluster_builder.engine(rds.DatabaseClusterEngine.aurora_mysql(version=rds.AuroraMysqlEngineVersion.VER_3_01_0))
+        rds_cluster_builder.engine(rds.DatabaseClusterEngine.aurora_mysql(version=rds.AuroraMysqlEngineVersion.VER_3_04_0))
         rds_cluster_builder.readers(0)
         rds_cluster_builder.vpc(vpc)
         rds_cluster_builder.credentials("root")
@@ -122,5 +129,564 @@ class RdsInstanceTestCase(unittest.TestCase):
         rds_cluster = rds_cluster_builder.build()
 
         self.assertIsNotNone(rds_cluster)
+
+    def test_rds_cluster_builder_with_proxy(self):
+        stack = Stack()
+
+        vpc_builder = VpcBuilder("VPC_NAME", stack)
+        vpc_builder.ip_addresses("10.0.0.0/16")
+        vpc_builder.availability_zones(["us-east-1a", "us-east-1b", "us-east-1c"])
+        vpc_builder.subnet_configuration([
+            ec2.SubnetConfiguration(name="Public", subnet_type=ec2.SubnetType.PUBLIC, cidr_mask=20),
+            ec2.SubnetConfiguration(name="Database", subnet_type=ec2.SubnetType.PRIVATE_ISOLATED, cidr_mask=20),
+            ec2.SubnetConfiguration(name="Private", subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS, cidr_mask=20)
+        ])
+        vpc = vpc_builder.build()
+        security_group_builder = SecurityGroupBuilder("RDSSecurityGroup", stack, vpc)
+        security_group_builder.security_group_name("RDS Security Group")
+        security_group_builder.description("RDS Security Group to control incoming and outgoing traffic")
+        security_group_builder.allow_all_outbound(True)
+        security_group_builder.ingress_rules([
+            IngressRule(peer=ec2.Peer.ipv4("10.0.0.0/20"),
+                        description="Allow all traffic from VPC CIDR",
+                        connection=ec2.Port.all_traffic())
+        ])
+        security_group = security_group_builder.build()
+        rds_cluster_builder = RdsClusterBuilder("RDS_Cluster", stack)
+        rds_cluster_builder.cluster_identifier("sample-cluster-name")
+        rds_cluster_builder.engine(rds.DatabaseClusterEngine.aurora_mysql(version=rds.AuroraMysqlEngineVersion.VER_3_04_0))
+        rds_cluster_builder.readers(3)
+        rds_cluster_builder.vpc(vpc)
+        rds_cluster_builder.credentials("root")
+        rds_cluster_builder.port(3306)
+        rds_cluster_builder.deletion_protection(False)
+        rds_cluster_builder.security_groups(security_group)
+        rds_cluster_builder.serverless_v2_min_capacity(2)
+        rds_cluster_builder.serverless_v2_max_capacity(10)
+
+        rds_cluster_builder.proxy(RdsProxyOptions(max_connections_percent=80, read_only_endpoint=True))
+
+        rds_cluster = rds_cluster_builder.build()
+
+        self.assertIsNotNone(rds_cluster)
+
+        self.assertIsNotNone(rds_cluster_builder.db_proxy.proxy)
+
+        self.assertIsNotNone(rds_cluster_builder.db_proxy.read_only_endpoint)
+
+        template = Template.from_stack(stack)
+        template.has_resource_properties("AWS::RDS::DBProxyTargetGroup", {
+            "ConnectionPoolConfigurationInfo": Match.object_like({"MaxConnectionsPercent": 80}),
+            "DBClusterIdentifiers": [{"Ref": stack.get_logical_id(rds_cluster.node.default_child)}]
+        })
+        template.has_resource_properties("AWS::RDS::DBProxyEndpoint", {
+            "DBProxyName": {"Ref": stack.get_logical_id(rds_cluster_builder.db_proxy.proxy.node.default_child)},
+            "DBProxyEndpointName": "rds-cluster-read-only",
+            "TargetRole": "READ_ONLY"
+        })
+
+    def test_rds_proxy_read_only_endpoint_name(self):
+        self.assertEqual("rds-cluster-read-only", RdsProxy.read_only_endpoint_name("RDS_Cluster"))
+        self.assertEqual("proxy-1st-cluster-read-only", RdsProxy.read_only_endpoint_name("1st..Cluster_"))
+        long_name = RdsProxy.read_only_endpoint_name("Cluster" * 20)
+        self.assertEqual(63, len(long_name))
+        self.assertTrue(long_name.endswith("-read-only"))
+
+    def test_rds_cluster_builder_with_performance_insights(self):
+        stack = Stack()
+
+        vpc_builder = VpcBuilder("VPC_NAME", stack)
+        vpc_builder.ip_addresses("10.0.0.0/16")
+        vpc_builder.availability_zones(["us-east-1a", "us-east-1b", "us-east-1c"])
+        vpc_builder.subnet_configuration([
+            ec2.SubnetConfiguration(name="Public", subnet_type=ec2.SubnetType.PUBLIC, cidr_mask=20),
+            ec2.SubnetConfiguration(name="Database", subnet_type=ec2.SubnetType.PRIVATE_ISOLATED, cidr_mask=20),
+            ec2.SubnetConfiguration(name="Private", subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS, cidr_mask=20)
+        ])
+        vpc = vpc_builder.build()
+        security_group_builder = SecurityGroupBuilder("RDSSecurityGroup", stack, vpc)
+        security_group_builder.security_group_name("RDS Security Group")
+        security_group_builder.description("RDS Security Group to control incoming and outgoing traffic")
+        security_group_builder.allow_all_outbound(True)
+        security_group_builder.ingress_rules([
+            IngressRule(peer=ec2.Peer.ipv4("10.0.0.0/20"),
+                        description="Allow all traffic from VPC CIDR",
+                        connection=ec2.Port.all_traffic())
+        ])
+        security_group = security_group_builder.build()
+        rds_cluster_builder = RdsClusterBuilder("RDS_Cluster", stack)
+        rds_cluster_builder.cluster_identifier("sample-cluster-name")
+        rds_cluster_builder.engine(rds.DatabaseClusterEngine.aurora_mysql(version=rds.AuroraMysqlEngineVersion.VER_3_04_0))
+        rds_cluster_builder.readers(3)
+        rds_cluster_builder.vpc(vpc)
+        rds_cluster_builder.credentials("root")
+        rds_cluster_builder.port(3306)
+        rds_cluster_builder.deletion_protection(False)
+        rds_cluster_builder.security_groups(security_group)
+        rds_cluster_builder.serverless_v2_min_capacity(2)
+        rds_cluster_builder.serverless_v2_max_capacity(10)
+
+        rds_cluster_builder.enable_performance_insights(True)
+
+        rds_cluster_builder.performance_insight_retention(rds.PerformanceInsightRetention.MONTHS_1)
+
+        rds_cluster_builder.monitoring_interval(Duration.seconds(30))
+
+        rds_cluster = rds_cluster_builder.build()
+
+        self.assertIsNotNone(rds_cluster)
+
+    def test_rds_cluster_builder_with_workload_profile(self):
+        stack = Stack()
+
+        vpc_builder = VpcBuilder("VPC_NAME", stack)
+        vpc_builder.ip_addresses("10.0.0.0/16")
+        vpc_builder.availability_zones(["us-east-1a", "us-east-1b", "us-east-1c"])
+        vpc_builder.subnet_configuration([
+            ec2.SubnetConfiguration(name="Public", subnet_type=ec2.SubnetType.PUBLIC, cidr_mask=20),
+            ec2.SubnetConfiguration(name="Database", subnet_type=ec2.SubnetType.PRIVATE_ISOLATED, cidr_mask=20),
+            ec2.SubnetConfiguration(name="Private", subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS, cidr_mask=20)
+        ])
+        vpc = vpc_builder.build()
+        security_group_builder = SecurityGroupBuilder("RDSSecurityGroup", stack, vpc)
+        security_group_builder.security_group_name("RDS Security Group")
+        security_group_builder.description("RDS Security Group to control incoming and outgoing traffic")
+        security_group_builder.allow_all_outbound(True)
+        security_group_builder.ingress_rules([
+            IngressRule(peer=ec2.Peer.ipv4("10.0.0.0/20"),
+                        description="Allow all traffic from VPC CIDR",
+                        connection=ec2.Port.all_traffic())
+        ])
+        security_group = security_group_builder.build()
+        rds_cluster_builder = RdsClusterBuilder("RDS_Cluster", stack)
+        rds_cluster_builder.cluster_identifier("sample-cluster-name")
+        rds_cluster_builder.engine(rds.DatabaseClusterEngine.aurora_mysql(version=rds.AuroraMysqlEngineVersion.VER_3_04_0))
+        rds_cluster_builder.readers(3)
+        rds_cluster_builder.vpc(vpc)
+        rds_cluster_builder.credentials("root")
+        rds_cluster_builder.port(3306)
+        rds_cluster_builder.deletion_protection(False)
+        rds_cluster_builder.security_groups(security_group)
+        rds_cluster_builder.serverless_v2_min_capacity(2)
+        rds_cluster_builder.serverless_v2_max_capacity(10)
+
+        rds_cluster_builder.workload_profile(WorkloadProfile.ANALYTICS)
+
+        rds_cluster = rds_cluster_builder.build()
+
+        self.assertIsNotNone(rds_cluster)
+
+        template = Template.from_stack(stack)
+        parameter_group = template.find_resources("AWS::RDS::DBParameterGroup")
+        self.assertEqual(len(parameter_group), 1)
+        self.assertNotIn("innodb_buffer_pool_size", list(parameter_group.values())[0]["Properties"]["Parameters"])
+        template.resource_properties_count_is("AWS::RDS::DBInstance",
+                                              {"DBParameterGroupName": {"Ref": list(parameter_group)[0]}}, 4)
+
+    def test_rds_cluster_builder_with_reader_auto_scaling(self):
+        stack = Stack()
+
+        vpc_builder = VpcBuilder("VPC_NAME", stack)
+        vpc_builder.ip_addresses("10.0.0.0/16")
+        vpc_builder.availability_zones(["us-east-1a", "us-east-1b", "us-east-1c"])
+        vpc_builder.subnet_configuration([
+            ec2.SubnetConfiguration(name="Public", subnet_type=ec2.SubnetType.PUBLIC, cidr_mask=20),
+            ec2.SubnetConfiguration(name="Database", subnet_type=ec2.SubnetType.PRIVATE_ISOLATED, cidr_mask=20),
+            ec2.SubnetConfiguration(name="Private", subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS, cidr_mask=20)
+        ])
+        vpc = vpc_builder.build()
+        security_group_builder = SecurityGroupBuilder("RDSSecurityGroup", stack, vpc)
+        security_group_builder.security_group_name("RDS Security Group")
+        security_group_builder.description("RDS Security Group to control incoming and outgoing traffic")
+        security_group_builder.allow_all_outbound(True)
+        security_group_builder.ingress_rules([
+            IngressRule(peer=ec2.Peer.ipv4("10.0.0.0/20"),
+                        description="Allow all traffic from VPC CIDR",
+                        connection=ec2.Port.all_traffic())
+        ])
+        security_group = security_group_builder.build()
+        rds_cluster_builder = RdsClusterBuilder("RDS_Cluster", stack)
+        rds_cluster_builder.cluster_identifier("sample-cluster-name")
+        rds_cluster_builder.engine(rds.DatabaseClusterEngine.aurora_mysql(version=rds.AuroraMysqlEngineVersion.VER_3_04_0))
+        rds_cluster_builder.readers(3)
+        rds_cluster_builder.vpc(vpc)
+        rds_cluster_builder.credentials("root")
+        rds_cluster_builder.port(3306)
+        rds_cluster_builder.deletion_protection(False)
+        rds_cluster_builder.security_groups(security_group)
+        rds_cluster_builder.serverless_v2_min_capacity(2)
+        rds_cluster_builder.serverless_v2_max_capacity(10)
+
+        rds_cluster_builder.reader_promotion_tier(2, 1)
+
+        rds_cluster_builder.reader_promotion_tier(3, 15)
+
+        rds_cluster_builder.reader_auto_scaling(ReaderAutoScalingOptions(max_capacity=5,
+                                                                         metric=ReaderScalingMetric.CONNECTIONS,
+                                                                         target_value=500))
+
+        rds_cluster_builder.custom_reader_endpoint("Analytics", [3])
+
+        rds_cluster = rds_cluster_builder.build()
+
+        self.assertIsNotNone(rds_cluster)
+
+        template = Template.from_stack(stack)
+        template.resource_count_is("AWS::RDS::DBInstance", 4)
+        template.resource_properties_count_is("AWS::RDS::DBInstance", {"PromotionTier": 15}, 1)
+        template.has_resource_properties("AWS::ApplicationAutoScaling::ScalableTarget",
+                                         {"ScalableDimension": "rds:cluster:ReadReplicaCount", "MaxCapacity": 5})
+        template.resource_count_is("Custom::AWS", 1)
+        reader_3_id = stack.get_logical_id(rds_cluster.node.find_child("reader-3").node.default_child)
+        template.has_resource_properties("Custom::AWS", {
+            "Create": {"Fn::Join": ["", Match.array_with([
+                Match.string_like_regexp('"DBClusterEndpointIdentifier":"analytics".*"StaticMembers":\\["$'),
+                {"Ref": reader_3_id}])]}
+        })
+        endpoint_arn = {"Fn::Join": ["", ["arn:", {"Ref": "AWS::Partition"}, ":rds:", {"Ref": "AWS::Region"}, ":",
+                                          {"Ref": "AWS::AccountId"}, ":cluster-endpoint:analytics"]]}
+        cluster_arn = {"Fn::Join": ["", ["arn:", {"Ref": "AWS::Partition"}, ":rds:", {"Ref": "AWS::Region"}, ":",
+                                         {"Ref": "AWS::AccountId"}, ":cluster:",
+                                         {"Ref": stack.get_logical_id(rds_cluster.node.default_child)}]]}
+        template.has_resource_properties("AWS::IAM::Policy", {
+            "PolicyDocument": {"Statement": [
+                {"Action": f"rds:{action}DBClusterEndpoint", "Effect": "Allow", "Resource": [endpoint_arn, cluster_arn]}
+                for action in ("Create", "Modify", "Delete")]}
+        })
+        self.assertIn("Analytics", rds_cluster_builder.reader_endpoints)
+        self.assertIsNotNone(rds_cluster_builder.reader_scalable_target)
+
+    def test_rds_cluster_builder_with_invalid_custom_reader_endpoint(self):
+        stack = Stack()
+        vpc = ec2.Vpc(stack, "VPC")
+
+        rds_cluster_builder = RdsClusterBuilder("RDS_Cluster", stack)
+        rds_cluster_builder.engine(rds.DatabaseClusterEngine.aurora_mysql(version=rds.AuroraMysqlEngineVersion.VER_3_04_0))
+        rds_cluster_builder.readers(1)
+        rds_cluster_builder.vpc(vpc)
+        rds_cluster_builder.credentials("root")
+        rds_cluster_builder.custom_reader_endpoint("analytics_readers", [1])
+
+        with self.assertRaisesRegex(ValueError, "Endpoint name analytics_readers"):
+            rds_cluster_builder.build()
+
+    def test_rds_cluster_builder_with_provisioned_writer(self):
+        stack = Stack()
+
+        vpc_builder = VpcBuilder("VPC_NAME", stack)
+        vpc_builder.ip_addresses("10.0.0.0/16")
+        vpc_builder.availability_zones(["us-east-1a", "us-east-1b", "us-east-1c"])
+        vpc_builder.subnet_configuration([
+            ec2.SubnetConfiguration(name="Public", subnet_type=ec2.SubnetType.PUBLIC, cidr_mask=20),
+            ec2.SubnetConfiguration(name="Database", subnet_type=ec2.SubnetType.PRIVATE_ISOLATED, cidr_mask=20),
+            ec2.SubnetConfiguration(name="Private", subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS, cidr_mask=20)
+        ])
+        vpc = vpc_builder.build()
+        security_group_builder = SecurityGroupBuilder("RDSSecurityGroup", stack, vpc)
+        security_group_builder.security_group_name("RDS Security Group")
+        security_group_builder.description("RDS Security Group to control incoming and outgoing traffic")
+        security_group_builder.allow_all_outbound(True)
+        security_group_builder.ingress_rules([
+            IngressRule(peer=ec2.Peer.ipv4("10.0.0.0/20"),
+                        description="Allow all traffic from VPC CIDR",
+                        connection=ec2.Port.all_traffic())
+        ])
+        security_group = security_group_builder.build()
+        rds_cluster_builder = RdsClusterBuilder("RDS_Cluster", stack)
+        rds_cluster_builder.cluster_identifier("sample-cluster-name")
+        rds_cluster_builder.engine(rds.DatabaseClusterEngine.aurora_mysql(version=rds.AuroraMysqlEngineVersion.VER_3_04_0))
+        rds_cluster_builder.readers(3)
+        rds_cluster_builder.vpc(vpc)
+        rds_cluster_builder.credentials("root")
+        rds_cluster_builder.port(3306)
+        rds_cluster_builder.deletion_protection(False)
+        rds_cluster_builder.security_groups(security_group)
+        rds_cluster_builder.serverless_v2_min_capacity(2)
+        rds_cluster_builder.serverless_v2_max_capacity(10)
+
+        rds_cluster_builder.writer_instance(ClusterInstanceOptions(kind=ClusterInstanceKind.PROVISIONED,
+                                                                   instance_type=ec2.InstanceType("r6gd.xlarge")))
+        rds_cluster_builder.reader_instance(ClusterInstanceOptions(kind=ClusterInstanceKind.PROVISIONED,
+                                                                   instance_type=ec2.InstanceType("r6g.large")),
+                                            reader=3)
+
+        rds_cluster = rds_cluster_builder.build()
+
+        self.assertIsNotNone(rds_cluster)
+
+        template = Template.from_stack(stack)
+        template.resource_properties_count_is("AWS::RDS::DBInstance", {"DBInstanceClass": "db.serverless"}, 2)
+        template.resource_properties_count_is("AWS::RDS::DBInstance", {"DBInstanceClass": "db.r6gd.xlarge"}, 1)
+        template.resource_properties_count_is("AWS::RDS::DBInstance", {"DBInstanceClass": "db.r6g.large"}, 1)
+
+    def test_rds_cluster_builder_with_unsupported_instance_class(self):
+        stack = Stack()
+
+        vpc_builder = VpcBuilder("VPC_NAME", stack)
+        vpc_builder.ip_addresses("10.0.0.0/16")
+        vpc_builder.availability_zones(["us-east-1a", "us-east-1b", "us-east-1c"])
+        vpc_builder.subnet_configuration([
+            ec2.SubnetConfiguration(name="Public", subnet_type=ec2.SubnetType.PUBLIC, cidr_mask=20),
+            ec2.SubnetConfiguration(name="Database", subnet_type=ec2.SubnetType.PRIVATE_ISOLATED, cidr_mask=20),
+            ec2.SubnetConfiguration(name="Private", subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS, cidr_mask=20)
+        ])
+        vpc = vpc_builder.build()
+        security_group_builder = SecurityGroupBuilder("RDSSecurityGroup", stack, vpc)
+        security_group_builder.security_group_name("RDS Security Group")
+        security_group_builder.description("RDS Security Group to control incoming and outgoing traffic")
+        security_group_builder.allow_all_outbound(True)
+        security_group_builder.ingress_rules([
+            IngressRule(peer=ec2.Peer.ipv4("10.0.0.0/20"),
+                        description="Allow all traffic from VPC CIDR",
+                        connection=ec2.Port.all_traffic())
+        ])
+        security_group = security_group_builder.build()
+        rds_cluster_builder = RdsClusterBuilder("RDS_Cluster", stack)
+        rds_cluster_builder.cluster_identifier("sample-cluster-name")
+        rds_cluster_builder.engine(rds.DatabaseClusterEngine.aurora_mysql(version=rds.AuroraMysqlEngineVersion.VER_3_01_0))
+        rds_cluster_builder.readers(3)
+        rds_cluster_builder.vpc(vpc)
+        rds_cluster_builder.credentials("root")
+        rds_cluster_builder.port(3306)
+        rds_cluster_builder.deletion_protection(False)
+        rds_cluster_builder.security_groups(security_group)
+        rds_cluster_builder.serverless_v2_min_capacity(2)
+        rds_cluster_builder.serverless_v2_max_capacity(10)
+
+        rds_cluster_builder.writer_instance(ClusterInstanceOptions(kind=ClusterInstanceKind.PROVISIONED,
+                                                                   instance_type=ec2.InstanceType("r6gd.xlarge")))
+        rds_cluster_builder.reader_instance(ClusterInstanceOptions(kind=ClusterInstanceKind.PROVISIONED,
+                                                                   instance_type=ec2.InstanceType("r6g.large")))
+
+        # Optimized Reads instances require Aurora MySQL 3.02.0 or later
+        with self.assertRaisesRegex(ValueError, "r6gd instances"):
+            rds_cluster_builder.build()
+
+    def test_rds_cluster_builder_with_default_serverless_instances_on_unsupported_version(self):
+        stack = Stack()
+        vpc = ec2.Vpc(stack, "VPC", subnet_configuration=[
+            ec2.SubnetConfiguration(name="Isolated", subnet_type=ec2.SubnetType.PRIVATE_ISOLATED)
+        ])
+        rds_cluster_builder = RdsClusterBuilder("RDS_Cluster", stack)
+        rds_cluster_builder.engine(rds.DatabaseClusterEngine.aurora_mysql(version=rds.AuroraMysqlEngineVersion.VER_3_01_0))
+        rds_cluster_builder.readers(1)
+        rds_cluster_builder.vpc(vpc)
+        rds_cluster_builder.security_groups(ec2.SecurityGroup(stack, "SecurityGroup", vpc=vpc))
+
+        # the writer and readers default to serverless v2, which requires Aurora MySQL 3.02.0 or later, the default
+        # instances synthesized before they were validated so they only warn
+        rds_cluster_builder.build()
+
+        Annotations.from_stack(stack).has_warning("*", Match.string_like_regexp("serverless instances are not supported"))
+
+    def test_rds_cluster_builder_with_serverless_instances_on_unsupported_version(self):
+        stack = Stack()
+        vpc = ec2.Vpc(stack, "VPC")
+        rds_cluster_builder = RdsClusterBuilder("RDS_Cluster", stack)
+        rds_cluster_builder.engine(rds.DatabaseClusterEngine.aurora_mysql(version=rds.AuroraMysqlEngineVersion.VER_3_01_0))
+        rds_cluster_builder.readers(1)
+        rds_cluster_builder.vpc(vpc)
+        rds_cluster_builder.reader_instance(ClusterInstanceOptions(kind=ClusterInstanceKind.SERVERLESS_V2))
+
+        with self.assertRaisesRegex(ValueError, "serverless instances"):
+            rds_cluster_builder.build()
+
+    def test_cluster_instances_on_aurora_mysql_2(self):
+        engine = rds.DatabaseClusterEngine.aurora_mysql(version=rds.AuroraMysqlEngineVersion.VER_2_11_2)
+
+        ClusterInstances.validate(engine, ClusterInstanceOptions(kind=ClusterInstanceKind.PROVISIONED,
+                                                                 instance_type=ec2.InstanceType("r5.large")))
+        ClusterInstances.validate(engine, ClusterInstanceOptions(kind=ClusterInstanceKind.PROVISIONED,
+                                                                 instance_type=ec2.InstanceType("r6g.large")))
+        with self.assertRaises(ValueError):
+            ClusterInstances.validate(engine, ClusterInstanceOptions())
+        with self.assertRaises(ValueError):
+            ClusterInstances.validate(engine, ClusterInstanceOptions(kind=ClusterInstanceKind.PROVISIONED,
+                                                                     instance_type=ec2.InstanceType("r7g.large")))
+
+
+    def test_rds_cluster_builder_with_io_optimized_storage(self):
+        stack = Stack()
+
+        vpc_builder = VpcBuilder("VPC_NAME", stack)
+        vpc_builder.ip_addresses("10.0.0.0/16")
+        vpc_builder.availability_zones(["us-east-1a", "us-east-1b", "us-east-1c"])
+        vpc_builder.subnet_configuration([
+            ec2.SubnetConfiguration(name="Public", subnet_type=ec2.SubnetType.PUBLIC, cidr_mask=20),
+            ec2.SubnetConfiguration(name="Database", subnet_type=ec2.SubnetType.PRIVATE_ISOLATED, cidr_mask=20),
+            ec2.SubnetConfiguration(name="Private", subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS, cidr_mask=20)
+        ])
+        vpc = vpc_builder.build()
+        security_group_builder = SecurityGroupBuilder("RDSSecurityGroup", stack, vpc)
+        security_group_builder.security_group_name("RDS Security Group")
+        security_group_builder.description("RDS Security Group to control incoming and outgoing traffic")
+        security_group_builder.allow_all_outbound(True)
+        security_group_builder.ingress_rules([
+            IngressRule(peer=ec2.Peer.ipv4("10.0.0.0/20"),
+                        description="Allow all traffic from VPC CIDR",
+                        connection=ec2.Port.all_traffic())
+        ])
+        security_group = security_group_builder.build()
+        rds_cluster_builder = RdsClusterBuilder("RDS_Cluster", stack)
+        rds_cluster_builder.cluster_identifier("sample-cluster-name")
+        rds_cluster_builder.engine(rds.DatabaseClusterEngine.aurora_mysql(version=rds.AuroraMysqlEngineVersion.VER_3_04_0))
+        rds_cluster_builder.readers(3)
+        rds_cluster_builder.vpc(vpc)
+        rds_cluster_builder.credentials("root")
+        rds_cluster_builder.port(3306)
+        rds_cluster_builder.deletion_protection(False)
+        rds_cluster_builder.security_groups(security_group)
+        rds_cluster_builder.serverless_v2_min_capacity(2)
+        rds_cluster_builder.serverless_v2_max_capacity(10)
+
+        rds_cluster_builder.storage_type(rds.DBClusterStorageType.AURORA_IOPT1)
+
+        rds_cluster = rds_cluster_builder.build()
+
+        self.assertIsNotNone(rds_cluster)
+
+        Template.from_stack(stack).has_resource_properties("AWS::RDS::DBCluster", {"StorageType": "aurora-iopt1"})
+
+    def test_rds_cluster_builder_with_global_database(self):
+        app = App()
+        stack = Stack(app, "PrimaryStack", env=Environment(account="111111111111", region="us-east-1"))
+
+        vpc_builder = VpcBuilder("VPC_NAME", stack)
+        vpc_builder.ip_addresses("10.0.0.0/16")
+        vpc_builder.availability_zones(["us-east-1a", "us-east-1b", "us-east-1c"])
+        vpc_builder.subnet_configuration([
+            ec2.SubnetConfiguration(name="Public", subnet_type=ec2.SubnetType.PUBLIC, cidr_mask=20),
+            ec2.SubnetConfiguration(name="Database", subnet_type=ec2.SubnetType.PRIVATE_ISOLATED, cidr_mask=20),
+            ec2.SubnetConfiguration(name="Private", subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS, cidr_mask=20)
+        ])
+        vpc = vpc_builder.build()
+        security_group_builder = SecurityGroupBuilder("RDSSecurityGroup", stack, vpc)
+        security_group_builder.security_group_name("RDS Security Group")
+        security_group_builder.description("RDS Security Group to control incoming and outgoing traffic")
+        security_group_builder.allow_all_outbound(True)
+        security_group_builder.ingress_rules([
+            IngressRule(peer=ec2.Peer.ipv4("10.0.0.0/20"),
+                        description="Allow all traffic from VPC CIDR",
+                        connection=ec2.Port.all_traffic())
+        ])
+        security_group = security_group_builder.build()
+        rds_cluster_builder = RdsClusterBuilder("RDS_Cluster", stack)
+        rds_cluster_builder.cluster_identifier("sample-cluster-name")
+        rds_cluster_builder.engine(rds.DatabaseClusterEngine.aurora_mysql(version=rds.AuroraMysqlEngineVersion.VER_3_04_0))
+        rds_cluster_builder.readers(3)
+        rds_cluster_builder.vpc(vpc)
+        rds_cluster_builder.credentials("root")
+        rds_cluster_builder.port(3306)
+        rds_cluster_builder.deletion_protection(False)
+        rds_cluster_builder.security_groups(security_group)
+        rds_cluster_builder.serverless_v2_min_capacity(2)
+        rds_cluster_builder.serverless_v2_max_capacity(10)
+
+        rds_cluster_builder.writer_instance(ClusterInstanceOptions(
+            kind=ClusterInstanceKind.PROVISIONED,
+            instance_type=ec2.InstanceType.of(ec2.InstanceClass.MEMORY6_GRAVITON, ec2.InstanceSize.LARGE)))
+        rds_cluster_builder.workload_profile(WorkloadProfile.OLTP)
+        rds_cluster_builder.enable_performance_insights(True)
+        rds_cluster_builder.monitoring_interval(Duration.seconds(60))
+
+        rds_cluster_builder.global_cluster("sample-global-cluster")
+        rds_cluster_builder.secondary_cluster(SecondaryClusterOptions(region="eu-west-1", readers=2,
+                                                                      write_forwarding=True))
+
+        rds_cluster = rds_cluster_builder.build()
+
+        self.assertIsNotNone(rds_cluster)
+
+        Template.from_stack(stack).has_resource_properties("AWS::RDS::GlobalCluster",
+                                                           {"GlobalClusterIdentifier": "sample-global-cluster"})
+        secondary_template = Template.from_stack(rds_cluster_builder.secondary_clusters[0].stack)
+        secondary_template.has_resource_properties("AWS::RDS::DBCluster", {
+            "GlobalClusterIdentifier": "sample-global-cluster",
+            "EnableGlobalWriteForwarding": True,
+            "MasterUsername": Match.absent()
+        })
+        secondary_template.resource_count_is("AWS::RDS::DBInstance", 3)
+        secondary_template.resource_count_is("AWS::RDS::DBParameterGroup", 1)
+        secondary_template.has_resource_properties("AWS::RDS::DBInstance", {
+            "DBInstanceClass": "db.r6g.large",
+            "DBParameterGroupName": {"Ref": Match.string_like_regexp("ParameterGroup")},
+            "EnablePerformanceInsights": True,
+            "MonitoringInterval": 60
+        })
+        secondary_template.resource_properties_count_is("AWS::RDS::DBInstance", {"DBInstanceClass": "db.serverless"},
+                                                        2)
+        self.assertEqual(list(rds_cluster_builder.regional_reader_endpoints), ["us-east-1", "eu-west-1"])
+
+    def test_rds_cluster_builder_with_global_database_of_another_instance_kind(self):
+        app = App()
+        stack = Stack(app, "PrimaryStack", env=Environment(account="111111111111", region="us-east-1"))
+        vpc = ec2.Vpc(stack, "VPC")
+
+        rds_cluster_builder = RdsClusterBuilder("RDS_Cluster", stack)
+        rds_cluster_builder.engine(rds.DatabaseClusterEngine.aurora_mysql(version=rds.AuroraMysqlEngineVersion.VER_3_04_0))
+        rds_cluster_builder.vpc(vpc)
+        rds_cluster_builder.credentials("root")
+        rds_cluster_builder.global_cluster("sample-global-cluster")
+        rds_cluster_builder.secondary_cluster(SecondaryClusterOptions(
+            region="eu-west-1",
+            writer_options=ClusterInstanceOptions(
+                kind=ClusterInstanceKind.PROVISIONED,
+                instance_type=ec2.InstanceType.of(ec2.InstanceClass.MEMORY6_GRAVITON, ec2.InstanceSize.LARGE))))
+
+        with self.assertRaisesRegex(ValueError, "Secondary cluster writer in eu-west-1 must be serverless-v2"):
+            rds_cluster_builder.build()
+
+    def test_rds_cluster_builder_with_capacity_window(self):
+        stack = Stack()
+
+        vpc_builder = VpcBuilder("VPC_NAME", stack)
+        vpc_builder.ip_addresses("10.0.0.0/16")
+        vpc_builder.availability_zones(["us-east-1a", "us-east-1b", "us-east-1c"])
+        vpc_builder.subnet_configuration([
+            ec2.SubnetConfiguration(name="Public", subnet_type=ec2.SubnetType.PUBLIC, cidr_mask=20),
+            ec2.SubnetConfiguration(name="Database", subnet_type=ec2.SubnetType.PRIVATE_ISOLATED, cidr_mask=20),
+            ec2.SubnetConfiguration(name="Private", subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS, cidr_mask=20)
+        ])
+        vpc = vpc_builder.build()
+        security_group_builder = SecurityGroupBuilder("RDSSecurityGroup", stack, vpc)
+        security_group_builder.security_group_name("RDS Security Group")
+        security_group_builder.description("RDS Security Group to control incoming and outgoing traffic")
+        security_group_builder.allow_all_outbound(True)
+        security_group_builder.ingress_rules([
+            IngressRule(peer=ec2.Peer.ipv4("10.0.0.0/20"),
+                        description="Allow all traffic from VPC CIDR",
+                        connection=ec2.Port.all_traffic())
+        ])
+        security_group = security_group_builder.build()
+        rds_cluster_builder = RdsClusterBuilder("RDS_Cluster", stack)
+        rds_cluster_builder.cluster_identifier("sample-cluster-name")
+        rds_cluster_builder.engine(rds.DatabaseClusterEngine.aurora_mysql(version=rds.AuroraMysqlEngineVersion.VER_3_04_0))
+        rds_cluster_builder.readers(3)
+        rds_cluster_builder.vpc(vpc)
+        rds_cluster_builder.credentials("root")
+        rds_cluster_builder.port(3306)
+        rds_cluster_builder.deletion_protection(False)
+        rds_cluster_builder.security_groups(security_group)
+        rds_cluster_builder.serverless_v2_min_capacity(2)
+        rds_cluster_builder.serverless_v2_max_capacity(10)
+
+        rds_cluster_builder.capacity_window(CapacityWindow(start=events.Schedule.cron(minute="30", hour="0"),
+                                                           end=events.Schedule.cron(minute="0", hour="6"),
+                                                           min_capacity=16,
+                                                           max_capacity=64))
+
+        rds_cluster = rds_cluster_builder.build()
+
+        self.assertIsNotNone(rds_cluster)
+
+        template = Template.from_stack(stack)
+        template.resource_count_is("AWS::Lambda::Function", 2)  # rotation and capacity scheduler
+        template.resource_count_is("AWS::Events::Rule", 2)
+        template.has_resource_properties("AWS::Events::Rule", {
+            "ScheduleExpression": "cron(30 0 * * ? *)",
+            "Targets": [Match.object_like({"Input": '{"min_capacity":16,"max_capacity":64}'})]
+        })
+
+
 if __name__ == '__main__':
     unittest.main()
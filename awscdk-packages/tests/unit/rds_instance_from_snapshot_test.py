@@ -1,8 +1,10 @@
 import unittest
 
 from aws_cdk import aws_ec2 as ec2, aws_rds as rds, Stack
+from aws_cdk.assertions import Match, Template
 
 from packages.databases.rds.rds_instance_from_snapshot_builder import RdsInstanceFromSnapshotBuilder
+from packages.databases.rds.rds_proxy import RdsProxyOptions
 from packages.network.security_group_builder import IngressRule, SecurityGroupBuilder
 from packages.network.vpc_builder import VpcBuilder
 
@@ -58,6 +60,71 @@ class RdsInstanceFromSnapshotTestCase(unittest.TestCase):
 
         self.assertIsNotNone(rds_instance)
 
+    def test_rds_instance_from_snapshot_builder_with_proxy(self):
+        stack = Stack()
+
+        vpc_builder = VpcBuilder("VPC_NAME", stack)
+        vpc_builder.ip_addresses("10.0.0.0/16")
+        vpc_builder.availability_zones(["us-east-1a", "us-east-1b", "us-east-1c"])
+        vpc_builder.subnet_configuration([
+            ec2.SubnetConfiguration(name="Public", subnet_type=ec2.SubnetType.PUBLIC, cidr_mask=20),
+            ec2.SubnetConfiguration(name="Database", subnet_type=ec2.SubnetType.PRIVATE_ISOLATED, cidr_mask=20),
+            ec2.SubnetConfiguration(name="Private", subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS, cidr_mask=20)
+        ])
+        vpc = vpc_builder.build()
+
+        security_group_builder = SecurityGroupBuilder("RDSSecurityGroup", stack, vpc)
+        security_group_builder.security_group_name("RDS Security Group")
+        security_group_builder.description("RDS Security Group to control incoming and outgoing traffic")
+        security_group_builder.allow_all_outbound(True)
+        security_group_builder.ingress_rules([
+            IngressRule(peer=ec2.Peer.ipv4("10.0.0.0/20"),
+                        description="Allow all traffic from VPC CIDR",
+                        connection=ec2.Port.all_traffic())
+        ])
+        security_group = security_group_builder.build()
+
+        rds_instance_from_snapshot_builder = RdsInstanceFromSnapshotBuilder("RDS_Instance", stack)
+        rds_instance_from_snapshot_builder.snapshot_identifier(
+            "sample-snapshot")  # The snapshot identifier is only relevant for initial creation and not for...
+        # ...subsequent modification however, do not change the value or remove this attribute after initial creation
+        rds_instance_from_snapshot_builder.engine(
+            rds.DatabaseInstanceEngine.mysql(version=rds.MysqlEngineVersion.VER_8_0_35))
+        # rds_instance_from_snapshot_builder.engine(rds.DatabaseInstanceEngine.postgres(version=rds.PostgresEngineVersion.VER_16_3))
+        rds_instance_from_snapshot_builder.vpc(vpc)
+        rds_instance_from_snapshot_builder.credentials(
+            "root")  # You can adjust username to match your snapshot's username however, a new password will be...
+        # ...created and put on rotation schedule
+        rds_instance_from_snapshot_builder.instance_type(
+            ec2.InstanceType.of(ec2.InstanceClass.BURSTABLE3, ec2.InstanceSize.MICRO))
+        rds_instance_from_snapshot_builder.port(3306)
+        rds_instance_from_snapshot_builder.multi_az(False)
+        rds_instance_from_snapshot_builder.auto_minor_version_upgrade(True)
+        rds_instance_from_snapshot_builder.allocated_storage(20)
+        rds_instance_from_snapshot_builder.deletion_protection(False)
+        rds_instance_from_snapshot_builder.publicly_accessible(False)
+        rds_instance_from_snapshot_builder.security_groups(security_group)
+
+        rds_instance_from_snapshot_builder.proxy(RdsProxyOptions())
+
+        rds_instance = rds_instance_from_snapshot_builder.build()
+
+        self.assertIsNotNone(rds_instance)
+
+        self.assertIsNotNone(rds_instance_from_snapshot_builder.db_proxy.proxy)
+
+        template = Template.from_stack(stack)
+        template.has_resource_properties("AWS::RDS::DBProxy", {
+            "EngineFamily": "MYSQL",
+            "IdleClientTimeout": 1800,
+            "RequireTLS": True,
+            "Auth": [Match.object_like({"AuthScheme": "SECRETS", "IAMAuth": "DISABLED"})]
+        })
+        template.has_resource_properties("AWS::RDS::DBProxyTargetGroup", {
+            "ConnectionPoolConfigurationInfo": {"ConnectionBorrowTimeout": 30, "MaxConnectionsPercent": 90},
+            "DBInstanceIdentifiers": [{"Ref": stack.get_logical_id(rds_instance.node.default_child)}]
+        })
+
 
 if __name__ == '__main__':
     unittest.main()
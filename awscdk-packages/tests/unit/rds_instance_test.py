@@ -1,8 +1,12 @@
 import unittest
 
-from aws_cdk import aws_ec2 as ec2, aws_rds as rds, Stack
+from aws_cdk import aws_ec2 as ec2, aws_kms as kms, aws_rds as rds, App, Environment, Stack, Duration, RemovalPolicy
+from aws_cdk.assertions import Template, Match
 
+from packages.databases.rds.parameter_group_profiles import WorkloadProfile
 from packages.databases.rds.rds_instance_builder import RdsInstanceBuilder
+from packages.databases.rds.rds_proxy import RdsProxyOptions
+from packages.databases.rds.read_replicas import ReadReplicaOptions
 from packages.network.security_group_builder import IngressRule, SecurityGroupBuilder
 from packages.network.vpc_builder import VpcBuilder
 
@@ -51,6 +55,416 @@ class RdsInstanceTestCase(unittest.TestCase):
 
         self.assertIsNotNone(rds_instance)
 
+    def test_rds_instance_builder_with_proxy(self):
+        stack = Stack()
+
+        vpc_builder = VpcBuilder("VPC_NAME", stack)
+        vpc_builder.ip_addresses("10.0.0.0/16")
+        vpc_builder.availability_zones(["us-east-1a", "us-east-1b", "us-east-1c"])
+        vpc_builder.subnet_configuration([
+            ec2.SubnetConfiguration(name="Public", subnet_type=ec2.SubnetType.PUBLIC, cidr_mask=20),
+            ec2.SubnetConfiguration(name="Database", subnet_type=ec2.SubnetType.PRIVATE_ISOLATED, cidr_mask=20),
+            ec2.SubnetConfiguration(name="Private", subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS, cidr_mask=20)
+        ])
+        vpc = vpc_builder.build()
+
+        security_group_builder = SecurityGroupBuilder("RDSSecurityGroup", stack, vpc)
+        security_group_builder.security_group_name("RDS Security Group")
+        security_group_builder.description("RDS Security Group to control incoming and outgoing traffic")
+        security_group_builder.allow_all_outbound(True)
+        security_group_builder.ingress_rules([
+            IngressRule(peer=ec2.Peer.ipv4("10.0.0.0/20"),
+                        description="Allow all traffic from VPC CIDR",
+                        connection=ec2.Port.all_traffic())
+        ])
+        security_group = security_group_builder.build()
+
+        rds_instance_builder = RdsInstanceBuilder("RDS_Instance", stack)
+        rds_instance_builder.engine(rds.DatabaseInstanceEngine.mysql(version=rds.MysqlEngineVersion.VER_8_0_35))
+        # rds_instance_builder.engine(rds.DatabaseInstanceEngine.postgres(version=rds.PostgresEngineVersion.VER_16_3))
+        rds_instance_builder.vpc(vpc)
+        rds_instance_builder.credentials("root")
+        rds_instance_builder.instance_type(ec2.InstanceType.of(ec2.InstanceClass.BURSTABLE3, ec2.InstanceSize.MICRO))
+        rds_instance_builder.port(3306)
+        rds_instance_builder.multi_az(False)
+        rds_instance_builder.auto_minor_version_upgrade(True)
+        rds_instance_builder.allocated_storage(20)
+        rds_instance_builder.deletion_protection(False)
+        rds_instance_builder.publicly_accessible(False)
+        rds_instance_builder.security_groups(security_group)
+
+        rds_instance_builder.proxy(RdsProxyOptions(idle_client_timeout=Duration.minutes(5), borrow_timeout=Duration.seconds(10)))
+
+        rds_instance = rds_instance_builder.build()
+
+        self.assertIsNotNone(rds_instance)
+
+        self.assertIsNotNone(rds_instance_builder.db_proxy.proxy)
+
+        template = Template.from_stack(stack)
+        template.has_resource_properties("AWS::RDS::DBProxy", {"IdleClientTimeout": 300, "RequireTLS": True})
+        template.has_resource_properties("AWS::RDS::DBProxyTargetGroup", {
+            "ConnectionPoolConfigurationInfo": {"ConnectionBorrowTimeout": 10, "MaxConnectionsPercent": 90},
+            "DBInstanceIdentifiers": [{"Ref": stack.get_logical_id(rds_instance.node.default_child)}]
+        })
+        proxy_security_group = rds_instance_builder.db_proxy.proxy.connections.security_groups[0]
+        template.has_resource_properties("AWS::EC2::SecurityGroupIngress", {
+            "SourceSecurityGroupId": {"Fn::GetAtt": [stack.get_logical_id(proxy_security_group.node.default_child),
+                                                     "GroupId"]}
+        })
+
+    def test_rds_instance_builder_with_performance_insights(self):
+        stack = Stack()
+
+        vpc_builder = VpcBuilder("VPC_NAME", stack)
+        vpc_builder.ip_addresses("10.0.0.0/16")
+        vpc_builder.availability_zones(["us-east-1a", "us-east-1b", "us-east-1c"])
+        vpc_builder.subnet_configuration([
+            ec2.SubnetConfiguration(name="Public", subnet_type=ec2.SubnetType.PUBLIC, cidr_mask=20),
+            ec2.SubnetConfiguration(name="Database", subnet_type=ec2.SubnetType.PRIVATE_ISOLATED, cidr_mask=20),
+            ec2.SubnetConfiguration(name="Private", subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS, cidr_mask=20)
+        ])
+        vpc = vpc_builder.build()
+
+        security_group_builder = SecurityGroupBuilder("RDSSecurityGroup", stack, vpc)
+        security_group_builder.security_group_name("RDS Security Group")
+        security_group_builder.description("RDS Security Group to control incoming and outgoing traffic")
+        security_group_builder.allow_all_outbound(True)
+        security_group_builder.ingress_rules([
+            IngressRule(peer=ec2.Peer.ipv4("10.0.0.0/20"),
+                        description="Allow all traffic from VPC CIDR",
+                        connection=ec2.Port.all_traffic())
+        ])
+        security_group = security_group_builder.build()
+
+        rds_instance_builder = RdsInstanceBuilder("RDS_Instance", stack)
+        rds_instance_builder.engine(rds.DatabaseInstanceEngine.mysql(version=rds.MysqlEngineVersion.VER_8_0_35))
+        # rds_instance_builder.engine(rds.DatabaseInstanceEngine.postgres(version=rds.PostgresEngineVersion.VER_16_3))
+        rds_instance_builder.vpc(vpc)
+        rds_instance_builder.credentials("root")
+        rds_instance_builder.instance_type(ec2.InstanceType.of(ec2.InstanceClass.BURSTABLE3, ec2.InstanceSize.MICRO))
+        rds_instance_builder.port(3306)
+        rds_instance_builder.multi_az(False)
+        rds_instance_builder.auto_minor_version_upgrade(True)
+        rds_instance_builder.allocated_storage(20)
+        rds_instance_builder.deletion_protection(False)
+        rds_instance_builder.publicly_accessible(False)
+        rds_instance_builder.security_groups(security_group)
+
+        rds_instance_builder.enable_performance_insights(True)
+
+        rds_instance_builder.performance_insight_retention(rds.PerformanceInsightRetention.DEFAULT)
+
+        rds_instance_builder.monitoring_interval(Duration.seconds(60))
+
+        rds_instance = rds_instance_builder.build()
+
+        self.assertIsNotNone(rds_instance)
+
+    def test_rds_instance_builder_with_workload_profile(self):
+        stack = Stack()
+
+        vpc_builder = VpcBuilder("VPC_NAME", stack)
+        vpc_builder.ip_addresses("10.0.0.0/16")
+        vpc_builder.availability_zones(["us-east-1a", "us-east-1b", "us-east-1c"])
+        vpc_builder.subnet_configuration([
+            ec2.SubnetConfiguration(name="Public", subnet_type=ec2.SubnetType.PUBLIC, cidr_mask=20),
+            ec2.SubnetConfiguration(name="Database", subnet_type=ec2.SubnetType.PRIVATE_ISOLATED, cidr_mask=20),
+            ec2.SubnetConfiguration(name="Private", subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS, cidr_mask=20)
+        ])
+        vpc = vpc_builder.build()
+
+        security_group_builder = SecurityGroupBuilder("RDSSecurityGroup", stack, vpc)
+        security_group_builder.security_group_name("RDS Security Group")
+        security_group_builder.description("RDS Security Group to control incoming and outgoing traffic")
+        security_group_builder.allow_all_outbound(True)
+        security_group_builder.ingress_rules([
+            IngressRule(peer=ec2.Peer.ipv4("10.0.0.0/20"),
+                        description="Allow all traffic from VPC CIDR",
+                        connection=ec2.Port.all_traffic())
+        ])
+        security_group = security_group_builder.build()
+
+        rds_instance_builder = RdsInstanceBuilder("RDS_Instance", stack)
+        rds_instance_builder.engine(rds.DatabaseInstanceEngine.mysql(version=rds.MysqlEngineVersion.VER_8_0_35))
+        # rds_instance_builder.engine(rds.DatabaseInstanceEngine.postgres(version=rds.PostgresEngineVersion.VER_16_3))
+        rds_instance_builder.vpc(vpc)
+        rds_instance_builder.credentials("root")
+        rds_instance_builder.instance_type(ec2.InstanceType.of(ec2.InstanceClass.BURSTABLE3, ec2.InstanceSize.MICRO))
+        rds_instance_builder.port(3306)
+        rds_instance_builder.multi_az(False)
+        rds_instance_builder.auto_minor_version_upgrade(True)
+        rds_instance_builder.allocated_storage(20)
+        rds_instance_builder.deletion_protection(False)
+        rds_instance_builder.publicly_accessible(False)
+        rds_instance_builder.security_groups(security_group)
+
+        rds_instance_builder.workload_profile(WorkloadProfile.READ_HEAVY, {"wait_timeout": "120"})
+
+        rds_instance = rds_instance_builder.build()
+
+        self.assertIsNotNone(rds_instance)
+
+        parameter_group = Template.from_stack(stack).find_resources("AWS::RDS::DBParameterGroup")
+        parameters = list(parameter_group.values())[0]["Properties"]["Parameters"]
+        self.assertEqual(parameters["innodb_buffer_pool_size"], "{DBInstanceClassMemory*4/5}")
+        self.assertEqual(parameters["wait_timeout"], "120")
+
+    def test_rds_instance_builder_with_gp3_storage(self):
+        stack = Stack()
+
+        vpc_builder = VpcBuilder("VPC_NAME", stack)
+        vpc_builder.ip_addresses("10.0.0.0/16")
+        vpc_builder.availability_zones(["us-east-1a", "us-east-1b", "us-east-1c"])
+        vpc_builder.subnet_configuration([
+            ec2.SubnetConfiguration(name="Public", subnet_type=ec2.SubnetType.PUBLIC, cidr_mask=20),
+            ec2.SubnetConfiguration(name="Database", subnet_type=ec2.SubnetType.PRIVATE_ISOLATED, cidr_mask=20),
+            ec2.SubnetConfiguration(name="Private", subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS, cidr_mask=20)
+        ])
+        vpc = vpc_builder.build()
+
+        security_group_builder = SecurityGroupBuilder("RDSSecurityGroup", stack, vpc)
+        security_group_builder.security_group_name("RDS Security Group")
+        security_group_builder.description("RDS Security Group to control incoming and outgoing traffic")
+        security_group_builder.allow_all_outbound(True)
+        security_group_builder.ingress_rules([
+            IngressRule(peer=ec2.Peer.ipv4("10.0.0.0/20"),
+                        description="Allow all traffic from VPC CIDR",
+                        connection=ec2.Port.all_traffic())
+        ])
+        security_group = security_group_builder.build()
+
+        rds_instance_builder = RdsInstanceBuilder("RDS_Instance", stack)
+        rds_instance_builder.engine(rds.DatabaseInstanceEngine.mysql(version=rds.MysqlEngineVersion.VER_8_0_35))
+        # rds_instance_builder.engine(rds.DatabaseInstanceEngine.postgres(version=rds.PostgresEngineVersion.VER_16_3))
+        rds_instance_builder.vpc(vpc)
+        rds_instance_builder.credentials("root")
+        rds_instance_builder.instance_type(ec2.InstanceType.of(ec2.InstanceClass.BURSTABLE3, ec2.InstanceSize.MICRO))
+        rds_instance_builder.port(3306)
+        rds_instance_builder.multi_az(False)
+        rds_instance_builder.auto_minor_version_upgrade(True)
+        rds_instance_builder.allocated_storage(20)
+        rds_instance_builder.deletion_protection(False)
+        rds_instance_builder.publicly_accessible(False)
+        rds_instance_builder.security_groups(security_group)
+
+        rds_instance_builder.allocated_storage(500)
+
+        rds_instance_builder.max_allocated_storage(1000)
+
+        rds_instance_builder.storage_type(rds.StorageType.GP3)
+
+        rds_instance_builder.iops(12000)
+
+        rds_instance_builder.storage_throughput(500)
+
+        rds_instance = rds_instance_builder.build()
+
+        self.assertIsNotNone(rds_instance)
+
+        Template.from_stack(stack).has_resource_properties("AWS::RDS::DBInstance", {"StorageType": "gp3",
+                                                                                    "Iops": 12000,
+                                                                                    "StorageThroughput": 500,
+                                                                                    "MaxAllocatedStorage": 1000})
+
+    def test_rds_instance_builder_with_gp3_baseline_storage(self):
+        stack = Stack()
+
+        vpc_builder = VpcBuilder("VPC_NAME", stack)
+        vpc_builder.ip_addresses("10.0.0.0/16")
+        vpc_builder.availability_zones(["us-east-1a", "us-east-1b", "us-east-1c"])
+        vpc_builder.subnet_configuration([
+            ec2.SubnetConfiguration(name="Public", subnet_type=ec2.SubnetType.PUBLIC, cidr_mask=20),
+            ec2.SubnetConfiguration(name="Database", subnet_type=ec2.SubnetType.PRIVATE_ISOLATED, cidr_mask=20),
+            ec2.SubnetConfiguration(name="Private", subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS, cidr_mask=20)
+        ])
+        vpc = vpc_builder.build()
+
+        security_group_builder = SecurityGroupBuilder("RDSSecurityGroup", stack, vpc)
+        security_group_builder.security_group_name("RDS Security Group")
+        security_group_builder.description("RDS Security Group to control incoming and outgoing traffic")
+        security_group_builder.allow_all_outbound(True)
+        security_group_builder.ingress_rules([
+            IngressRule(peer=ec2.Peer.ipv4("10.0.0.0/20"),
+                        description="Allow all traffic from VPC CIDR",
+                        connection=ec2.Port.all_traffic())
+        ])
+        security_group = security_group_builder.build()
+
+        rds_instance_builder = RdsInstanceBuilder("RDS_Instance", stack)
+        rds_instance_builder.engine(rds.DatabaseInstanceEngine.mysql(version=rds.MysqlEngineVersion.VER_8_0_35))
+        # rds_instance_builder.engine(rds.DatabaseInstanceEngine.postgres(version=rds.PostgresEngineVersion.VER_16_3))
+        rds_instance_builder.vpc(vpc)
+        rds_instance_builder.credentials("root")
+        rds_instance_builder.instance_type(ec2.InstanceType.of(ec2.InstanceClass.BURSTABLE3, ec2.InstanceSize.MICRO))
+        rds_instance_builder.port(3306)
+        rds_instance_builder.multi_az(False)
+        rds_instance_builder.auto_minor_version_upgrade(True)
+        rds_instance_builder.allocated_storage(20)
+        rds_instance_builder.deletion_protection(False)
+        rds_instance_builder.publicly_accessible(False)
+        rds_instance_builder.security_groups(security_group)
+
+        rds_instance_builder.storage_type(rds.StorageType.GP3)
+
+        rds_instance_builder.iops(12000)
+
+        # 20 GiB of gp3 storage is limited to the 3000 IOPS baseline
+        with self.assertRaises(ValueError):
+            rds_instance_builder.build()
+
+    def test_rds_instance_builder_with_read_replicas(self):
+        stack = Stack()
+
+        vpc_builder = VpcBuilder("VPC_NAME", stack)
+        vpc_builder.ip_addresses("10.0.0.0/16")
+        vpc_builder.availability_zones(["us-east-1a", "us-east-1b", "us-east-1c"])
+        vpc_builder.subnet_configuration([
+            ec2.SubnetConfiguration(name="Public", subnet_type=ec2.SubnetType.PUBLIC, cidr_mask=20),
+            ec2.SubnetConfiguration(name="Database", subnet_type=ec2.SubnetType.PRIVATE_ISOLATED, cidr_mask=20),
+            ec2.SubnetConfiguration(name="Private", subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS, cidr_mask=20)
+        ])
+        vpc = vpc_builder.build()
+
+        security_group_builder = SecurityGroupBuilder("RDSSecurityGroup", stack, vpc)
+        security_group_builder.security_group_name("RDS Security Group")
+        security_group_builder.description("RDS Security Group to control incoming and outgoing traffic")
+        security_group_builder.allow_all_outbound(True)
+        security_group_builder.ingress_rules([
+            IngressRule(peer=ec2.Peer.ipv4("10.0.0.0/20"),
+                        description="Allow all traffic from VPC CIDR",
+                        connection=ec2.Port.all_traffic())
+        ])
+        security_group = security_group_builder.build()
+
+        rds_instance_builder = RdsInstanceBuilder("RDS_Instance", stack)
+        rds_instance_builder.engine(rds.DatabaseInstanceEngine.mysql(version=rds.MysqlEngineVersion.VER_8_0_35))
+        # rds_instance_builder.engine(rds.DatabaseInstanceEngine.postgres(version=rds.PostgresEngineVersion.VER_16_3))
+        rds_instance_builder.vpc(vpc)
+        rds_instance_builder.credentials("root")
+        rds_instance_builder.instance_type(ec2.InstanceType.of(ec2.InstanceClass.BURSTABLE3, ec2.InstanceSize.MICRO))
+        rds_instance_builder.port(3306)
+        rds_instance_builder.multi_az(False)
+        rds_instance_builder.auto_minor_version_upgrade(True)
+        rds_instance_builder.allocated_storage(20)
+        rds_instance_builder.deletion_protection(False)
+        rds_instance_builder.publicly_accessible(False)
+        rds_instance_builder.security_groups(security_group)
+
+        rds_instance_builder.removal_policy(RemovalPolicy.RETAIN)
+        rds_instance_builder.workload_profile(WorkloadProfile.READ_HEAVY)
+        rds_instance_builder.enable_performance_insights(True)
+        rds_instance_builder.performance_insight_encryption_key(kms.Key(stack, "PerformanceInsightsKey"))
+
+        rds_instance_builder.read_replicas(ReadReplicaOptions(count=2, availability_zones=["us-east-1a", "us-east-1b"]))
+
+        rds_instance = rds_instance_builder.build()
+
+        self.assertIsNotNone(rds_instance)
+
+        self.assertEqual(len(rds_instance_builder.read_replica_endpoints), 2)
+
+        template = Template.from_stack(stack)
+        template.resource_count_is("AWS::RDS::DBParameterGroup", 1)
+        parameter_group_id = list(template.find_resources("AWS::RDS::DBParameterGroup"))[0]
+        performance_insights_key_id = list(template.find_resources("AWS::KMS::Key", {
+            "Properties": {"Description": Match.absent()}}))[0]
+        template.has_resource("AWS::RDS::DBInstance", {
+            "Properties": Match.object_like({
+                "AvailabilityZone": "us-east-1b",
+                "SourceDBInstanceIdentifier": Match.any_value(),
+                "DBParameterGroupName": {"Ref": parameter_group_id},
+                "EnablePerformanceInsights": True,
+                "PerformanceInsightsKMSKeyId": {"Fn::GetAtt": [performance_insights_key_id, "Arn"]}
+            }),
+            "DeletionPolicy": "Retain",
+            "UpdateReplacePolicy": "Retain"
+        })
+
+    def test_rds_instance_builder_with_read_replica_of_default_instance_type(self):
+        stack = Stack()
+        vpc = ec2.Vpc(stack, "VPC", subnet_configuration=[
+            ec2.SubnetConfiguration(name="Database", subnet_type=ec2.SubnetType.PRIVATE_ISOLATED, cidr_mask=20)
+        ])
+
+        rds_instance_builder = RdsInstanceBuilder("RDS_Instance", stack)
+        rds_instance_builder.engine(rds.DatabaseInstanceEngine.mysql(version=rds.MysqlEngineVersion.VER_8_0_35))
+        rds_instance_builder.vpc(vpc)
+        rds_instance_builder.credentials("root")
+        rds_instance_builder.security_groups(ec2.SecurityGroup(stack, "RDSSecurityGroup", vpc=vpc))
+        rds_instance_builder.read_replicas(ReadReplicaOptions())
+
+        rds_instance_builder.build()
+
+        # the replica takes the instance type CDK gives to the source
+        Template.from_stack(stack).resource_properties_count_is("AWS::RDS::DBInstance",
+                                                                {"DBInstanceClass": "db.m5.large"}, 2)
+
+    def test_rds_instance_builder_with_cross_region_read_replica(self):
+        app = App()
+        stack = Stack(app, "PrimaryStack", env=Environment(account="111111111111", region="us-east-1"),
+                      cross_region_references=True)
+        replica_stack = Stack(app, "ReplicaStack", env=Environment(account="111111111111", region="us-west-2"),
+                              cross_region_references=True)
+        replica_vpc = ec2.Vpc(replica_stack, "ReplicaVPC", subnet_configuration=[
+            ec2.SubnetConfiguration(name="Database", subnet_type=ec2.SubnetType.PRIVATE_ISOLATED, cidr_mask=20)
+        ])
+
+        vpc_builder = VpcBuilder("VPC_NAME", stack)
+        vpc_builder.ip_addresses("10.0.0.0/16")
+        vpc_builder.availability_zones(["us-east-1a", "us-east-1b", "us-east-1c"])
+        vpc_builder.subnet_configuration([
+            ec2.SubnetConfiguration(name="Public", subnet_type=ec2.SubnetType.PUBLIC, cidr_mask=20),
+            ec2.SubnetConfiguration(name="Database", subnet_type=ec2.SubnetType.PRIVATE_ISOLATED, cidr_mask=20),
+            ec2.SubnetConfiguration(name="Private", subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS, cidr_mask=20)
+        ])
+        vpc = vpc_builder.build()
+
+        security_group_builder = SecurityGroupBuilder("RDSSecurityGroup", stack, vpc)
+        security_group_builder.security_group_name("RDS Security Group")
+        security_group_builder.description("RDS Security Group to control incoming and outgoing traffic")
+        security_group_builder.allow_all_outbound(True)
+        security_group_builder.ingress_rules([
+            IngressRule(peer=ec2.Peer.ipv4("10.0.0.0/20"),
+                        description="Allow all traffic from VPC CIDR",
+                        connection=ec2.Port.all_traffic())
+        ])
+        security_group = security_group_builder.build()
+
+        rds_instance_builder = RdsInstanceBuilder("RDS_Instance", stack)
+        rds_instance_builder.engine(rds.DatabaseInstanceEngine.mysql(version=rds.MysqlEngineVersion.VER_8_0_35))
+        # rds_instance_builder.engine(rds.DatabaseInstanceEngine.postgres(version=rds.PostgresEngineVersion.VER_16_3))
+        rds_instance_builder.vpc(vpc)
+        rds_instance_builder.credentials("root")
+        rds_instance_builder.instance_type(ec2.InstanceType.of(ec2.InstanceClass.BURSTABLE3, ec2.InstanceSize.MICRO))
+        rds_instance_builder.port(3306)
+        rds_instance_builder.multi_az(False)
+        rds_instance_builder.auto_minor_version_upgrade(True)
+        rds_instance_builder.allocated_storage(20)
+        rds_instance_builder.deletion_protection(False)
+        rds_instance_builder.publicly_accessible(False)
+        rds_instance_builder.security_groups(security_group)
+
+        rds_instance_builder.workload_profile(WorkloadProfile.READ_HEAVY)
+
+        replica_parameter_group = rds.ParameterGroup(replica_stack, "ReplicaParameterGroup",
+                                                     engine=rds.DatabaseInstanceEngine.mysql(
+                                                         version=rds.MysqlEngineVersion.VER_8_0_35))
+        rds_instance_builder.read_replicas(ReadReplicaOptions(stack=replica_stack,
+                                                              vpc=replica_vpc,
+                                                              storage_encryption_key=kms.Key(replica_stack, "Key"),
+                                                              parameter_group=replica_parameter_group))
+
+        rds_instance = rds_instance_builder.build()
+
+        self.assertIsNotNone(rds_instance)
+
+        template = Template.from_stack(replica_stack)
+        template.resource_count_is("AWS::RDS::DBInstance", 1)
+        template.has_resource_properties("AWS::RDS::DBInstance", {
+            "DBParameterGroupName": {"Ref": replica_stack.get_logical_id(replica_parameter_group.node.default_child)}
+        })
+
 
 if __name__ == '__main__':
     unittest.main()
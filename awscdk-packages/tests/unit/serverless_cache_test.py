@@ -0,0 +1,60 @@
+import unittest
+
+from aws_cdk import aws_ec2 as ec2, Stack
+from aws_cdk.assertions import Template
+
+from packages.elasticache.serverless_cache_builder import ServerlessCacheBuilder, ServerlessEngine
+from packages.network.vpc_builder import VpcBuilder
+
+
+class ServerlessCacheTestCase(unittest.TestCase):
+
+    def test_serverless_cache_builder(self):
+        stack = Stack()
+
+        vpc_builder = VpcBuilder("VPC_NAME", stack)
+        vpc_builder.ip_addresses("10.0.0.0/16")
+        vpc_builder.availability_zones(["us-east-1a", "us-east-1b", "us-east-1c"])
+        vpc_builder.subnet_configuration([
+            ec2.SubnetConfiguration(name="Public", subnet_type=ec2.SubnetType.PUBLIC, cidr_mask=20),
+            ec2.SubnetConfiguration(name="Private", subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS, cidr_mask=20)
+        ])
+        vpc = vpc_builder.build()
+
+        serverless_cache_builder = ServerlessCacheBuilder("ServerlessCache", stack)
+        serverless_cache_builder.serverless_cache_name("test-cache")
+        serverless_cache_builder.engine(ServerlessEngine.VALKEY)
+        serverless_cache_builder.major_engine_version("8")
+        serverless_cache_builder.data_storage(minimum_gb=1, maximum_gb=100)
+        serverless_cache_builder.ecpu_per_second(minimum=5000, maximum=100000)
+        serverless_cache_builder.vpc(vpc)
+        serverless_cache_builder.snapshot_retention_limit(7)
+        serverless_cache_builder.daily_snapshot_time("04:00")
+        serverless_cache = serverless_cache_builder.build()
+
+        self.assertIsNotNone(serverless_cache)
+
+        template = Template.from_stack(stack)
+        template.has_resource_properties("AWS::ElastiCache::ServerlessCache", {
+            "Engine": "valkey",
+            "CacheUsageLimits": {
+                "DataStorage": {"Unit": "GB", "Minimum": 1, "Maximum": 100},
+                "ECPUPerSecond": {"Minimum": 5000, "Maximum": 100000}
+            },
+            "SnapshotRetentionLimit": 7,
+            "DailySnapshotTime": "04:00"
+        })
+
+    def test_serverless_cache_builder_memcached_without_snapshots(self):
+        stack = Stack()
+        serverless_cache_builder = ServerlessCacheBuilder("ServerlessCache", stack)
+        serverless_cache_builder.serverless_cache_name("test-cache")
+        serverless_cache_builder.engine(ServerlessEngine.MEMCACHED)
+        serverless_cache_builder.snapshot_retention_limit(7)
+
+        with self.assertRaises(ValueError):
+            serverless_cache_builder.build()
+
+
+if __name__ == '__main__':
+    unittest.main()
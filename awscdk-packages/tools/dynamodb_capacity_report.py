@@ -0,0 +1,175 @@
+"""
+Size, capacity and throttling report of every DynamoDB table of a region
+
+    python -m tools.dynamodb_capacity_report --region us-east-1 --hours 24 --format csv --output report.csv
+
+Operations tool, not part of the packaged CDK constructs, it requires boto3 from requirements-dev.txt
+"""
+import argparse
+import csv
+import json
+import logging
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Sequence, TextIO
+
+import boto3
+from botocore.config import Config
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 16
+MAX_METRIC_DATA_QUERIES = 500
+CAPACITY_METRICS = {
+    "ConsumedReadCapacityUnits": "consumed_read_capacity_units",
+    "ConsumedWriteCapacityUnits": "consumed_write_capacity_units",
+    "ReadThrottleEvents": "read_throttle_events",
+    "WriteThrottleEvents": "write_throttle_events"
+}
+REPORT_FORMATS = ["csv", "json"]
+
+
+@dataclass
+class TableCapacity:
+    table_name: str
+    billing_mode: str
+    table_size_bytes: int
+    item_count: int
+    provisioned_read_capacity_units: int  # 0 for on-demand tables
+    provisioned_write_capacity_units: int
+    consumed_read_capacity_units: float = 0.0  # average per second over the report period
+    consumed_write_capacity_units: float = 0.0
+    read_throttle_events: float = 0.0  # total over the report period
+    write_throttle_events: float = 0.0
+
+
+def client_config(max_workers: int = DEFAULT_MAX_WORKERS) -> Config:
+    """
+    Adaptive retries back off client side when DynamoDB or CloudWatch throttle the report, and the connection pool
+    matches the number of threads sharing the client
+    """
+    return Config(retries={"mode": "adaptive", "max_attempts": 10}, max_pool_connections=max_workers)
+
+
+def list_table_names(dynamodb) -> list[str]:
+    paginator = dynamodb.get_paginator("list_tables")
+    return [table_name for page in paginator.paginate() for table_name in page["TableNames"]]
+
+
+def describe_table(dynamodb, table_name: str) -> Optional[TableCapacity]:
+    """
+    None when the table was deleted after it was listed
+    """
+    try:
+        table = dynamodb.describe_table(TableName=table_name)["Table"]
+    except dynamodb.exceptions.ResourceNotFoundException:
+        logger.warning("Skipping table %s, it no longer exists", table_name)
+        return None
+    throughput = table.get("ProvisionedThroughput", {})
+    return TableCapacity(table_name=table_name,
+                         billing_mode=table.get("BillingModeSummary", {}).get("BillingMode", "PROVISIONED"),
+                         table_size_bytes=table.get("TableSizeBytes", 0),
+                         item_count=table.get("ItemCount", 0),
+                         provisioned_read_capacity_units=throughput.get("ReadCapacityUnits", 0),
+                         provisioned_write_capacity_units=throughput.get("WriteCapacityUnits", 0))
+
+
+def describe_tables(dynamodb, table_names: Sequence[str],
+                    max_workers: int = DEFAULT_MAX_WORKERS) -> list[TableCapacity]:
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        tables = executor.map(lambda table_name: describe_table(dynamodb, table_name), table_names)
+        return [table for table in tables if table is not None]
+
+
+def add_metrics(cloudwatch, tables: Sequence[TableCapacity], start_time: datetime, end_time: datetime):
+    """
+    Consumed capacity and throttle events of the tables, fetched with as few GetMetricData calls as possible
+    """
+    period = int((end_time - start_time).total_seconds()) // 60 * 60
+    queries = [(table, attribute, {
+        "Id": f"m{table_idx}_{metric_idx}",
+        "MetricStat": {
+            "Metric": {"Namespace": "AWS/DynamoDB", "MetricName": metric_name,
+                       "Dimensions": [{"Name": "TableName", "Value": table.table_name}]},
+            "Period": period,
+            "Stat": "Sum"
+        },
+        "ReturnData": True
+    }) for table_idx, table in enumerate(tables) for metric_idx, (metric_name, attribute) in
+        enumerate(CAPACITY_METRICS.items())]
+
+    paginator = cloudwatch.get_paginator("get_metric_data")
+    for batch_start in range(0, len(queries), MAX_METRIC_DATA_QUERIES):
+        batch = queries[batch_start:batch_start + MAX_METRIC_DATA_QUERIES]
+        query_targets = {query["Id"]: (table, attribute) for table, attribute, query in batch}
+        for page in paginator.paginate(MetricDataQueries=[query for _, _, query in batch],
+                                       StartTime=start_time, EndTime=end_time):
+            for result in page["MetricDataResults"]:
+                table, attribute = query_targets[result["Id"]]
+                setattr(table, attribute, getattr(table, attribute) + sum(result["Values"]))
+
+    for table in tables:
+        table.consumed_read_capacity_units /= period
+        table.consumed_write_capacity_units /= period
+
+
+def capacity_report(region: str, hours: int = 24, max_workers: int = DEFAULT_MAX_WORKERS,
+                    endpoint_url: Optional[str] = None,
+                    cloudwatch_endpoint_url: Optional[str] = None) -> list[TableCapacity]:
+    """
+    CloudWatch is reached through the DynamoDB endpoint when it has no endpoint of its own, e.g. a moto server
+    """
+    if hours < 1:
+        raise ValueError("The report period must be at least one hour")
+    session = boto3.session.Session(region_name=region)
+    dynamodb = session.client("dynamodb", config=client_config(max_workers), endpoint_url=endpoint_url)
+    cloudwatch = session.client("cloudwatch", config=client_config(max_workers),
+                                endpoint_url=cloudwatch_endpoint_url or endpoint_url)
+
+    tables = describe_tables(dynamodb, list_table_names(dynamodb), max_workers)
+    end_time = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+    add_metrics(cloudwatch, tables, end_time - timedelta(hours=hours), end_time)
+    return tables
+
+
+def write_report(tables: Sequence[TableCapacity], output: TextIO, report_format: str = "csv"):
+    if report_format == "json":
+        json.dump([asdict(table) for table in tables], output, indent=2)
+        return
+    writer = csv.DictWriter(output, fieldnames=[field.name for field in fields(TableCapacity)])
+    writer.writeheader()
+    writer.writerows(asdict(table) for table in tables)
+
+
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"{value} is not a positive integer")
+    return number
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--region", required=True)
+    parser.add_argument("--hours", type=positive_int, default=24, help="period of the capacity and throttling metrics")
+    parser.add_argument("--max-workers", type=positive_int, default=DEFAULT_MAX_WORKERS)
+    parser.add_argument("--format", choices=REPORT_FORMATS, default="csv")
+    parser.add_argument("--output", help="report file, standard output when not given")
+    parser.add_argument("--endpoint-url", help="DynamoDB endpoint, e.g. DynamoDB Local or a moto server")
+    parser.add_argument("--cloudwatch-endpoint-url", help="CloudWatch endpoint, the DynamoDB endpoint when not given")
+    args = parser.parse_args(argv)
+    logging.basicConfig(format="%(levelname)s %(message)s")
+
+    tables = capacity_report(args.region, args.hours, args.max_workers, args.endpoint_url,
+                             args.cloudwatch_endpoint_url)
+    if args.output is None:
+        write_report(tables, sys.stdout, args.format)
+        return
+    with open(args.output, "w", newline="") as output:
+        write_report(tables, output, args.format)
+
+
+if __name__ == "__main__":
+    main()